@@ -0,0 +1,250 @@
+"""
+Hangman Trivia - Lambda Hot-Path Benchmark
+
+Drives lambda_handler against moto's in-memory DynamoDB with synthetic word banks and
+reports, for every combination of bank size and seen fraction:
+
+    cold_ms          Latency of the first request, which loads the bank from DynamoDB
+    p50/p95/p99_ms   Latency percentiles of the following (warm) requests
+    ddb_calls        DynamoDB API calls per warm request
+    cold_peak_kib    Peak traced memory while serving the cold request
+    warm_peak_kib    Peak traced memory while serving one warm request
+
+Latencies are measured with tracemalloc stopped; memory is measured in a separate pass.
+Seen sets are sent as a compact bitmap by default. With --seen-encoding answers, the
+scenarios whose seen list would exceed the handler's MAX_SEEN_ANSWERS limit are skipped,
+since the handler only takes the newest answers of such a list into account.
+
+Results are written as JSON so that runs from two commits can be compared:
+
+    python benchmarks/bench_lambda_handler.py --output before.json
+    (check out the other commit)
+    python benchmarks/bench_lambda_handler.py --output after.json --compare before.json
+
+Run from the repository root with the package installed or PYTHONPATH=src. moto has to
+scan the whole table on every Scan call, so the 100k-item banks take a while to load.
+
+@author Yahia Nassab
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from backend.lambda_function import lambda_function
+from backend.lambda_function import seen_encoding
+
+TABLE_NAME = lambda_function.TABLE_NAME_NORMAL
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_SEEN_FRACTIONS = [0.0, 0.25, 0.5, 0.9]
+
+# Metrics compared by --compare, where lower is better for all of them
+COMPARED_METRICS = ['cold_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'ddb_calls', 'warm_peak_kib']
+
+
+def create_bank_table(size):
+    """
+    Create the normal word bank table filled with `size` synthetic clues with IDs.
+
+    Args:
+        size (int): Number of clues
+
+    Returns:
+        boto3.resource: DynamoDB table resource object
+    """
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{'AttributeName': 'answer', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'answer', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST',
+    )
+    with table.batch_writer() as batch:
+        for i in range(size):
+            batch.put_item(Item={
+                'answer': f'SYNTHETIC ANSWER {i}',
+                'clue': f'Synthetic clue number {i} for benchmarking',
+                'id': i,
+            })
+    table.put_item(Item={'answer': lambda_function.VERSION_KEY, 'version': 1})
+    return table
+
+
+def make_event(size, seen_fraction, encoding, rng):
+    """
+    Build a request event for a player who has seen a random part of the bank.
+
+    Args:
+        size (int): Number of clues in the bank
+        seen_fraction (float): Fraction of the bank the player has seen
+        encoding (str): 'answers', 'bitmap' or 'delta'
+        rng (random.Random): Source of randomness
+
+    Returns:
+        dict: Lambda event
+    """
+    seen_ids = rng.sample(range(size), int(size * seen_fraction))
+    if encoding == 'bitmap':
+        seen = seen_encoding.encode_bitmap(seen_ids)
+    elif encoding == 'delta':
+        seen = seen_encoding.encode_deltas(seen_ids)
+    else:
+        seen = [f'SYNTHETIC ANSWER {i}' for i in seen_ids]
+    return {'body': json.dumps({'difficulty': 'normal', 'seen': seen})}
+
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(size, seen_fractions, encoding, requests, rng):
+    """
+    Benchmark one bank size for every seen fraction.
+
+    Args:
+        size (int): Number of clues in the bank
+        seen_fractions (list): Fractions of the bank the player has seen
+        encoding (str): Encoding of the seen field
+        requests (int): Number of warm requests per seen fraction
+        rng (random.Random): Source of randomness
+
+    Returns:
+        list: One result dictionary per seen fraction that was not skipped
+    """
+    results = []
+    with mock_aws():
+        create_bank_table(size)
+        for seen_fraction in seen_fractions:
+            seen_count = int(size * seen_fraction)
+            if encoding == 'answers' and seen_count > lambda_function.MAX_SEEN_ANSWERS:
+                print(f'Skipping size={size} seen={seen_fraction}: {seen_count} seen answers '
+                      f'exceed the limit of {lambda_function.MAX_SEEN_ANSWERS}',
+                      file=sys.stderr)
+                continue
+            lambda_function.invalidate_bank_cache()
+            lambda_function.reset_dynamodb_client()
+            client = lambda_function.get_dynamodb_client()
+            calls = []
+            client.meta.events.register('before-call.dynamodb', lambda **kwargs: calls.append(1))
+            event = make_event(size, seen_fraction, encoding, rng)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = lambda_function.lambda_handler(event, None)
+            cold_ms = (time.perf_counter() - start) * 1000
+            cold_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert response['statusCode'] == 200, response
+
+            calls.clear()
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                lambda_function.lambda_handler(event, None)
+                latencies.append((time.perf_counter() - start) * 1000)
+            ddb_calls = len(calls) / requests
+
+            tracemalloc.start()
+            lambda_function.lambda_handler(event, None)
+            warm_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({
+                'bank_size': size,
+                'seen_fraction': seen_fraction,
+                'seen_encoding': encoding,
+                'requests': requests,
+                'cold_ms': cold_ms,
+                'p50_ms': percentile(latencies, 0.50),
+                'p95_ms': percentile(latencies, 0.95),
+                'p99_ms': percentile(latencies, 0.99),
+                'mean_ms': statistics.fmean(latencies),
+                'ddb_calls': ddb_calls,
+                'cold_peak_kib': cold_peak / 1024,
+                'warm_peak_kib': warm_peak / 1024,
+            })
+    return results
+
+
+def compare(results, baseline):
+    """
+    Print the relative change of every compared metric against a baseline run.
+
+    Args:
+        results (list): Results of this run
+        baseline (list): Results of an earlier run, as written by --output
+    """
+    def key(result):
+        return result['bank_size'], result['seen_fraction'], result['seen_encoding']
+
+    previous = {key(result): result for result in baseline}
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            if before[metric]:
+                change = (result[metric] - before[metric]) / before[metric] * 100
+                changes.append(f'{metric} {change:+.1f}%')
+        print(f'size={result["bank_size"]:<7} seen={result["seen_fraction"]:<5} '
+              + ', '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the lambda_handler hot path.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='bank sizes to benchmark')
+    parser.add_argument('--seen-fractions', type=float, nargs='+',
+                        default=DEFAULT_SEEN_FRACTIONS, help='fractions of the bank seen')
+    parser.add_argument('--seen-encoding', choices=['answers', 'bitmap', 'delta'],
+                        default='bitmap', help='encoding of the seen field')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='warm requests per scenario')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='override BANK_CACHE_TTL_SECONDS (0 checks the version on '
+                             'every request)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    if args.cache_ttl is not None:
+        lambda_function.BANK_CACHE_TTL_SECONDS = args.cache_ttl
+
+    rng = random.Random(args.seed)
+    results = []
+    for size in args.sizes:
+        results.extend(
+            run_scenario(size, args.seen_fractions, args.seen_encoding, args.requests, rng)
+        )
+
+    report = {'benchmark': 'lambda_handler', 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file)['results'])
+
+
+if __name__ == "__main__":
+    main()
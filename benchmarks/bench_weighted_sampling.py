@@ -0,0 +1,98 @@
+"""
+Hangman Trivia - Weighted Sampling Benchmark
+
+Compares the cost of drawing one unseen clue from a synthetic bank (100k entries by
+default), for every seen fraction, with:
+
+    list_uniform     The original draw: list the unseen entries, then random.choice
+    rejection        Uniform rejection sampling (WordBank.sample_unseen)
+    list_weighted    Naive weighted draw: list the unseen entries and their weights,
+                     then random.choices, O(bank) per draw
+    alias_weighted   Alias-table draw with rejection of seen entries
+                     (WeightedSampler.sample_unseen)
+
+The weights favour the newest 10% of the bank threefold, as CLUE_WEIGHTING=recent does.
+The seen set is built once per seen fraction and its construction is not timed, as it
+costs the same for every method. The one-off cost of building the alias table is
+reported separately.
+
+Usage (from the repository root, with the package installed or PYTHONPATH=src):
+    python benchmarks/bench_weighted_sampling.py [--size 100000] [--draws 2000]
+
+@author Yahia Nassab
+"""
+
+import argparse
+import random
+import time
+
+from backend.lambda_function.sampling import WeightedSampler, WordBank, recency_weights
+
+DEFAULT_SEEN_FRACTIONS = [0.0, 0.25, 0.5, 0.9]
+
+
+def list_uniform(bank, weights, seen, rng):
+    unseen = [i for i in range(len(bank)) if i not in seen]
+    return rng.choice(unseen)
+
+
+def rejection(bank, weights, seen, rng):
+    return bank.sample_unseen(seen, rng)
+
+
+def list_weighted(bank, weights, seen, rng):
+    unseen = [i for i in range(len(bank)) if i not in seen]
+    return rng.choices(unseen, [weights[i] for i in unseen])[0]
+
+
+def alias_weighted(sampler, weights, seen, rng):
+    return sampler.sample_unseen(seen, rng)
+
+
+def time_draws(draw, source, weights, seen, draws, rng):
+    """Return the mean microseconds per draw of `draws` draws."""
+    start = time.perf_counter()
+    for _ in range(draws):
+        draw(source, weights, seen, rng)
+    return (time.perf_counter() - start) / draws * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark weighted clue sampling.')
+    parser.add_argument('--size', type=int, default=100000, help='entries in the bank')
+    parser.add_argument('--draws', type=int, default=2000, help='draws per method')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random draws')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bank = WordBank(
+        {f'SYNTHETIC ANSWER {i}': f'Synthetic clue {i}' for i in range(args.size)},
+        {f'SYNTHETIC ANSWER {i}': i for i in range(args.size)},
+    )
+    weights = recency_weights(bank, 0.1, 3)
+
+    start = time.perf_counter()
+    sampler = WeightedSampler(bank, weights)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f'Bank of {args.size} entries, alias table built in {build_ms:.1f} ms\n')
+
+    methods = [
+        ('list_uniform', list_uniform, bank),
+        ('rejection', rejection, bank),
+        ('list_weighted', list_weighted, bank),
+        ('alias_weighted', alias_weighted, sampler),
+    ]
+    print(f"{'seen':>6}" + ''.join(f'{name:>16}' for name, _, _ in methods) + '   (us/draw)')
+    for seen_fraction in DEFAULT_SEEN_FRACTIONS:
+        seen = set(rng.sample(range(args.size), int(args.size * seen_fraction)))
+        # The list-based draws take milliseconds each, so they get fewer draws
+        timings = [
+            time_draws(draw, source, weights, seen,
+                       max(args.draws // 100, 5) if name.startswith('list') else args.draws, rng)
+            for name, draw, source in methods
+        ]
+        print(f'{seen_fraction:>6.0%}' + ''.join(f'{timing:>16.2f}' for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Hangman Trivia - Local Development Server
+
+Serves the Lambda function over HTTP on localhost, so that the frontend or a load driver
+(see load_dev_server.py) can exercise it with real concurrent requests. A threaded
+http.server adapts every request to the event passed to the handler by API Gateway, and
+the handler runs in this single process, so the warm-container state (bank cache,
+DynamoDB client) behaves as in one warm Lambda container.
+
+    POST /        -> lambda_handler
+    GET  /?...    -> lambda_handler, with the query string as queryStringParameters
+                     (daily sets, e.g. /?difficulty=normal&daily=today)
+    POST /batch   -> async_handler.batch_lambda_handler
+
+DynamoDB is replaced by moto's in-memory implementation. The three word bank tables are
+synced with write_dynamodb_table.update_table, so they carry stable IDs, the answer
+index and the version item like the deployed tables. By default they are filled with
+synthetic clues; --word-banks uses the word_bank_*.py files instead.
+
+Usage (from the repository root, with the package installed or PYTHONPATH=src):
+    python benchmarks/dev_server.py [--port 8000] [--bank-size 1000] [--latency-ms 5]
+
+@author Yahia Nassab
+"""
+
+import argparse
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_ACCOUNT_ID', '123456789012')
+
+import boto3
+from moto import mock_aws
+
+from backend.db_management import write_dynamodb_table
+from backend.lambda_function import async_handler
+from backend.lambda_function import lambda_function
+
+HANDLERS = {
+    '/': lambda_function.lambda_handler,
+    '/batch': async_handler.batch_lambda_handler,
+}
+
+# Allow the frontend to call the server from a page served on another local port
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+
+def create_tables(banks):
+    """
+    Create and sync the three word bank tables in moto.
+
+    Args:
+        banks (dict): {table_name: {answer: clue, ...}}
+    """
+    dynamodb = boto3.resource('dynamodb')
+    for table_name, bank in banks.items():
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': 'answer', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'answer', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        write_dynamodb_table.update_table(bank, table)
+
+
+def synthetic_banks(size):
+    """Return `size` synthetic clues for each of the three tables."""
+    return {
+        table_name: {
+            f'{difficulty} ANSWER {i}': f'Synthetic {difficulty.lower()} clue number {i}'
+            for i in range(size)
+        }
+        for difficulty, table_name in (
+            ('NORMAL', lambda_function.TABLE_NAME_NORMAL),
+            ('HARD', lambda_function.TABLE_NAME_HARD),
+            ('DRUNK', lambda_function.TABLE_NAME_DRUNK),
+        )
+    }
+
+
+def word_banks():
+    """Return the word banks of the word_bank_*.py files."""
+    return {
+        lambda_function.TABLE_NAME_NORMAL: write_dynamodb_table.bank_normal,
+        lambda_function.TABLE_NAME_HARD: write_dynamodb_table.bank_hard,
+        lambda_function.TABLE_NAME_DRUNK: write_dynamodb_table.bank_drunk,
+    }
+
+
+class LambdaRequestHandler(BaseHTTPRequestHandler):
+    """Adapts HTTP requests to Lambda events and Lambda responses to HTTP responses."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, as a load driver reuses connections
+
+    # Headers and body are written separately, which Nagle's algorithm would otherwise
+    # delay by the client's delayed ACK on every keep-alive request
+    disable_nagle_algorithm = True
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != '/':
+            self.send_error(404)
+            return
+        # API Gateway passes null rather than an empty object without a query string
+        event = {
+            'httpMethod': 'GET',
+            'path': parts.path,
+            'headers': dict(self.headers),
+            'queryStringParameters': dict(parse_qsl(parts.query)) or None,
+            'body': None,
+        }
+        self.send_lambda_response(lambda_function.lambda_handler(event, None))
+
+    def do_POST(self):
+        handler = HANDLERS.get(self.path)
+        if handler is None:
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        event = {
+            'httpMethod': 'POST',
+            'path': self.path,
+            'headers': dict(self.headers),
+            'body': self.rfile.read(length).decode('utf-8'),
+        }
+        self.send_lambda_response(handler(event, None))
+
+    def send_lambda_response(self, response):
+        """Write a Lambda proxy response, with its headers, as the HTTP response."""
+        # A 204 response must not have a body
+        body = b'' if response['statusCode'] == 204 else response['body'].encode('utf-8')
+        self.send_response(response['statusCode'])
+        for name, value in (CORS_HEADERS | response.get('headers', {})).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the Lambda function locally.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument('--bank-size', type=int, default=1000,
+                        help='synthetic clues per table')
+    parser.add_argument('--word-banks', action='store_true',
+                        help='fill the tables from the word_bank_*.py files instead')
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='delay added before every DynamoDB call of the handler')
+    parser.add_argument('--cache-ttl', type=float,
+                        help='override BANK_CACHE_TTL_SECONDS')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    if args.cache_ttl is not None:
+        lambda_function.BANK_CACHE_TTL_SECONDS = args.cache_ttl
+
+    with mock_aws():
+        create_tables(word_banks() if args.word_banks else synthetic_banks(args.bank_size))
+        if args.latency_ms:
+            client = lambda_function.get_dynamodb_client()
+            client.meta.events.register(
+                'before-call.dynamodb', lambda **kwargs: time.sleep(args.latency_ms / 1000)
+            )
+
+        server = ThreadingHTTPServer((args.host, args.port), LambdaRequestHandler)
+        server.daemon_threads = True
+        server.verbose = args.verbose
+        print(f'Serving lambda_handler on http://{args.host}:{server.server_port}/ '
+              f'(batch handler on /batch)', flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Hangman Trivia - Concurrent Handler Load Generator
+
+Compares serving one clue per difficulty, as the game does when it starts, through
+three sequential lambda_handler calls against a single batch_lambda_handler call that
+serves the three requests concurrently. DynamoDB runs on moto with an injected
+per-call latency, since moto answers in microseconds and would otherwise hide the
+round-trips that the concurrent handler overlaps. The bank cache TTL defaults to 0 so
+that every request revalidates its bank against the table version item.
+
+Reports, for every injected latency:
+
+    sync_rps     Rounds of three clues per second through lambda_handler
+    async_rps    Rounds of three clues per second through batch_lambda_handler
+    speedup      async_rps / sync_rps
+
+    python benchmarks/load_async_handler.py --latency-ms 0 5 20 --rounds 100
+
+Run from the repository root with the package installed or PYTHONPATH=src.
+
+@author Yahia Nassab
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from backend.lambda_function import async_handler
+from backend.lambda_function import lambda_function
+
+DIFFICULTY_TABLES = {
+    'normal': lambda_function.TABLE_NAME_NORMAL,
+    'hard': lambda_function.TABLE_NAME_HARD,
+    'drunk': lambda_function.TABLE_NAME_DRUNK,
+}
+
+DEFAULT_LATENCIES_MS = [0, 5, 20]
+
+
+def create_bank_tables(size):
+    """
+    Create the three word bank tables, each filled with `size` synthetic clues with IDs.
+
+    Args:
+        size (int): Number of clues per table
+    """
+    dynamodb = boto3.resource('dynamodb')
+    for table_name in DIFFICULTY_TABLES.values():
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': 'answer', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'answer', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        with table.batch_writer() as batch:
+            for i in range(size):
+                batch.put_item(Item={
+                    'answer': f'SYNTHETIC ANSWER {i}',
+                    'clue': f'Synthetic clue number {i} for load testing',
+                    'id': i,
+                })
+        table.put_item(Item={'answer': lambda_function.VERSION_KEY, 'version': 1})
+
+
+def run_sync(rounds):
+    """Serve `rounds` rounds through lambda_handler and return the elapsed seconds."""
+    events = [
+        {'body': json.dumps({'difficulty': difficulty})} for difficulty in DIFFICULTY_TABLES
+    ]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for event in events:
+            response = lambda_function.lambda_handler(event, None)
+            assert response['statusCode'] == 200, response
+    return time.perf_counter() - start
+
+
+def run_async(rounds):
+    """Serve `rounds` rounds through batch_lambda_handler and return the elapsed seconds."""
+    event = {'body': json.dumps({
+        'requests': [{'difficulty': difficulty} for difficulty in DIFFICULTY_TABLES],
+    })}
+    start = time.perf_counter()
+    for _ in range(rounds):
+        response = async_handler.batch_lambda_handler(event, None)
+        assert response['statusCode'] == 200, response
+    return time.perf_counter() - start
+
+
+def run_scenario(latency_ms, size, rounds):
+    """
+    Measure both handlers with a given injected DynamoDB latency.
+
+    Args:
+        latency_ms (float): Delay added before every DynamoDB call
+        size (int): Number of clues per table
+        rounds (int): Rounds of three requests per handler
+
+    Returns:
+        dict: Result of the scenario
+    """
+    with mock_aws():
+        create_bank_tables(size)
+        lambda_function.invalidate_bank_cache()
+        lambda_function.reset_dynamodb_client()
+        client = lambda_function.get_dynamodb_client()
+        client.meta.events.register(
+            'before-call.dynamodb', lambda **kwargs: time.sleep(latency_ms / 1000)
+        )
+
+        # Warm both paths so that neither pays for loading the banks
+        run_sync(1)
+        run_async(1)
+
+        sync_seconds = run_sync(rounds)
+        async_seconds = run_async(rounds)
+
+    sync_rps = rounds / sync_seconds
+    async_rps = rounds / async_seconds
+    return {
+        'latency_ms': latency_ms,
+        'bank_size': size,
+        'rounds': rounds,
+        'sync_rps': sync_rps,
+        'async_rps': async_rps,
+        'speedup': async_rps / sync_rps,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare lambda_handler with the concurrent batch handler.'
+    )
+    parser.add_argument('--latency-ms', type=float, nargs='+', default=DEFAULT_LATENCIES_MS,
+                        help='latencies injected before every DynamoDB call')
+    parser.add_argument('--size', type=int, default=1000, help='clues per table')
+    parser.add_argument('--rounds', type=int, default=100,
+                        help='rounds of one request per difficulty')
+    parser.add_argument('--cache-ttl', type=float, default=0,
+                        help='override BANK_CACHE_TTL_SECONDS (default: 0)')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    lambda_function.BANK_CACHE_TTL_SECONDS = args.cache_ttl
+
+    results = [
+        run_scenario(latency_ms, args.size, args.rounds) for latency_ms in args.latency_ms
+    ]
+
+    report = {'benchmark': 'async_handler', 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
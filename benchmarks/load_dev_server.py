@@ -0,0 +1,171 @@
+"""
+Hangman Trivia - Load Driver for the Local Development Server
+
+Sends clue requests to dev_server.py (or any endpoint accepting the same requests) from
+a number of concurrent workers, each reusing one keep-alive connection, and reports:
+
+    requests_per_second   Completed requests per second over the whole run
+    p50/p95/p99_ms        Latency percentiles of the requests
+    status_codes          Number of responses per HTTP status code
+
+Each worker plays like a player: it remembers the answers it has been served and sends
+them back as "seen" (up to --max-seen, as the frontend eventually resets its list).
+With --mode daily, workers instead fetch today's daily set of a random difficulty with
+GET requests, as players arriving through a CDN miss would.
+
+Usage (from the repository root, with the server running):
+    python benchmarks/dev_server.py --latency-ms 5 &
+    python benchmarks/load_dev_server.py --concurrency 16 --requests 2000 [--mode daily]
+
+@author Yahia Nassab
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+DIFFICULTIES = ['normal', 'hard', 'drunk']
+
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_worker(url, requests, max_seen, seed, latencies, status_codes, lock, mode='clues'):
+    """
+    Send `requests` requests over one connection, recording latencies and statuses.
+
+    Args:
+        url (str): Endpoint of the server
+        requests (int): Number of requests to send
+        max_seen (int): Maximum length of the seen list sent with a request
+        seed (int): Seed of the worker's choice of difficulties
+        latencies (list): Shared list that request latencies in ms are appended to
+        status_codes (dict): Shared {status code: count} of the responses
+        lock (threading.Lock): Guards status_codes
+        mode (str): 'clues' for POST clue requests, 'daily' for GET daily requests
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    rng = random.Random(seed)
+    seen = {difficulty: [] for difficulty in DIFFICULTIES}
+    try:
+        for _ in range(requests):
+            difficulty = rng.choice(DIFFICULTIES)
+            start = time.perf_counter()
+            if mode == 'daily':
+                query = urlencode({'difficulty': difficulty, 'daily': 'today'})
+                connection.request('GET', f'{parts.path or "/"}?{query}')
+            else:
+                body = json.dumps({'difficulty': difficulty,
+                                   'seen': seen[difficulty][-max_seen:]})
+                connection.request('POST', parts.path or '/', body,
+                                   {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            payload = response.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            with lock:
+                status_codes[response.status] = status_codes.get(response.status, 0) + 1
+            if mode == 'daily':
+                continue
+            if response.status == 200:
+                seen[difficulty].append(json.loads(payload)['answer'])
+            elif response.status == 204:
+                seen[difficulty].clear()
+    finally:
+        connection.close()
+
+
+def run_load(url, concurrency, requests, max_seen, seed=0, mode='clues'):
+    """
+    Run the load test.
+
+    Args:
+        url (str): Endpoint of the server
+        concurrency (int): Number of concurrent workers
+        requests (int): Total number of requests, split evenly across the workers
+        max_seen (int): Maximum length of the seen list sent with a request
+        seed (int): Seed of the workers' choice of difficulties
+        mode (str): 'clues' for POST clue requests, 'daily' for GET daily requests
+
+    Returns:
+        dict: Summary of the run
+    """
+    latencies = []
+    status_codes = {}
+    lock = threading.Lock()
+    per_worker = [requests // concurrency + (i < requests % concurrency)
+                  for i in range(concurrency)]
+    workers = [
+        threading.Thread(target=run_worker, args=(
+            url, count, max_seen, seed + i, latencies, status_codes, lock, mode
+        ))
+        for i, count in enumerate(per_worker)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'url': url,
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'status_codes': {str(code): count for code, count in sorted(status_codes.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the local development server.')
+    parser.add_argument('--url', default='http://127.0.0.1:8000/', help='server endpoint')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                        help='numbers of concurrent workers to test')
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='requests per concurrency level')
+    parser.add_argument('--max-seen', type=int, default=100,
+                        help='maximum length of the seen list of a request')
+    parser.add_argument('--mode', choices=['clues', 'daily'], default='clues',
+                        help='POST clue requests, or GET requests for the daily sets')
+    parser.add_argument('--no-wake-up', action='store_true',
+                        help='do not send a wake-up request before measuring')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    if not args.no_wake_up:
+        parts = urlsplit(args.url)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        connection.request('POST', parts.path or '/', json.dumps({'wakeUp': True}))
+        connection.getresponse().read()
+        connection.close()
+
+    results = [
+        run_load(args.url, concurrency, args.requests, args.max_seen, mode=args.mode)
+        for concurrency in args.concurrency
+    ]
+
+    report = {'benchmark': 'dev_server', 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
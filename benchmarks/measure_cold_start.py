@@ -0,0 +1,100 @@
+"""
+Hangman Trivia - Cold-Start Measurement
+
+Measures the cold-start costs of the Lambda function in fresh interpreter processes:
+
+    import_lambda_function   Importing lambda_function.py (boto3 is not imported)
+    first_client             Importing boto3 and creating the shared DynamoDB client
+    reused_client            Fetching the already created client on a later request
+    resource_per_request     Creating a boto3 DynamoDB resource, as the handler used to
+                             do on every request
+
+No AWS calls are made, so the script runs without credentials or network access.
+
+Usage (from the repository root, with the package installed or PYTHONPATH=src):
+    python benchmarks/measure_cold_start.py [--runs N] [--json]
+
+@author Yahia Nassab
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Executed in a fresh interpreter for every run, printing one JSON line of timings
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from backend.lambda_function import lambda_function
+imported = time.perf_counter()
+assert 'boto3' not in sys.modules, 'boto3 was imported at module load'
+lambda_function.get_dynamodb_client()
+first_client = time.perf_counter()
+lambda_function.get_dynamodb_client()
+reused_client = time.perf_counter()
+import boto3
+boto3.resource('dynamodb')
+resource = time.perf_counter()
+print(json.dumps({
+    'import_lambda_function': imported - start,
+    'first_client': first_client - imported,
+    'reused_client': reused_client - first_client,
+    'resource_per_request': resource - reused_client,
+}))
+'''
+
+
+def run_probe():
+    """
+    Run the probe once in a fresh interpreter.
+
+    Returns:
+        dict: Seconds spent in each measured phase
+    """
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    env.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [src, env.get('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE], env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout)
+
+
+def main(runs, as_json):
+    """
+    Run the probe repeatedly and report the median and maximum of each phase.
+
+    Args:
+        runs (int): Number of fresh interpreters to measure
+        as_json (bool): Print machine-readable JSON instead of a table
+    """
+    samples = [run_probe() for _ in range(runs)]
+    summary = {
+        phase: {
+            'median_ms': statistics.median(sample[phase] for sample in samples) * 1000,
+            'max_ms': max(sample[phase] for sample in samples) * 1000,
+        }
+        for phase in samples[0]
+    }
+
+    if as_json:
+        print(json.dumps({'runs': runs, 'phases': summary}, indent=2))
+        return
+
+    print(f'{"phase":<24}{"median (ms)":>14}{"max (ms)":>12}')
+    for phase, stats in summary.items():
+        print(f'{phase:<24}{stats["median_ms"]:>14.2f}{stats["max_ms"]:>12.2f}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure Lambda cold-start costs.')
+    parser.add_argument('--runs', type=int, default=10, help='number of fresh interpreters')
+    parser.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    args = parser.parse_args()
+    main(args.runs, args.json)
@@ -0,0 +1,150 @@
+"""
+Hangman Trivia - Answer Index Items
+
+The word bank tables are keyed by answer only, so picking a random clue would otherwise
+need a scan of the whole table. write_dynamodb_table.py therefore also maintains a
+compact index of the table: the answers and stable IDs of every entry, ordered by ID, in
+metadata items next to the entries. The Lambda function reads the index instead of
+scanning, draws a random slot, and then reads just the clue of that one answer.
+
+A DynamoDB item is limited to 400 KB, so the index is split into pages stored under
+"#INDEX#0", "#INDEX#1", ...:
+
+    {
+        "answer": "#INDEX#0",
+        "version": 3,                // Table version the page was written for
+        "answers": ["PARIS", ...],
+        "ids": [0, 1, ...],
+        "hashes": ["9f2c...", ...]   // Content hash of each entry, used by the sync only
+    }
+
+The number of pages of the current index is stored on the table version item. A sync
+writes the pages for the upcoming version before it bumps the version, so between the
+two writes, or after a sync interrupted there, the pages carry a version that readers
+have not seen yet. A reader therefore only trusts the index if every page carries the
+current table version, and scans the table otherwise.
+
+@author Yahia Nassab
+"""
+
+from .dynamodb_scan import PARTITION_KEY, deserialize_item
+
+INDEX_KEY_PREFIX = '#INDEX#'
+
+# Attribute of the table version item holding the number of index pages
+INDEX_PAGES_ATTRIBUTE = 'index_pages'
+
+# Budget of answer and ID bytes per page, well below the 400 KB item size limit
+INDEX_PAGE_BYTES = 300_000
+
+# DynamoDB accepts at most this many keys per BatchGetItem call
+MAX_BATCH_GET_KEYS = 100
+
+
+def index_page_key(page):
+    """Return the answer under which an index page is stored."""
+    return f'{INDEX_KEY_PREFIX}{page}'
+
+
+def build_index_pages(ids, hashes=None, page_bytes=INDEX_PAGE_BYTES):
+    """
+    Split the entries of a table into index pages.
+
+    Args:
+        ids (dict): Stable IDs of the entries {answer: id, ...}
+        hashes (dict): Content hashes of the entries {answer: hash, ...} (optional)
+        page_bytes (int): Approximate size budget of one page
+
+    Returns:
+        list: Pages as {'answers': [...], 'ids': [...]}, plus 'hashes': [...] if hashes
+              were given, ordered by ID across pages
+    """
+    columns = ('answers', 'ids') if hashes is None else ('answers', 'ids', 'hashes')
+    pages = []
+    page = {column: [] for column in columns}
+    size = 0
+    for entry_id, answer in sorted((entry_id, answer) for answer, entry_id in ids.items()):
+        # Each list element costs its encoded length plus a few bytes of overhead
+        entry_size = len(answer.encode('utf-8')) + len(str(entry_id)) + 6
+        if hashes is not None:
+            entry_size += len(hashes[answer]) + 3
+        if page['answers'] and size + entry_size > page_bytes:
+            pages.append(page)
+            page = {column: [] for column in columns}
+            size = 0
+        page['answers'].append(answer)
+        page['ids'].append(entry_id)
+        if hashes is not None:
+            page['hashes'].append(hashes[answer])
+        size += entry_size
+    pages.append(page)
+    return pages
+
+
+def batch_get_items(client, table_name, keys, attributes, stats=None):
+    """
+    Read items by key with BatchGetItem, retrying any UnprocessedKeys.
+
+    Args:
+        client (botocore.client.DynamoDB): Low-level DynamoDB client
+        table_name (str): Name of the table
+        keys (list): Partition key values of the items to read
+        attributes (tuple): Attribute names to fetch
+        stats (dict): If given, consumed capacity is requested and the number of calls
+                      and consumed capacity units are added to it
+
+    Returns:
+        dict: {key: item} for the items that exist, as plain Python dictionaries
+    """
+    names = {f'#a{i}': attribute for i, attribute in enumerate((PARTITION_KEY,) + attributes)}
+    kwargs = {}
+    if stats is not None:
+        kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+
+    items = {}
+    for start in range(0, len(keys), MAX_BATCH_GET_KEYS):
+        chunk = keys[start:start + MAX_BATCH_GET_KEYS]
+        request = {table_name: {
+            'Keys': [{PARTITION_KEY: {'S': key}} for key in chunk],
+            'ProjectionExpression': ', '.join(names),
+            'ExpressionAttributeNames': names,
+        }}
+        while request:
+            response = client.batch_get_item(RequestItems=request, **kwargs)
+            for item in response['Responses'].get(table_name, []):
+                item = deserialize_item(item)
+                items[item[PARTITION_KEY]] = item
+            if stats is not None:
+                stats['calls'] = stats.get('calls', 0) + 1
+                stats['consumed_capacity'] = stats.get('consumed_capacity', 0) + sum(
+                    capacity.get('CapacityUnits', 0)
+                    for capacity in response.get('ConsumedCapacity', [])
+                )
+            request = response.get('UnprocessedKeys')
+    return items
+
+
+def read_index(client, table_name, version, page_count, stats=None):
+    """
+    Read the answer index of a table.
+
+    Args:
+        client (botocore.client.DynamoDB): Low-level DynamoDB client
+        table_name (str): Name of the table
+        version (int): Current table version, as read from the version item
+        page_count (int): Number of index pages, as read from the version item
+        stats (dict): If given, DynamoDB calls and consumed capacity are added to it
+
+    Returns:
+        list: (id, answer) tuples ordered by ID, or None if a page is missing or belongs
+              to another version of the table (e.g. while a sync is in progress)
+    """
+    keys = [index_page_key(page) for page in range(page_count)]
+    pages = batch_get_items(client, table_name, keys, ('version', 'answers', 'ids'), stats)
+    entries = []
+    for key in keys:
+        page = pages.get(key)
+        if page is None or int(page['version']) != version:
+            return None
+        entries.extend(zip((int(entry_id) for entry_id in page['ids']), page['answers']))
+    return entries
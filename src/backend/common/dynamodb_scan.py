@@ -0,0 +1,171 @@
+"""
+Hangman Trivia - Shared DynamoDB Scan Helper
+
+Scans the word bank tables for both the Lambda function and the database management
+script. A single Scan call returns at most 1 MB of data, so the helper follows
+LastEvaluatedKey until the table is exhausted, or yields the items page by page for
+callers that process them as a stream. Large tables can be split into
+Segment/TotalSegments parallel scans that run on a thread pool, and only the requested
+attributes are fetched through a ProjectionExpression.
+
+The helper accepts either a low-level DynamoDB client or the client of a DynamoDB
+resource (table.meta.client), whose responses boto3 has already deserialized.
+
+@author Yahia Nassab
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+
+# Answers of metadata items (e.g. the table version) start with this prefix, which
+# never appears at the start of a real answer
+METADATA_PREFIX = '#'
+
+# Created on first use, so that importing this module does not import boto3
+_deserializer = None
+
+
+def deserialize_item(item):
+    """
+    Convert a DynamoDB item to plain Python values.
+
+    Items are only expected to hold scalar attributes, so a dict value is always a
+    DynamoDB type descriptor such as {'S': 'PARIS'}.
+
+    Args:
+        item (dict): Item as returned by a low-level or resource client
+
+    Returns:
+        dict: Item with plain Python values
+    """
+    global _deserializer
+    if _deserializer is None:
+        from boto3.dynamodb.types import TypeDeserializer
+        _deserializer = TypeDeserializer()
+    return {
+        key: _deserializer.deserialize(value) if isinstance(value, dict) else value
+        for key, value in item.items()
+    }
+
+
+def iter_segment(client, table_name, attributes, segment=None, total_segments=None,
+                 page_size=None, stats=None):
+    """
+    Yield the items of one segment of a table, fetching one page at a time, so that at
+    most one Scan response is held in memory.
+
+    Args:
+        client (botocore.client.DynamoDB): DynamoDB client
+        table_name (str): Name of the table to scan
+        attributes (tuple): Attribute names to fetch
+        segment (int): Segment number for a parallel scan, or None for a full scan
+        total_segments (int): Total number of segments of a parallel scan
+        page_size (int): Maximum number of items evaluated per Scan call (optional)
+        stats (dict): If given, consumed capacity is requested and the number of calls,
+                      scanned items and consumed capacity units are added to it
+
+    Yields:
+        dict: Items of the segment as plain Python dictionaries
+    """
+    names = {f'#a{i}': attribute for i, attribute in enumerate(attributes)}
+    kwargs = {
+        'TableName': table_name,
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+    }
+    if total_segments is not None:
+        kwargs['Segment'] = segment
+        kwargs['TotalSegments'] = total_segments
+    if page_size is not None:
+        kwargs['Limit'] = page_size
+    if stats is not None:
+        kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+
+    while True:
+        response = client.scan(**kwargs)
+        if stats is not None:
+            add_scan_stats(stats, {
+                'calls': 1,
+                'scanned_count': response.get('ScannedCount', 0),
+                'consumed_capacity': response.get('ConsumedCapacity', {}).get('CapacityUnits', 0),
+            })
+        for item in response.get('Items', []):
+            yield deserialize_item(item)
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def scan_segment(client, table_name, attributes, segment=None, total_segments=None,
+                 page_size=None, stats=None):
+    """
+    Scan one segment of a table, following pagination until the segment is exhausted.
+
+    Args:
+        client (botocore.client.DynamoDB): DynamoDB client
+        table_name (str): Name of the table to scan
+        attributes (tuple): Attribute names to fetch
+        segment (int): Segment number for a parallel scan, or None for a full scan
+        total_segments (int): Total number of segments of a parallel scan
+        page_size (int): Maximum number of items evaluated per Scan call (optional)
+        stats (dict): If given, consumed capacity is requested and the number of calls,
+                      scanned items and consumed capacity units are added to it
+
+    Returns:
+        list: Items of the segment as plain Python dictionaries
+    """
+    return list(iter_segment(
+        client, table_name, attributes, segment, total_segments, page_size, stats
+    ))
+
+
+def add_scan_stats(stats, other):
+    """Add the counters of `other` to `stats` in place."""
+    for key, value in other.items():
+        stats[key] = stats.get(key, 0) + value
+
+
+def scan_table(client, table_name, attributes=(PARTITION_KEY, SECONDARY_KEY),
+               total_segments=1, page_size=None, skip_metadata=True, stats=None):
+    """
+    Scan a whole table, in parallel segments if requested.
+
+    Args:
+        client (botocore.client.DynamoDB): DynamoDB client
+        table_name (str): Name of the table to scan
+        attributes (tuple): Attribute names to fetch (default: answer and clue)
+        total_segments (int): Number of segments to scan concurrently (default: 1)
+        page_size (int): Maximum number of items evaluated per Scan call (optional)
+        skip_metadata (bool): Whether to leave out metadata items such as the table version
+        stats (dict): If given, consumed capacity is requested and the number of calls,
+                      scanned items and consumed capacity units are added to it
+
+    Returns:
+        list: All items of the table as plain Python dictionaries
+    """
+    if total_segments <= 1:
+        items = scan_segment(client, table_name, attributes, page_size=page_size, stats=stats)
+    else:
+        # Each segment counts into its own dict, which are summed once all have finished
+        segment_stats = [None if stats is None else {} for _ in range(total_segments)]
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segments = executor.map(
+                lambda segment: scan_segment(
+                    client, table_name, attributes, segment, total_segments, page_size,
+                    segment_stats[segment],
+                ),
+                range(total_segments),
+            )
+            items = [item for segment_items in segments for item in segment_items]
+        if stats is not None:
+            for other in segment_stats:
+                add_scan_stats(stats, other)
+
+    if skip_metadata:
+        items = [
+            item for item in items
+            if not item.get(PARTITION_KEY, '').startswith(METADATA_PREFIX)
+        ]
+    return items
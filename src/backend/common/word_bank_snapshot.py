@@ -0,0 +1,73 @@
+"""
+Hangman Trivia - Word Bank Snapshot Format
+
+A snapshot is a versioned JSON file holding the contents of every word bank table, built
+by write_dynamodb_table.py after a sync and shipped alongside the Lambda code. The
+Lambda function loads it once at import and serves clues from it without touching
+DynamoDB.
+
+Banks are stored column-wise to keep the file compact:
+
+    {
+        "format": 1,
+        "banks": {
+            "<table name>": {
+                "version": 3,                // Table version at the time of the build
+                "ids": [0, 1, ...],
+                "answers": ["PARIS", ...],
+                "clues": ["Capital of France", ...]
+            }
+        }
+    }
+
+@author Yahia Nassab
+"""
+
+import json
+import os
+
+SNAPSHOT_FORMAT = 1
+
+
+def dump_snapshot(banks, path):
+    """
+    Write a snapshot file atomically, so that a reader never sees a partial file.
+
+    Args:
+        banks (dict): {table_name: {'version': int, 'entries': [(id, answer, clue), ...]}}
+        path (str): Destination of the snapshot file
+    """
+    snapshot = {'format': SNAPSHOT_FORMAT, 'banks': {}}
+    for table_name, bank in banks.items():
+        entries = sorted(bank['entries'])
+        snapshot['banks'][table_name] = {
+            'version': bank['version'],
+            'ids': [entry[0] for entry in entries],
+            'answers': [entry[1] for entry in entries],
+            'clues': [entry[2] for entry in entries],
+        }
+
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(snapshot, file, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path):
+    """
+    Read a snapshot file.
+
+    Args:
+        path (str): Location of the snapshot file
+
+    Returns:
+        dict: {table_name: {'version': ..., 'ids': [...], 'answers': [...], 'clues': [...]}}
+
+    Raises:
+        ValueError: If the file was written in an unsupported format
+    """
+    with open(path, encoding='utf-8') as file:
+        snapshot = json.load(file)
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported word bank snapshot format: {snapshot.get('format')}")
+    return snapshot['banks']
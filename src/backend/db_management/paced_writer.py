@@ -0,0 +1,294 @@
+"""
+Hangman Trivia Game - Paced DynamoDB Writer
+
+Writes the changes of a word bank sync to DynamoDB in BatchWriteItem calls of 25 items,
+like boto3's batch writer, but without aborting the sync when DynamoDB throttles:
+
+    - Throttling errors and UnprocessedItems are retried with exponential backoff and
+      full jitter, so that concurrent writers do not retry in lockstep.
+    - Writes can be paced to a budget of write capacity units (WCU) per second. The
+      rate is halved whenever DynamoDB throttles and raised again step by step while
+      writes succeed, which settles near the highest rate the table sustains.
+    - Progress can be recorded in a checkpoint file after every batch, so that a sync
+      that failed midway resumes after the last completed batch instead of starting
+      over. A checkpoint only applies to the exact same list of writes.
+
+@author Yahia Nassab
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+
+from botocore.exceptions import ClientError
+
+# Error codes with which DynamoDB asks the caller to slow down
+THROTTLING_ERROR_CODES = frozenset({
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+})
+
+# Maximum number of requests in one BatchWriteItem call
+BATCH_SIZE = 25
+
+# One WCU writes up to 1 KB of item data
+WRITE_UNIT_BYTES = 1024
+
+
+def is_throttling_error(error):
+    """Return whether an exception is DynamoDB asking the caller to slow down."""
+    return (isinstance(error, ClientError)
+            and error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES)
+
+
+def write_units(request):
+    """
+    Estimate the write capacity units consumed by one put or delete request.
+
+    Args:
+        request (dict): {'PutRequest': {'Item': ...}} or {'DeleteRequest': {'Key': ...}}
+
+    Returns:
+        int: Estimated WCU (a delete of a word bank entry is charged like its put)
+    """
+    item = request.get('PutRequest', {}).get('Item') or request['DeleteRequest']['Key']
+    size = sum(len(str(name)) + len(str(value)) for name, value in item.items())
+    return max(1, -(-size // WRITE_UNIT_BYTES))
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter: the n-th retry waits a random time between 0
+    and min(cap, base * 2 ** n) seconds.
+    """
+
+    def __init__(self, base=0.05, cap=5.0, max_attempts=10, rng=None, sleep=time.sleep):
+        """
+        Args:
+            base (float): Upper bound of the first delay in seconds
+            cap (float): Upper bound of any delay in seconds
+            max_attempts (int): Attempts of one operation before giving up
+            rng (random.Random): Source of randomness (default: a new Random instance)
+            sleep (callable): Function used to wait (default: time.sleep)
+        """
+        self.base = base
+        self.cap = cap
+        self.max_attempts = max_attempts
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+
+    def wait(self, attempt):
+        """Wait before the retry following the given (zero-based) failed attempt."""
+        self.sleep(self.rng.uniform(0, min(self.cap, self.base * 2 ** attempt)))
+
+    def call(self, operation, *args, **kwargs):
+        """
+        Call an operation, retrying it with backoff while DynamoDB throttles it.
+
+        Args:
+            operation (callable): boto3 call, e.g. table.put_item
+            *args, **kwargs: Arguments of the call
+
+        Returns:
+            The result of the call
+
+        Raises:
+            ClientError: If the call failed with another error, or was still throttled
+                         after max_attempts attempts
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                return operation(*args, **kwargs)
+            except ClientError as error:
+                if not is_throttling_error(error) or attempt == self.max_attempts - 1:
+                    raise
+                self.wait(attempt)
+
+
+class RateLimiter:
+    """
+    Token bucket that paces writes to a rate of WCU per second, adapting the rate with
+    additive increase and multiplicative decrease (AIMD) as DynamoDB accepts or throttles
+    writes.
+    """
+
+    def __init__(self, units_per_second, min_units_per_second=1.0, clock=time.monotonic,
+                 sleep=time.sleep):
+        """
+        Args:
+            units_per_second (float): Budget, i.e. the highest rate writes are sent at
+            min_units_per_second (float): Lowest rate after repeated throttling
+            clock (callable): Monotonic clock in seconds (default: time.monotonic)
+            sleep (callable): Function used to wait (default: time.sleep)
+        """
+        self.budget = units_per_second
+        self.minimum = min(min_units_per_second, units_per_second)
+        self.rate = units_per_second
+        self.clock = clock
+        self.sleep = sleep
+        # Allow a burst of at most one second of writes, as DynamoDB does
+        self._tokens = units_per_second
+        self._updated_at = clock()
+
+    def acquire(self, units):
+        """Wait until `units` WCU may be consumed at the current rate, then consume them."""
+        now = self.clock()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        self._tokens -= units
+        if self._tokens < 0:
+            self.sleep(-self._tokens / self.rate)
+
+    def throttled(self):
+        """Halve the rate after DynamoDB throttled a write."""
+        self.rate = max(self.minimum, self.rate / 2)
+
+    def succeeded(self):
+        """Raise the rate by a tenth of the budget after a write went through."""
+        self.rate = min(self.budget, self.rate + self.budget / 10)
+
+
+class SyncCheckpoint:
+    """
+    Number of writes of a sync that are known to have completed, persisted to a file.
+
+    The checkpoint is tied to an ID of the list of writes, so progress recorded for one
+    list of writes is never applied to a different one.
+    """
+
+    def __init__(self, path, plan_id):
+        """
+        Args:
+            path (str): Location of the checkpoint file
+            plan_id (str): ID of the list of writes, as returned by plan_id()
+        """
+        self.path = path
+        self.plan_id = plan_id
+        self.completed = 0
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                saved = json.load(file)
+            if saved.get('plan') == plan_id:
+                self.completed = saved['completed']
+
+    @staticmethod
+    def plan_id(requests):
+        """Return an ID of a list of write requests that changes with any request."""
+        digest = hashlib.blake2b(digest_size=16)
+        for request in requests:
+            digest.update(json.dumps(request, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def advance(self, completed):
+        """Record that the first `completed` writes went through, replacing the file
+        atomically so that a crash never leaves a partial checkpoint."""
+        self.completed = completed
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'plan': self.plan_id, 'completed': completed}, file)
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        """Delete the checkpoint once the sync has completed."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class PacedBatchWriter:
+    """
+    Context manager with the put_item/delete_item interface of table.batch_writer()
+    that paces, retries and checkpoints the writes (see the module docstring).
+
+    Usage:
+        with PacedBatchWriter(table, units_per_second=100) as batch:
+            batch.delete_item(Key={...})
+            batch.put_item(Item={...})
+    """
+
+    def __init__(self, table, units_per_second=None, backoff=None, checkpoint=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            table (boto3.resource): DynamoDB table resource object
+            units_per_second (float): WCU budget per second, or None to write unpaced
+            backoff (Backoff): Retry policy (default: Backoff() using `sleep`)
+            checkpoint (SyncCheckpoint): Progress of an earlier attempt of the same writes,
+                                         which is skipped and then advanced (optional)
+            clock (callable): Monotonic clock in seconds (default: time.monotonic)
+            sleep (callable): Function used to wait (default: time.sleep)
+        """
+        self.table = table
+        self.backoff = backoff or Backoff(sleep=sleep)
+        self.limiter = None
+        if units_per_second is not None:
+            self.limiter = RateLimiter(units_per_second, clock=clock, sleep=sleep)
+        self.checkpoint = checkpoint
+        self.position = 0  # Writes received so far, including skipped ones
+        self._pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def put_item(self, Item):
+        self._add({'PutRequest': {'Item': Item}})
+
+    def delete_item(self, Key):
+        self._add({'DeleteRequest': {'Key': Key}})
+
+    def _add(self, request):
+        self.position += 1
+        if self.checkpoint is not None and self.position <= self.checkpoint.completed:
+            return  # Written by an earlier attempt
+        self._pending.append(request)
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Send the pending writes, retrying until all of them went through.
+
+        Raises:
+            ClientError: If DynamoDB rejected the writes for a reason other than throttling
+            RuntimeError: If some writes were still throttled after max_attempts attempts
+        """
+        if not self._pending:
+            return
+        requests = self._pending
+        self._pending = []
+        if self.limiter is not None:
+            self.limiter.acquire(sum(write_units(request) for request in requests))
+
+        for attempt in range(self.backoff.max_attempts):
+            try:
+                response = self.table.meta.client.batch_write_item(
+                    RequestItems={self.table.name: requests}
+                )
+            except ClientError as error:
+                if not is_throttling_error(error):
+                    raise
+                unprocessed = requests
+            else:
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table.name, [])
+            if not unprocessed:
+                break
+            if self.limiter is not None:
+                self.limiter.throttled()
+            if attempt < self.backoff.max_attempts - 1:
+                self.backoff.wait(attempt)
+            requests = unprocessed
+        else:
+            raise RuntimeError(f'{len(requests)} writes to {self.table.name} were still '
+                               f'throttled after {self.backoff.max_attempts} attempts')
+
+        if self.limiter is not None:
+            self.limiter.succeeded()
+        if self.checkpoint is not None:
+            self.checkpoint.advance(self.position)
@@ -0,0 +1,187 @@
+"""
+Hangman Trivia Game - Assumed-Role Credentials for the Database Management Script
+
+Assumes the PortfolioWebsiteRole through STS from within the process and hands the
+temporary credentials to a dedicated boto3 session, instead of running the AWS CLI in a
+subprocess and passing the keys on through environment variables.
+
+The credentials are cached on disk (readable by the current user only) and reused by
+later runs until shortly before they expire, so a sync started within the hour costs no
+STS call at all. The session refreshes its credentials through the same cache whenever
+they come within REFRESH_MARGIN_SECONDS of expiring, so a sync that runs for longer than
+the one-hour credential window keeps working.
+
+@author Yahia Nassab
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import boto3
+import botocore.session
+from botocore.credentials import RefreshableCredentials
+
+SOURCE_PROFILE = 'PortfolioWebsiteUser'
+ROLE_NAME = 'PortfolioWebsiteRole'
+ROLE_SESSION_NAME = 'PortfolioWebsiteSession'  # Shows up in AWS CloudTrail logs
+
+# Lifetime requested for the temporary credentials
+DURATION_SECONDS = 3600
+
+# Credentials closer than this to expiring are replaced. botocore refreshes credentials
+# once they are within 15 minutes of expiring, so cached credentials are only reused
+# while they are further away than that.
+REFRESH_MARGIN_SECONDS = 15 * 60
+
+CREDENTIAL_CACHE_DIRECTORY = os.path.join(
+    os.path.expanduser('~'), '.aws', 'cache', 'hangmantrivia'
+)
+
+
+def role_arn(account_id, role_name=ROLE_NAME):
+    """Return the ARN of an IAM role of the given account."""
+    return f'arn:aws:iam::{account_id}:role/{role_name}'
+
+
+class RoleCredentialProvider:
+    """
+    Returns temporary credentials of an IAM role, from the disk cache if they are still
+    fresh and from STS otherwise. Called by botocore every time the credentials of the
+    session need a refresh.
+
+    Attributes:
+        role_arn (str): ARN of the role to assume
+        cache_path (str): File holding the cached credentials of this role and session
+    """
+
+    def __init__(self, role_arn, session_name=ROLE_SESSION_NAME, source_profile=SOURCE_PROFILE,
+                 cache_dir=CREDENTIAL_CACHE_DIRECTORY, duration_seconds=DURATION_SECONDS,
+                 refresh_margin=REFRESH_MARGIN_SECONDS, source_session=None, clock=time.time):
+        """
+        Args:
+            role_arn (str): ARN of the role to assume
+            session_name (str): Role session name
+            source_profile (str): AWS profile allowed to assume the role
+            cache_dir (str): Directory of the credential cache, or None to not cache
+            duration_seconds (int): Lifetime requested for the credentials
+            refresh_margin (float): Seconds before expiry at which credentials are replaced
+            source_session (boto3.Session): Session to call STS with (default: a session
+                                            of `source_profile`, created when first needed)
+            clock (callable): Returns the current time in seconds since the epoch
+        """
+        self.role_arn = role_arn
+        self._session_name = session_name
+        self._source_profile = source_profile
+        self._duration_seconds = duration_seconds
+        self._refresh_margin = refresh_margin
+        self._source_session = source_session
+        self._clock = clock
+        self.cache_path = None
+        if cache_dir is not None:
+            key = hashlib.sha256(
+                f'{source_profile}\0{role_arn}\0{session_name}'.encode('utf-8')
+            ).hexdigest()[:32]
+            self.cache_path = os.path.join(cache_dir, f'{key}.json')
+
+    def __call__(self):
+        """
+        Return credentials that are valid for longer than the refresh margin.
+
+        Returns:
+            dict: {'access_key', 'secret_key', 'token', 'expiry_time'}, the metadata
+                  format of botocore's RefreshableCredentials
+        """
+        credentials = self.read_cache()
+        if credentials is None:
+            credentials = self.assume_role()
+            self.write_cache(credentials)
+        return credentials
+
+    def is_fresh(self, credentials):
+        """Return whether credentials expire later than the refresh margin from now."""
+        expiry = datetime.fromisoformat(credentials['expiry_time']).timestamp()
+        return expiry - self._clock() > self._refresh_margin
+
+    def read_cache(self):
+        """
+        Read the cached credentials of the role.
+
+        Returns:
+            dict: Credentials, or None if there are none or they are about to expire
+        """
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path, encoding='utf-8') as file:
+                credentials = json.load(file)
+            if self.is_fresh(credentials):
+                return credentials
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # A missing or unreadable cache only costs an STS call
+        return None
+
+    def write_cache(self, credentials):
+        """
+        Store credentials in the cache, readable and writable by the current user only.
+
+        The file is written next to its destination and moved into place, so a reader
+        never sees half-written credentials.
+
+        Args:
+            credentials (dict): Credentials as returned by assume_role()
+        """
+        if self.cache_path is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+        temporary_path = f'{self.cache_path}.tmp'
+        descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(descriptor, 0o600)  # In case the file existed with wider permissions
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(credentials, file)
+        os.replace(temporary_path, self.cache_path)
+
+    def assume_role(self):
+        """
+        Assume the role through STS.
+
+        Returns:
+            dict: Fresh credentials in the format returned by __call__()
+        """
+        if self._source_session is None:
+            self._source_session = boto3.Session(profile_name=self._source_profile)
+        response = self._source_session.client('sts').assume_role(
+            RoleArn=self.role_arn,
+            RoleSessionName=self._session_name,
+            DurationSeconds=self._duration_seconds,
+        )
+        credentials = response['Credentials']
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': credentials['Expiration'].isoformat(),
+        }
+
+
+def create_role_session(account_id, region_name='us-east-1', **kwargs):
+    """
+    Create a boto3 session that acts as the PortfolioWebsiteRole of an account.
+
+    Args:
+        account_id (str): ID of the AWS account holding the role
+        region_name (str): Default region of the session's clients and resources
+        **kwargs: Options of RoleCredentialProvider (e.g. cache_dir, source_session)
+
+    Returns:
+        boto3.Session: Session whose credentials refresh themselves before they expire
+    """
+    provider = RoleCredentialProvider(role_arn(account_id), **kwargs)
+    credentials = RefreshableCredentials.create_from_metadata(
+        metadata=provider(), refresh_using=provider, method='assume-role'
+    )
+    botocore_session = botocore.session.get_session()
+    botocore_session._credentials = credentials
+    return boto3.Session(botocore_session=botocore_session, region_name=region_name)
@@ -0,0 +1,323 @@
+"""
+Hangman Trivia Game - Word Bank Validation
+
+Checks the word bank files against the clue writing rules of the README before they are
+synced to DynamoDB:
+
+    - An answer has between 4 and 20 letters, at least 3 of them distinct, and no word
+      of more than 12 characters (not enforced for the Drunk bank)
+    - An answer appears only once in its bank, and a clue is never empty
+    - An answer does not start with '#', which marks the table's metadata items
+
+Entries are read from the `bank = {...}` literal of each file rather than by importing
+it, since Python silently keeps only the last of two identical keys in a dict literal.
+Banks too large to keep as Python source can be kept in CSV (`answer,clue` rows) or JSON
+Lines files instead, which are streamed one entry at a time.
+
+Every entry is checked in a single pass that also indexes its letters, so duplicates and
+near-duplicates (answers one typo apart) are found across all banks without comparing
+every pair of answers: each answer is stored under its letters and under every variant
+with one letter deleted, and two answers are near-duplicates if they share any of these
+keys. This covers one inserted, deleted, substituted or swapped letter. The index holds
+about a dozen keys per answer, so the near-duplicate check can be switched off for banks
+with hundreds of thousands of entries.
+
+Usage:
+    python -m backend.db_management.validate_word_bank
+
+@author Yahia Nassab
+"""
+
+import ast
+import csv
+import json
+import os
+import re
+import sys
+
+from ..common.dynamodb_scan import METADATA_PREFIX
+
+WORD_BANK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+WORD_BANK_FILES = {
+    'normal': os.path.join(WORD_BANK_DIRECTORY, 'word_bank_normal.py'),
+    'hard': os.path.join(WORD_BANK_DIRECTORY, 'word_bank_hard.py'),
+    'drunk': os.path.join(WORD_BANK_DIRECTORY, 'word_bank_drunk.py'),
+}
+
+MIN_ANSWER_LETTERS = 4
+MAX_ANSWER_LETTERS = 20
+MIN_UNIQUE_LETTERS = 3
+MAX_WORD_LENGTH = 12
+
+# Banks that are allowed to break the answer length rules (see the README)
+LENGTH_RULE_EXEMPT_BANKS = frozenset({'drunk'})
+
+# Shorter answers often differ by a single letter on purpose (e.g. PARIS and PARTS), so
+# only answers with at least this many letters are checked for near-duplicates
+MIN_NEAR_DUPLICATE_LETTERS = 8
+
+# Field names of the entries in CSV headers and JSON Lines objects
+ANSWER_FIELD = 'answer'
+CLUE_FIELD = 'clue'
+
+_NON_LETTERS = re.compile('[^A-Z]+')
+
+
+def read_bank_file(path):
+    """
+    Read the entries of a word bank file without importing it.
+
+    Args:
+        path (str): Location of a word_bank_*.py file
+
+    Returns:
+        list: (line number, answer, clue) tuples in file order, including duplicates
+
+    Raises:
+        ValueError: If the file does not assign a dict literal of strings to `bank`
+    """
+    with open(path, encoding='utf-8') as file:
+        tree = ast.parse(file.read(), filename=path)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == 'bank'):
+            if not isinstance(node.value, ast.Dict):
+                break
+            entries = []
+            for key, value in zip(node.value.keys, node.value.values):
+                if not (isinstance(key, ast.Constant) and isinstance(key.value, str)
+                        and isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                    raise ValueError(f'{path}:{node.lineno}: bank entries must be string literals')
+                entries.append((key.lineno, key.value, value.value))
+            return entries
+    raise ValueError(f'{path}: no `bank = {{...}}` dict literal found')
+
+
+def read_csv_file(path):
+    """
+    Stream the entries of a CSV word bank file with one `answer,clue` row per entry.
+
+    A first row reading `answer,clue` is taken as a header and skipped, as are blank lines.
+
+    Args:
+        path (str): Location of a .csv file
+
+    Yields:
+        tuple: (line number, answer, clue) in file order, including duplicates
+
+    Raises:
+        ValueError: If a row does not have exactly two fields
+    """
+    with open(path, encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        for row in reader:
+            line = reader.line_num
+            if not row or (line == 1 and [field.strip().lower() for field in row]
+                           == [ANSWER_FIELD, CLUE_FIELD]):
+                continue
+            if len(row) != 2:
+                raise ValueError(f'{path}:{line}: expected 2 fields (answer, clue), '
+                                 f'found {len(row)}')
+            yield line, row[0], row[1]
+
+
+def read_jsonl_file(path):
+    """
+    Stream the entries of a JSON Lines word bank file with one object per line, e.g.
+    {"answer": "PARIS", "clue": "Capital of France"}. Blank lines are skipped.
+
+    Args:
+        path (str): Location of a .jsonl file
+
+    Yields:
+        tuple: (line number, answer, clue) in file order, including duplicates
+
+    Raises:
+        ValueError: If a line is not an object with a string answer and clue
+    """
+    with open(path, encoding='utf-8') as file:
+        for line, text in enumerate(file, 1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as error:
+                raise ValueError(f'{path}:{line}: invalid JSON ({error.msg})') from None
+            if not (isinstance(record, dict) and isinstance(record.get(ANSWER_FIELD), str)
+                    and isinstance(record.get(CLUE_FIELD), str)):
+                raise ValueError(f'{path}:{line}: expected an object with string '
+                                 f'"{ANSWER_FIELD}" and "{CLUE_FIELD}" fields')
+            yield line, record[ANSWER_FIELD], record[CLUE_FIELD]
+
+
+# Reader of each supported word bank file format, by file extension
+BANK_FILE_READERS = {
+    '.py': read_bank_file,
+    '.csv': read_csv_file,
+    '.jsonl': read_jsonl_file,
+    '.ndjson': read_jsonl_file,
+}
+
+
+def read_entries(path):
+    """
+    Read the entries of a word bank file in any supported format.
+
+    Args:
+        path (str): Location of a word_bank_*.py, .csv or .jsonl file
+
+    Returns:
+        iterable: (line number, answer, clue) tuples in file order, including duplicates.
+                  CSV and JSON Lines files are read lazily as the entries are consumed.
+
+    Raises:
+        ValueError: If the file extension is not supported
+    """
+    reader = BANK_FILE_READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f'{path}: unsupported word bank format (expected '
+                         + ', '.join(BANK_FILE_READERS) + ')')
+    return reader(path)
+
+
+def answer_letters(answer):
+    """Return the letters of an answer, which are what the player has to guess."""
+    return _NON_LETTERS.sub('', answer.upper())
+
+
+def check_entry(answer, clue, length_rules=True):
+    """
+    Check one entry against the rules that do not depend on other entries.
+
+    Args:
+        answer (str): Answer of the entry
+        clue (str): Clue of the entry
+        length_rules (bool): Whether to apply the answer length rules
+
+    Returns:
+        list: Descriptions of the rules the entry breaks
+    """
+    problems = []
+    if answer.startswith(METADATA_PREFIX):
+        problems.append(f"answer starts with reserved prefix '{METADATA_PREFIX}'")
+    if not clue.strip():
+        problems.append('clue is empty')
+    if length_rules:
+        letters = answer_letters(answer)
+        if not MIN_ANSWER_LETTERS <= len(letters) <= MAX_ANSWER_LETTERS:
+            problems.append(f'answer has {len(letters)} letters '
+                            f'(expected {MIN_ANSWER_LETTERS}-{MAX_ANSWER_LETTERS})')
+        if len(set(letters)) < MIN_UNIQUE_LETTERS:
+            problems.append(f'answer has fewer than {MIN_UNIQUE_LETTERS} unique letters')
+        long_words = [word for word in answer.split() if len(word) > MAX_WORD_LENGTH]
+        if long_words:
+            problems.append(f'words longer than {MAX_WORD_LENGTH} characters: '
+                            + ', '.join(long_words))
+    return problems
+
+
+def deletion_variants(letters):
+    """Return every string obtained by deleting one letter from `letters`."""
+    return {letters[:i] + letters[i + 1:] for i in range(len(letters))}
+
+
+def validate_entries(entries, exempt_banks=LENGTH_RULE_EXEMPT_BANKS, near_duplicates=True):
+    """
+    Check a stream of word bank entries against every rule in a single pass.
+
+    Args:
+        entries (iterable): (bank name, location, answer, clue) tuples, where location
+                            describes where the entry is defined (e.g. 'file.py:12')
+        exempt_banks (frozenset): Banks that are allowed to break the length rules
+        near_duplicates (bool): Whether to look for near-duplicates, whose index takes
+                                about 1.4 KB per answer
+
+    Returns:
+        dict: {'errors': [message, ...], 'warnings': [message, ...]}. Errors are rule
+              breaks and duplicates within a bank; warnings are answers repeated in
+              another bank and near-duplicates.
+    """
+    errors = []
+    warnings = []
+    by_letters = {}  # {letters: (bank, location, answer)} of the first entry seen
+    # {letters or deletion variant: entry}, or a list of entries once several share a key.
+    # Almost every key belongs to a single entry, so lists are only built on collisions.
+    neighbourhood = {}
+
+    for bank_name, location, answer, clue in entries:
+        for problem in check_entry(answer, clue, bank_name not in exempt_banks):
+            errors.append(f'{location}: {answer!r}: {problem}')
+
+        letters = answer_letters(answer)
+        entry = (bank_name, location, answer)
+        first = by_letters.get(letters)
+        if first is not None:
+            message = f'{location}: {answer!r} duplicates {first[2]!r} ({first[1]})'
+            (errors if first[0] == bank_name else warnings).append(message)
+            continue
+        by_letters[letters] = entry
+
+        if not near_duplicates or len(letters) < MIN_NEAR_DUPLICATE_LETTERS:
+            continue
+        keys = deletion_variants(letters)
+        keys.add(letters)
+        matches = {}
+        for key in keys:
+            bucket = neighbourhood.get(key)
+            if bucket is None:
+                neighbourhood[key] = entry
+            elif type(bucket) is list:
+                matches.update((other[2], other) for other in bucket)
+                bucket.append(entry)
+            else:
+                matches[bucket[2]] = bucket
+                neighbourhood[key] = [bucket, entry]
+        for other in matches.values():
+            warnings.append(f'{location}: {answer!r} is close to {other[2]!r} ({other[1]})')
+
+    return {'errors': errors, 'warnings': warnings}
+
+
+def iter_bank_files(files):
+    """
+    Yield the entries of word bank files in the format expected by validate_entries().
+
+    Args:
+        files (dict): {bank name: path to a word_bank_*.py, .csv or .jsonl file}
+    """
+    for bank_name, path in files.items():
+        for line, answer, clue in read_entries(path):
+            yield bank_name, f'{os.path.basename(path)}:{line}', answer, clue
+
+
+def validate_word_bank_files(files=None, near_duplicates=True):
+    """
+    Check the word bank files against every rule.
+
+    Args:
+        files (dict): {bank name: path} (default: the word banks next to this module)
+        near_duplicates (bool): Whether to look for near-duplicates
+
+    Returns:
+        dict: {'errors': [...], 'warnings': [...]}, as returned by validate_entries()
+    """
+    return validate_entries(
+        iter_bank_files(WORD_BANK_FILES if files is None else files),
+        near_duplicates=near_duplicates,
+    )
+
+
+def print_report(report):
+    """Print the errors and warnings of a validation report, followed by a summary."""
+    for message in report['errors']:
+        print(f'ERROR   {message}')
+    for message in report['warnings']:
+        print(f'WARNING {message}')
+    print(f"Word bank validation: {len(report['errors'])} errors, "
+          f"{len(report['warnings'])} warnings")
+
+
+if __name__ == "__main__":
+    report = validate_word_bank_files()
+    print_report(report)
+    sys.exit(1 if report['errors'] else 0)
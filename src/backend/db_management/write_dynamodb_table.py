@@ -4,16 +4,25 @@ Hangman Trivia Game - Database Management Script
 
 Manages the DynamoDB tables that store trivia questions and answers for the
 Hangman Trivia game. Updates the database tables with new content from local
-word bank files and removes outdated entries.
+word bank files and removes outdated entries. Banks can also be imported from CSV or
+JSON Lines files, which are streamed rather than loaded into memory.
 
 @author Yahia Nassab
 """
 
-import boto3
+import argparse
+import hashlib
 import os
-import subprocess
-import json
+from concurrent.futures import ThreadPoolExecutor
 
+from ..common.answer_index import INDEX_PAGES_ATTRIBUTE, build_index_pages, index_page_key
+from ..common.dynamodb_scan import METADATA_PREFIX, iter_segment, scan_table
+from ..common.word_bank_snapshot import dump_snapshot
+from .paced_writer import Backoff, PacedBatchWriter, SyncCheckpoint
+from .role_credentials import create_role_session
+from .validate_word_bank import (
+    WORD_BANK_FILES, iter_bank_files, print_report, validate_entries, validate_word_bank_files,
+)
 from .word_bank_normal import bank as bank_normal
 from .word_bank_hard import bank as bank_hard
 from .word_bank_drunk import bank as bank_drunk
@@ -27,13 +36,40 @@ TABLE_NAME_DRUNK = 'hangmantrivia-wordbank-drunk'
 PARTITION_KEY = 'answer'
 SECONDARY_KEY = 'clue'
 
-def get_temporary_credentials():
+# Metadata item holding a counter that is bumped on every sync of the table. The
+# Lambda function reads it to decide whether its warm-container cache is stale.
+VERSION_KEY = '#VERSION'
+VERSION_ATTRIBUTE = 'version'
+
+# Every entry carries a stable integer ID that the frontend can report back instead of
+# the answer text. IDs are handed out from a counter on the version item and are never
+# reused, even after the entry holding them is removed.
+ID_ATTRIBUTE = 'id'
+NEXT_ID_ATTRIBUTE = 'next_id'
+
+# Content hash of the word bank written by the last sync, stored on the version item.
+# Together with the entry hashes in the answer index it lets a sync skip unchanged
+# tables and entries without scanning them.
+CONTENT_HASH_ATTRIBUTE = 'content_hash'
+
+# Progress of interrupted syncs, one file per table, so that the next sync resumes them
+CHECKPOINT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sync_checkpoints')
+
+# Default destination of the word bank snapshot that is shipped with the Lambda code
+SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'lambda_function', 'wordbank_snapshot.json'
+)
+
+def get_role_session():
     """
-    Assume a temporary AWS IAM role for enhanced security.
+    Create a boto3 session with temporary credentials of an assumed AWS IAM role.
 
     Uses AWS STS (Security Token Service) to assume a temporary role with limited
     permissions instead of using long-term access keys. This follows AWS security
-    best practices and provides time-limited access to resources.
+    best practices and provides time-limited access to resources. The role is assumed
+    in-process (see role_credentials.py), the credentials are cached on disk until
+    shortly before they expire, and the session refreshes them by itself during long
+    syncs. Nothing is written to the environment.
 
     Role Requirements:
         - PortfolioWebsiteRole must exist in the target AWS account
@@ -44,87 +80,564 @@ def get_temporary_credentials():
 
     Notes:
         - Credentials are temporary and will expire after 1 hour
-        - The PortfolioWebsiteRole profile should be configured in ~/.aws/credentials or
+        - The PortfolioWebsiteUser profile should be configured in ~/.aws/credentials or
           ~/.aws/config
         - Role session name 'PortfolioWebsiteSession' is used for AWS CloudTrail logging
+
+    Returns:
+        boto3.Session: Session acting as PortfolioWebsiteRole
     """
-    cmd = "aws sts assume-role --profile PortfolioWebsiteUser " + \
-    f"--role-arn arn:aws:iam::{AWS_ACCOUNT_ID}:role/PortfolioWebsiteRole " + \
-    "--role-session-name PortfolioWebsiteSession"
-    result = subprocess.run(cmd, shell=True, check=True, stdout=subprocess.PIPE)
-    credentials = json.loads(result.stdout)['Credentials']
-    os.environ['AWS_ACCESS_KEY_ID'] = credentials['AccessKeyId']
-    os.environ['AWS_SECRET_ACCESS_KEY'] = credentials['SecretAccessKey']
-    os.environ['AWS_SESSION_TOKEN'] = credentials['SessionToken']
+    session = create_role_session(AWS_ACCOUNT_ID)
     print('Assumed temporary user role.')
+    return session
 
 
-def remove_temporary_credentials():
+def diff_bank(bank, existing):
     """
-    Remove temporary AWS credentials from environment variables for security cleanup.
+    Compute the changes needed to turn the table contents into the local word bank.
 
-    This function removes the temporary AWS credentials that were set by get_temporary_credentials()
-    to prevent credential leakage and ensure clean environment state. It's designed to be called
-    in a finally block to guarantee cleanup even if errors occur during deployment.
+    Args:
+        bank (dict): Local word bank dictionary {answer: clue, ...}
+        existing (dict): Current table contents {answer: clue, ...}
 
-    Usage Pattern:
-        try:
-            get_temporary_credentials()
-            # Perform CLI operations
-        finally:
-            remove_temporary_credentials()  # Always cleanup
+    Returns:
+        dict: {'added': {answer: clue}, 'changed': {answer: clue}, 'removed': [answer]}
     """
-    for env_variable in ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN']:
-        os.environ.pop(env_variable, None)
+    added = {}
+    changed = {}
+    for answer, clue in bank.items():
+        if answer not in existing:
+            added[answer] = clue
+        elif existing[answer] != clue:
+            changed[answer] = clue
+    removed = [answer for answer in existing if answer not in bank]
+    return {'added': added, 'changed': changed, 'removed': removed}
 
 
-def update_table(bank, table):
+def print_diff(diff, table_name, dry_run=False):
+    """
+    Print a summary of a word bank diff, listing every affected answer on a dry run.
+
+    Args:
+        diff (dict): Diff as returned by diff_bank() or sync_entries()
+        table_name (str): Name of the table the diff applies to
+        dry_run (bool): Whether the diff is only being previewed
+    """
+    prefix = '[dry run] ' if dry_run else ''
+    print(f"{prefix}{table_name}: {len(diff['added'])} added, "
+          f"{len(diff['changed'])} changed, {len(diff['removed'])} removed")
+    if dry_run:
+        for answer in diff['added']:
+            print(f'  + {answer}')
+        for answer in diff['changed']:
+            print(f'  ~ {answer}')
+        for answer in diff['removed']:
+            print(f'  - {answer}')
+
+
+def entry_hash(answer, clue):
+    """Return the content hash of one word bank entry as 16 hex digits."""
+    return hashlib.blake2b(f'{answer}\0{clue}'.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def bank_hash(hashes):
+    """
+    Return the content hash of a whole word bank.
+
+    Args:
+        hashes (dict): Content hashes of the entries {answer: hash, ...}
+
+    Returns:
+        str: Hash that changes whenever an entry is added, removed or edited
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for answer in sorted(hashes):
+        digest.update(hashes[answer].encode('ascii'))
+    return digest.hexdigest()
+
+
+def update_table(bank, table, dry_run=False, full=False, units_per_second=None,
+                 checkpoint_dir=None):
     """
     Synchronizes a local word bank with its corresponding DynamoDB table.
 
-    This function performs a two-way sync:
+    The content hash of the local word bank is compared with the one recorded by the
+    last sync on the table version item, so an unchanged table costs a single read.
+    Otherwise the bank is diffed against the manifest of entry hashes kept in the answer
+    index, or against a scan of the table if there is no usable manifest, and only the
+    resulting changes are written:
     1. Removes entries from DynamoDB that no longer exist in the local word bank
-    2. Adds or updates entries in DynamoDB that exist in the local word bank
+    2. Adds entries that are new and updates entries whose clue has changed
+    3. Rewrites the answer index (see answer_index.py) with the new entry hashes
+    4. Bumps the table version item so that cached banks in the Lambda are invalidated,
+       and records the new content hash on it
+
+    New entries are assigned the next unused stable ID. Existing entries keep their ID,
+    and entries written before IDs existed are rewritten to receive one.
+
+    Writes go through a PacedBatchWriter (see paced_writer.py), which sends them in
+    BatchWriteItem calls of 25 items, optionally paced to a WCU budget, and retries
+    throttled writes and UnprocessedItems with jittered backoff. With a checkpoint
+    directory, the progress of the writes is recorded after every batch, so that
+    running the same sync again after a failure skips the batches already written.
+
+    The hashes only describe what previous syncs wrote. If the table may have been
+    edited by other means, pass full=True to diff against a scan instead.
 
     Args:
         bank (dict): Local word bank dictionary {answer: clue, ...}
         table (boto3.resource): DynamoDB table resource object
+        dry_run (bool): If True, only print the diff without writing anything
+        full (bool): If True, ignore the recorded hashes and diff against a scan
+        units_per_second (float): WCU budget of the writes, or None to write unpaced
+        checkpoint_dir (str): Directory of the checkpoint files (optional)
+
+    Returns:
+        dict: The applied (or previewed) diff, as returned by diff_bank()
+    """
+    hashes = {answer: entry_hash(answer, clue) for answer, clue in bank.items()}
+    diff = sync_entries(table, hashes, bank.items, dry_run, full, units_per_second,
+                        checkpoint_dir)
+    return {
+        'added': {answer: bank[answer] for answer in diff['added']},
+        'changed': {answer: bank[answer] for answer in diff['changed']},
+        'removed': diff['removed'],
+    }
+
+
+def import_table(path, table, dry_run=False, full=False, units_per_second=None,
+                 checkpoint_dir=None, bank_name=None, validate=True):
+    """
+    Synchronizes a DynamoDB table with a word bank file streamed from disk.
+
+    Does the same as update_table() for banks kept in CSV or JSON Lines files (see
+    validate_word_bank.read_entries()), which may be too large to hold in memory. The
+    file is streamed twice through a pipeline of generators:
+    1. parse -> hash -> validate: every entry is checked against the clue writing rules
+       (except the near-duplicate search) while only its content hash is kept
+    2. parse -> select -> batch -> write: the diff is computed from the hashes, and the
+       clues of the added and changed entries are read again and written 25 at a time
+
+    Memory therefore grows with the number of answers but not with the size of the
+    clues. Nothing is written if any entry breaks the rules.
+
+    Args:
+        path (str): Location of the word bank file
+        table (boto3.resource): DynamoDB table resource object
+        dry_run (bool): If True, only print the diff without writing anything
+        full (bool): If True, ignore the recorded hashes and diff against a scan
+        units_per_second (float): WCU budget of the writes, or None to write unpaced
+        checkpoint_dir (str): Directory of the checkpoint files (optional)
+        bank_name (str): Difficulty of the bank, which decides the length rules
+        validate (bool): If False, skip the validation of the entries
+
+    Returns:
+        dict: {'added': [answer], 'changed': [answer], 'removed': [answer]}
+
+    Raises:
+        ValueError: If the file cannot be parsed or an entry breaks the clue rules
+    """
+    files = {bank_name: path}
+    hashes = {}
+    entries = hash_entries(iter_bank_files(files), hashes)
+    if validate:
+        report = validate_entries(entries, near_duplicates=False)
+        print_report(report)
+        if report['errors']:
+            raise ValueError(f"{len(report['errors'])} word bank entries break the clue rules")
+    else:
+        for _ in entries:
+            pass
+
+    def stream_entries():
+        return ((answer, clue) for _, _, answer, clue in iter_bank_files(files))
+
+    return sync_entries(table, hashes, stream_entries, dry_run, full, units_per_second,
+                        checkpoint_dir)
+
+
+def hash_entries(entries, hashes):
+    """
+    Pass word bank entries through while recording the content hash of each.
+
+    Args:
+        entries (iterable): (bank name, location, answer, clue) tuples
+        hashes (dict): Filled with {answer: hash, ...} as the entries are consumed
+
+    Yields:
+        tuple: The entries, unchanged
+    """
+    for entry in entries:
+        hashes[entry[2]] = entry_hash(entry[2], entry[3])
+        yield entry
+
+
+def sync_entries(table, hashes, entries, dry_run=False, full=False, units_per_second=None,
+                 checkpoint_dir=None):
+    """
+    Synchronizes a word bank, given as the hashes of its entries and a way to stream
+    them, with its DynamoDB table. This is the shared core of update_table() and
+    import_table(), whose docstrings describe the steps.
+
+    The diff is computed from the hashes alone, so clues are only read while writing,
+    when the entries are streamed once and the added and changed ones are handed to the
+    batch writer in bank order.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+        hashes (dict): Content hash of every entry of the bank {answer: hash, ...}
+        entries (callable): Returns a fresh iterable of the (answer, clue) pairs of the
+                            bank, in the same order as `hashes`
+        dry_run (bool): If True, only print the diff without writing anything
+        full (bool): If True, ignore the recorded hashes and diff against a scan
+        units_per_second (float): WCU budget of the writes, or None to write unpaced
+        checkpoint_dir (str): Directory of the checkpoint files (optional)
+
+    Returns:
+        dict: {'added': [answer], 'changed': [answer], 'removed': [answer]}
+
+    Raises:
+        RuntimeError: If the streamed entries no longer match the hashes, e.g. because
+                      the bank file was edited during the sync
+    """
+    content_hash = bank_hash(hashes)
+    version_item = read_version_item(table)
+    if (not full and version_item.get(CONTENT_HASH_ATTRIBUTE) == content_hash
+            and INDEX_PAGES_ATTRIBUTE in version_item):
+        diff = {'added': [], 'changed': [], 'removed': []}
+        print_diff(diff, table.name, dry_run)
+        return diff
+
+    manifest = None if full else read_manifest(table, version_item)
+    if manifest is not None:
+        ids = {answer: entry_id for answer, (entry_id, _) in manifest.items()}
+        existing = {answer: digest for answer, (_, digest) in manifest.items()}
+    else:
+        existing, ids = scan_hashes(table)
+    hash_diff = diff_bank(hashes, existing)
+    changed = dict.fromkeys(hash_diff['changed'])
+    # Entries written before IDs existed are rewritten to receive one
+    changed.update(dict.fromkeys(
+        answer for answer in hashes if answer in existing and answer not in ids
+    ))
+    diff = {
+        'added': list(hash_diff['added']),
+        'changed': list(changed),
+        'removed': hash_diff['removed'],
+    }
+    print_diff(diff, table.name, dry_run)
+
+    if dry_run:
+        return diff
+
+    next_id = max(int(version_item.get(NEXT_ID_ATTRIBUTE, 0)), max(ids.values(), default=-1) + 1)
+    for key in diff['removed']:
+        ids.pop(key, None)
+    put_ids = {}
+    for key in diff['added'] + diff['changed']:
+        if key not in ids:
+            ids[key] = next_id
+            next_id += 1
+        put_ids[key] = ids[key]
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        # The writes are fully determined by the content of the bank, the removed
+        # answers and the IDs of the written ones, in the order they are written
+        checkpoint = SyncCheckpoint(
+            os.path.join(checkpoint_dir, f'{table.name}.json'),
+            SyncCheckpoint.plan_id([content_hash] + diff['removed'] + [
+                [answer, put_ids[answer]] for answer in hashes if answer in put_ids
+            ]),
+        )
+        if checkpoint.completed:
+            print(f'{table.name}: resuming after {checkpoint.completed} completed writes')
+    backoff = Backoff()
+    with PacedBatchWriter(table, units_per_second, backoff, checkpoint) as batch:
+        for key in diff['removed']:
+            batch.delete_item(Key={PARTITION_KEY: key})
+        for key, val in entries():
+            entry_id = put_ids.get(key)
+            if entry_id is None or entry_hash(key, val) != hashes[key]:
+                continue
+            del put_ids[key]
+            batch.put_item(Item={PARTITION_KEY: key, SECONDARY_KEY: val, ID_ATTRIBUTE: entry_id})
+    if put_ids:
+        raise RuntimeError(f'{table.name}: {len(put_ids)} entries changed during the sync, '
+                           'run it again')
+
+    # The index is written for the upcoming version before the version is bumped, so
+    # that a sync interrupted in between leaves an index that readers reject as stale
+    pages = build_index_pages(ids, hashes)
+    version = int(version_item.get(VERSION_ATTRIBUTE, 0)) + 1
+    write_index(table, pages, version, int(version_item.get(INDEX_PAGES_ATTRIBUTE, 0)), backoff)
+    bump_table_version(table, next_id, len(pages), content_hash, backoff)
+    if checkpoint is not None:
+        checkpoint.clear()
+    return diff
+
+
+def scan_hashes(table):
+    """
+    Scan a table for the content hash and ID of every entry, one page at a time, so that
+    the clues of the whole table are never held at once.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+
+    Returns:
+        tuple: ({answer: hash, ...}, {answer: id, ...}), where entries written before
+               IDs existed have a hash but no ID
+    """
+    hashes = {}
+    ids = {}
+    for item in iter_segment(table.meta.client, table.name,
+                             (PARTITION_KEY, SECONDARY_KEY, ID_ATTRIBUTE)):
+        answer = item[PARTITION_KEY]
+        if answer.startswith(METADATA_PREFIX):
+            continue
+        hashes[answer] = entry_hash(answer, item.get(SECONDARY_KEY))
+        if ID_ATTRIBUTE in item:
+            ids[answer] = int(item[ID_ATTRIBUTE])
+    return hashes, ids
+
+
+def read_manifest(table, version_item):
+    """
+    Read the entry hashes recorded in the answer index by the last sync.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+        version_item (dict): The table's version item, as returned by read_version_item()
+
+    Returns:
+        dict: {answer: (id, hash), ...}, or None if the index is missing, incomplete,
+              written for another version, or written before entry hashes existed
+    """
+    if INDEX_PAGES_ATTRIBUTE not in version_item:
+        return None
+    version = version_item.get(VERSION_ATTRIBUTE)
+    manifest = {}
+    for page_number in range(int(version_item[INDEX_PAGES_ATTRIBUTE])):
+        response = table.get_item(Key={PARTITION_KEY: index_page_key(page_number)})
+        page = response.get('Item')
+        if page is None or page.get(VERSION_ATTRIBUTE) != version or 'hashes' not in page:
+            return None
+        for answer, entry_id, digest in zip(page['answers'], page['ids'], page['hashes']):
+            manifest[answer] = (int(entry_id), digest)
+    return manifest
+
+
+def read_version_item(table):
+    """
+    Read the table's version item, which holds the version, the first unused entry ID,
+    the number of answer index pages and the content hash of the last synced bank.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+
+    Returns:
+        dict: The version item, empty if the table has never been synced
+    """
+    response = table.get_item(Key={PARTITION_KEY: VERSION_KEY})
+    return response.get('Item', {})
+
+
+def bump_table_version(table, next_id, index_pages, content_hash, backoff=None):
+    """
+    Atomically increment the version counter stored in the table's metadata item.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+        next_id (int): First entry ID that is still unassigned after the sync
+        index_pages (int): Number of answer index pages written for the new version
+        content_hash (str): Content hash of the synced word bank
+        backoff (Backoff): Retry policy for throttled writes (default: Backoff())
 
+    Returns:
+        int: New table version
     """
-    response = table.scan()
-    existing_keys = [item[PARTITION_KEY] for item in response['Items']]
-    keys_to_delete = [key for key in existing_keys if key not in bank]
-    for key in keys_to_delete:
-          table.delete_item(Key={PARTITION_KEY: key})
+    response = (backoff or Backoff()).call(
+        table.update_item,
+        Key={PARTITION_KEY: VERSION_KEY},
+        UpdateExpression='ADD #version :one SET #next_id = :next_id, '
+                         '#index_pages = :index_pages, #content_hash = :content_hash',
+        ExpressionAttributeNames={
+            '#version': VERSION_ATTRIBUTE,
+            '#next_id': NEXT_ID_ATTRIBUTE,
+            '#index_pages': INDEX_PAGES_ATTRIBUTE,
+            '#content_hash': CONTENT_HASH_ATTRIBUTE,
+        },
+        ExpressionAttributeValues={
+            ':one': 1,
+            ':next_id': next_id,
+            ':index_pages': index_pages,
+            ':content_hash': content_hash,
+        },
+        ReturnValues='UPDATED_NEW',
+    )
+    return int(response['Attributes'][VERSION_ATTRIBUTE])
 
-    # Update data store with new keys
-    for key, val in bank.items():
-        table.put_item(Item={PARTITION_KEY: key, SECONDARY_KEY: val})
 
+def write_index(table, pages, version, previous_page_count=0, backoff=None):
+    """
+    Write the answer index pages of a table version and delete pages left over from a
+    larger previous index.
+
+    Args:
+        table (boto3.resource): DynamoDB table resource object
+        pages (list): Pages as returned by build_index_pages()
+        version (int): Table version the pages belong to
+        previous_page_count (int): Number of pages of the previous index
+        backoff (Backoff): Retry policy for throttled writes (default: Backoff())
+    """
+    backoff = backoff or Backoff()
+    for page_number, page in enumerate(pages):
+        backoff.call(table.put_item, Item={
+            PARTITION_KEY: index_page_key(page_number),
+            VERSION_ATTRIBUTE: version,
+            **page,
+        })
+    for page_number in range(len(pages), previous_page_count):
+        backoff.call(table.delete_item, Key={PARTITION_KEY: index_page_key(page_number)})
+
+
+def build_snapshot(tables, path):
+    """
+    Write a snapshot of the synced tables for the Lambda function to serve from.
+
+    The snapshot is built from the tables rather than the local word banks so that it
+    carries the stable IDs assigned by update_table.
+
+    Args:
+        tables (list): DynamoDB table resource objects to include
+        path (str): Destination of the snapshot file
+    """
+    banks = {}
+    for table in tables:
+        items = scan_table(
+            table.meta.client, table.name,
+            attributes=(PARTITION_KEY, SECONDARY_KEY, ID_ATTRIBUTE),
+        )
+        response = table.get_item(Key={PARTITION_KEY: VERSION_KEY})
+        banks[table.name] = {
+            'version': int(response.get('Item', {}).get(VERSION_ATTRIBUTE, 0)),
+            'entries': [
+                (int(item[ID_ATTRIBUTE]), item[PARTITION_KEY], item[SECONDARY_KEY])
+                for item in items
+            ],
+        }
+    dump_snapshot(banks, path)
+    print(f'Wrote word bank snapshot to {path}')
+
+
+def main(dry_run=False, snapshot_path=None, full=False, validate=True, units_per_second=None,
+         checkpoint_dir=CHECKPOINT_DIRECTORY, import_files=None):
+    """
+    Main execution function that coordinates the table update process.
+
+    The word bank files are first checked against the clue writing rules (see
+    validate_word_bank.py), and nothing is synced if any entry breaks them. The three
+    tables are then synced concurrently, since each sync is dominated by waiting on
+    DynamoDB round-trips.
+
+    A bank can be replaced by a CSV or JSON Lines file, which is streamed through
+    import_table() instead of being loaded from its word_bank_*.py module. The search for
+    near-duplicates is then skipped, since its index would have to hold every answer of
+    the imported files.
+
+    Args:
+        dry_run (bool): If True, only print the diff of each table without writing
+        snapshot_path (str): If given, write a snapshot of the synced tables to this path
+        full (bool): If True, diff every table against a scan instead of the hashes
+                     recorded by the last sync
+        validate (bool): If False, skip the validation of the word bank files
+        units_per_second (float): WCU budget of the writes to each table, or None to
+                                  write unpaced
+        checkpoint_dir (str): Directory of the checkpoint files that let an interrupted
+                              sync resume, or None to start every sync over
+        import_files (dict): Word bank files to sync instead of the word_bank_*.py
+                             modules {bank name: path, ...} (optional)
+
+    Raises:
+        ValueError: If a word bank entry breaks the clue writing rules, or a bank to
+                    import is not 'normal', 'hard' or 'drunk'
+    """
+    import_files = import_files or {}
+    unknown = sorted(set(import_files) - set(WORD_BANK_FILES))
+    if unknown:
+        raise ValueError(f"Unknown word banks to import: {', '.join(unknown)}")
 
-def main():
-    """Main execution function that coordinates the table update process."""
     print('Starting...')
+    if validate:
+        report = validate_word_bank_files(WORD_BANK_FILES | import_files,
+                                          near_duplicates=not import_files)
+        print_report(report)
+        if report['errors']:
+            raise ValueError(f"{len(report['errors'])} word bank entries break the clue rules")
+
     try:
-        get_temporary_credentials()
+        session = get_role_session()
 
-        ddb = boto3.resource('dynamodb', region_name='us-east-1')
+        ddb = session.resource('dynamodb', region_name='us-east-1')
         table_normal = ddb.Table(TABLE_NAME_NORMAL)
         table_hard = ddb.Table(TABLE_NAME_HARD)
         table_drunk = ddb.Table(TABLE_NAME_DRUNK)
 
-        print('Updating Normal Table...')
-        update_table(bank_normal, table_normal)
-        print('Updating Hard Table...')
-        update_table(bank_hard, table_hard)
-        print('Updating Drunk Table...')
-        update_table(bank_drunk, table_drunk)
+        print('Updating Normal, Hard and Drunk Tables...')
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = []
+            for bank_name, bank, table in (('normal', bank_normal, table_normal),
+                                           ('hard', bank_hard, table_hard),
+                                           ('drunk', bank_drunk, table_drunk)):
+                if bank_name in import_files:
+                    # Already validated together with the other banks above
+                    futures.append(executor.submit(
+                        import_table, import_files[bank_name], table, dry_run, full,
+                        units_per_second, checkpoint_dir, bank_name, False,
+                    ))
+                else:
+                    futures.append(executor.submit(
+                        update_table, bank, table, dry_run, full, units_per_second,
+                        checkpoint_dir,
+                    ))
+            for future in futures:
+                future.result()  # re-raise any exception from the sync
+
+        if snapshot_path is not None and not dry_run:
+            build_snapshot([table_normal, table_hard, table_drunk], snapshot_path)
 
     finally:
-        remove_temporary_credentials()
         print('Done.')
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Sync the word banks to DynamoDB.')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print the changes for each table without writing them')
+    parser.add_argument('--snapshot', nargs='?', const=SNAPSHOT_PATH, metavar='PATH',
+                        help='after syncing, write a word bank snapshot for the Lambda '
+                             'function (default path: next to lambda_function.py)')
+    parser.add_argument('--full', action='store_true',
+                        help='diff against a scan of each table, e.g. after editing a '
+                             'table by hand, instead of the hashes of the last sync')
+    parser.add_argument('--skip-validation', action='store_true',
+                        help='sync even if the word banks break the clue writing rules')
+    parser.add_argument('--wcu', type=float, metavar='UNITS',
+                        help='pace the writes to each table to this many write capacity '
+                             'units per second (default: unpaced)')
+    parser.add_argument('--import', dest='import_files', action='append', default=[],
+                        metavar='BANK=PATH',
+                        help='sync a bank (normal, hard or drunk) from a .csv or .jsonl '
+                             'file instead of its word_bank_*.py module; can be repeated')
+    args = parser.parse_args()
+    import_files = {}
+    for argument in args.import_files:
+        bank_name, separator, path = argument.partition('=')
+        if not separator or not path:
+            parser.error(f'--import expects BANK=PATH, got {argument!r}')
+        import_files[bank_name] = path
+    main(dry_run=args.dry_run, snapshot_path=args.snapshot, full=args.full,
+         validate=not args.skip_validation, units_per_second=args.wcu,
+         import_files=import_files)
 
@@ -0,0 +1,135 @@
+"""
+Hangman Trivia Backend - Concurrent Multi-Request Handler
+
+An asyncio-based variant of lambda_handler that serves several clue requests in one
+invocation, e.g. one per difficulty to prefill the game, or one per player when requests
+are batched by a proxy. Each request runs on a shared thread pool, since boto3 calls are
+blocking, and the event loop gathers the results. Requests for different tables that
+miss the cache therefore load their banks from DynamoDB concurrently, while requests
+for the same table wait for a single load.
+
+The batch body is checked like the body of a single request (see parse_body), and a
+batch that is malformed or holds more than MAX_REQUESTS_PER_BATCH requests is answered
+with a 400 as a whole. Each request of a valid batch is validated on its own.
+
+Request Format:
+{
+    "requests": [
+        {"difficulty": "normal", "seen": [...]},   // Same format as lambda_handler
+        {"difficulty": "hard", "count": 3},
+        ...
+    ]
+}
+
+Response Format:
+{
+    "statusCode": 200,
+    "body": {
+        "responses": [
+            {"statusCode": 200, "body": {"clue": ..., "answer": ...}},
+            {"statusCode": 204, "body": {"message": ...}},
+            ...
+        ]
+    }
+}
+
+@author Yahia Nassab
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .lambda_function import RequestError, error_response, parse_body, serve_clues
+from .metrics import start_request_metrics
+
+# Threads serving the requests of one invocation (and of later ones in the container)
+ASYNC_MAX_WORKERS = int(os.environ.get('ASYNC_MAX_WORKERS', 8))
+
+# Upper bound on the number of requests batched into one invocation
+MAX_REQUESTS_PER_BATCH = 50
+
+_executor = None
+
+
+def get_executor():
+    """Return the container's thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS)
+    return _executor
+
+
+def serve_one(data):
+    """
+    Serve one request of a batch, turning any failure into an error response (400 for a
+    malformed request, 500 otherwise).
+
+    Args:
+        data (dict): Parsed clue request
+
+    Returns:
+        dict: Response with the body decoded, so the batch is not JSON-encoded twice
+    """
+    try:
+        response = serve_clues(data)
+    except Exception as e:
+        response = error_response(e)
+    return {'statusCode': response['statusCode'], 'body': json.loads(response['body'])}
+
+
+async def serve_batch(requests):
+    """
+    Serve a batch of clue requests concurrently.
+
+    Args:
+        requests (list): Parsed clue requests
+
+    Returns:
+        list: One response per request, in the same order
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    return await asyncio.gather(
+        *(loop.run_in_executor(executor, serve_one, data) for data in requests)
+    )
+
+
+def batch_lambda_handler(event, context):
+    """
+    AWS Lambda entry point for serving several clue requests in one invocation.
+
+    Args:
+        event (dict): AWS Lambda event object containing HTTP request data
+        context (LambdaContext): AWS Lambda context object (not used)
+
+    Returns:
+        dict: HTTP response with status code and JSON body (see the module docstring). A
+              malformed or oversized batch is answered with a 400 before any request of
+              it is served.
+    """
+    metrics = start_request_metrics()
+    try:
+        with metrics.phase('Parse'):
+            requests = parse_body(event).get('requests')
+            if not isinstance(requests, list) or not requests:
+                raise RequestError('requests must be a non-empty list')
+            if len(requests) > MAX_REQUESTS_PER_BATCH:
+                raise RequestError(f'requests holds {len(requests)} requests, the limit is '
+                                   f'{MAX_REQUESTS_PER_BATCH}')
+        metrics.add('BatchSize', len(requests))
+
+        with metrics.phase('ServeBatch'):
+            responses = asyncio.run(serve_batch(requests))
+
+        response = {
+            'statusCode': 200,
+            'body': json.dumps({'responses': responses}),
+        }
+    except Exception as e:
+        response = error_response(e)
+
+    metrics.set_property('StatusCode', response['statusCode'])
+    metrics.emit()
+    return response
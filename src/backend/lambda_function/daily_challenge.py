@@ -0,0 +1,106 @@
+"""
+Hangman Trivia Backend - Daily Challenge
+
+A daily mode in which every player of a difficulty gets the same set of clues for the
+day, so that the response can be computed once and served to everyone from a shared
+cache, by the Lambda container and by any CDN or browser in front of it.
+
+The set of a day is chosen by rendezvous hashing: every entry of the bank is scored with
+a hash keyed by the difficulty and the date, and the DAILY_CLUE_COUNT lowest scores win.
+Entries are scored by their stable ID (or by their answer, if they have none), so the
+choice does not depend on the order the bank was loaded in and is the same in every
+container holding the same bank. A sync that adds or removes entries only changes the
+set of a day if it removes one of the chosen entries or adds one that scores lower.
+
+Players cannot ask for the set of a future day, and the response for the current day
+may be cached until the next UTC midnight. Sets of past days are only replayed, so they
+may be cached for a year.
+
+@author Yahia Nassab
+"""
+
+import hashlib
+import heapq
+from datetime import date, datetime, timedelta, timezone
+
+# Number of clues in the daily set of each difficulty
+DAILY_CLUE_COUNT = 10
+
+# Cache lifetime of the sets of past days, in seconds
+PAST_DAY_MAX_AGE = 365 * 24 * 3600
+
+
+def utc_now():
+    """Return the current time in UTC."""
+    return datetime.now(timezone.utc)
+
+
+def parse_day(value, now):
+    """
+    Resolve the day asked for by the "daily" field of a request.
+
+    Args:
+        value: True or 'today' for the current day, or an ISO date string ('YYYY-MM-DD')
+        now (datetime): Current time in UTC
+
+    Returns:
+        date: Day of the daily set
+
+    Raises:
+        ValueError: If the value is not a date, or a date after the current day
+    """
+    today = now.date()
+    if value is True or value == 'today':
+        return today
+    if not isinstance(value, str) or len(value) != 10:
+        raise ValueError("daily must be true, 'today' or a date (YYYY-MM-DD)")
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'daily is not a valid date: {value}') from None
+    if day > today:
+        raise ValueError(f'The daily clues of {value} are not available yet')
+    return day
+
+
+def select_daily(bank, difficulty, day, count=DAILY_CLUE_COUNT):
+    """
+    Choose the daily set of a difficulty, in the order it is played.
+
+    Args:
+        bank (WordBank): Word bank of the difficulty
+        difficulty (str): Difficulty of the bank, so that each one gets its own set
+        day (date): Day of the set
+        count (int): Number of clues in the set
+
+    Returns:
+        list: Bank indices of at most `count` entries
+    """
+    key = hashlib.sha256(f'{difficulty}:{day.isoformat()}'.encode('utf-8')).digest()
+
+    def score(index):
+        entry_id = bank.ids[index]
+        name = bank.answers[index] if entry_id is None else str(entry_id)
+        return hashlib.blake2b(name.encode('utf-8'), key=key, digest_size=8).digest()
+
+    return heapq.nsmallest(count, range(len(bank)), key=score)
+
+
+def cache_control(day, now):
+    """
+    Build the Cache-Control header of a daily set.
+
+    Args:
+        day (date): Day of the set
+        now (datetime): Current time in UTC
+
+    Returns:
+        str: Header value allowing shared caches to keep the set until it can no longer
+             change (the next UTC midnight for the current day)
+    """
+    if day < now.date():
+        max_age = PAST_DAY_MAX_AGE
+    else:
+        midnight = datetime.combine(day + timedelta(days=1), datetime.min.time(), timezone.utc)
+        max_age = max(int((midnight - now).total_seconds()), 0)
+    return f'public, max-age={max_age}, immutable'
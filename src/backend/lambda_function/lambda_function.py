@@ -5,17 +5,535 @@ Serves as the backend API for the Hangman Trivia game. Retrieves trivia question
 answers from DynamoDB tables based on difficulty level and ensures questions are not
 repeated by filtering out previously seen answers.
 
+If a word bank snapshot (built by write_dynamodb_table.py) is shipped alongside this
+module, it is loaded once at import and clues are served from it without any DynamoDB
+calls. Tables missing from the snapshot fall back to DynamoDB.
+
+Word banks read from DynamoDB are cached per table at module level so that they survive
+across invocations in a warm Lambda container. A cached bank is served without any
+DynamoDB round-trips until its TTL expires, after which the table's version item
+(written by write_dynamodb_table.update_table) is read to decide whether a rescan is
+needed.
+
+Tables synced by write_dynamodb_table.py also hold a compact answer index (see
+answer_index.py). When it is present and the bank holds at least INDEX_MIN_ENTRIES
+answers, a bank is loaded by reading the index instead of scanning the table, and only
+the clues that are actually served are read, with one GetItem (or BatchGetItem) call per
+request. Entries deleted since the index was read are redrawn from the current index
+(see draw_clues). Smaller banks are scanned anyway, which costs about as much as the
+clue reads of a few requests, so that their warm requests are served from memory.
+
+Daily requests are answered with a set of clues shared by every player of a difficulty
+for the day (see daily_challenge.py). The serialized response is computed on the first
+request of the day and then served from a module-level cache, keyed by the fingerprint
+of the current bank so that containers holding the same bank serve the same set, with
+Cache-Control headers that let a CDN in front of the function serve it as well.
+Daily sets can also be requested with GET, whose responses CDNs cache by URL.
+
+Clues are drawn uniformly by default. With CLUE_WEIGHTING=recent, newly added clues are
+drawn more often, through a Walker alias table built once per cached bank (see
+sampling.py), so a weighted draw costs the same as a uniform one.
+
+Round outcomes reported by the frontend (see outcome_stats.py) are aggregated per clue
+in the container and written in batches of concurrent atomic counter updates, checked
+after every outcome report, instead of one write per round. Clue requests never wait
+for these writes.
+
+Requests are validated before any of this happens: malformed requests and payloads over
+the size limits are answered with a 400 without parsing the rest of the body or touching
+DynamoDB.
+
+To keep cold starts short, boto3 is only imported when a bank actually has to be read
+from DynamoDB, and a single low-level DynamoDB client is then reused for the lifetime
+of the container. Wake-up requests create the client and fill the cache of all three
+banks concurrently ahead of the first real request, and containers started for
+provisioned concurrency do the same during the init phase.
+
 @author Yahia Nassab
 """
 
-import boto3
 import json
-import random
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..common.answer_index import INDEX_PAGES_ATTRIBUTE, batch_get_items, read_index
+from ..common.dynamodb_scan import scan_table
+from ..common.word_bank_snapshot import load_snapshot
+from .daily_challenge import cache_control, parse_day, select_daily, utc_now
+from .metrics import NULL_METRICS, RequestMetrics, start_request_metrics
+from .outcome_stats import OutcomeBuffer, install_shutdown_flush
+from .sampling import WeightedSampler, WordBank, recency_weights
+from .seen_encoding import decode_seen
+from .session_deck import deal
 
 TABLE_NAME_NORMAL = 'hangmantrivia-wordbank-normal'
 TABLE_NAME_HARD = 'hangmantrivia-wordbank-hard'
 TABLE_NAME_DRUNK = 'hangmantrivia-wordbank-drunk'
 
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+ID_ATTRIBUTE = 'id'
+
+# Metadata item holding a counter that is bumped on every sync of the table
+VERSION_KEY = '#VERSION'
+VERSION_ATTRIBUTE = 'version'
+
+# Number of parallel segments used when scanning a word bank table
+SCAN_TOTAL_SEGMENTS = int(os.environ.get('SCAN_TOTAL_SEGMENTS', 1))
+
+# Load banks from the answer index when the table has one, instead of scanning it
+USE_ANSWER_INDEX = os.environ.get('USE_ANSWER_INDEX', '1').lower() in ('1', 'true')
+
+# Banks with fewer answers are scanned even if their table has an index, so that their
+# clues are cached too
+INDEX_MIN_ENTRIES = int(os.environ.get('ANSWER_INDEX_MIN_ENTRIES', 2000))
+
+# Word bank table of each difficulty accepted in requests
+TABLE_NAMES = {
+    'normal': TABLE_NAME_NORMAL,
+    'hard': TABLE_NAME_HARD,
+    'drunk': TABLE_NAME_DRUNK,
+}
+
+# Weighting of clue draws: 'uniform', or 'recent' to draw the NEW_CLUE_FRACTION of clues
+# with the highest IDs NEW_CLUE_WEIGHT times as often as the others
+CLUE_WEIGHTING = os.environ.get('CLUE_WEIGHTING', 'uniform').lower()
+NEW_CLUE_FRACTION = float(os.environ.get('NEW_CLUE_FRACTION', 0.1))
+NEW_CLUE_WEIGHT = float(os.environ.get('NEW_CLUE_WEIGHT', 3))
+
+# Upper bound on the number of clues returned by a single request
+MAX_CLUES_PER_REQUEST = 20
+
+# Limits on request payloads, checked before a request does any work. Legacy seen lists,
+# which the frontend grows by appending, are cut to their MAX_SEEN_ANSWERS newest answers
+# (about 150 KB) rather than rejected. Larger seen sets should use a compact encoding,
+# whose 64 KB limit fits a bitmap of about 390000 IDs.
+MAX_BODY_LENGTH = 256 * 1024
+MAX_SEEN_ANSWERS = 5000
+MAX_SEEN_ENCODED_LENGTH = 64 * 1024
+
+# Limits on outcome reports. Wrong guesses are distinct letters, so at most 26 per round.
+MAX_OUTCOMES_PER_REQUEST = 50
+MAX_WRONG_GUESSES = 26
+MAX_ANSWER_LENGTH = 100
+
+# Daily sets kept by the daily cache, which mostly holds the current day of each difficulty
+MAX_DAILY_CACHE_ENTRIES = 32
+
+# Seconds a cached bank is served before the table version is checked again
+BANK_CACHE_TTL_SECONDS = float(os.environ.get('BANK_CACHE_TTL_SECONDS', 300))
+
+# Word bank snapshot shipped with the Lambda code, used instead of DynamoDB if present
+SNAPSHOT_PATH = os.environ.get(
+    'WORDBANK_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wordbank_snapshot.json'),
+)
+
+# {table_name: {'bank': WordBank, 'version': ..., 'checked_at': ...}}
+_bank_cache = {}
+
+# One lock per table, so that concurrent requests missing the cache load a bank only once
+_bank_locks = {}
+
+# Weighted sampler of each table {table_name: WeightedSampler}, rebuilt with the bank
+_weighted_samplers = {}
+
+# Serialized daily sets {(difficulty, day, bank fingerprint): body}, which never change
+# once computed, oldest first. Every access holds _daily_cache_lock, since requests of
+# all difficulties insert and evict entries concurrently.
+_daily_cache = OrderedDict()
+_daily_cache_lock = threading.Lock()
+
+# One lock per difficulty, so that concurrent requests compute a daily set only once
+_daily_locks = {difficulty: threading.Lock() for difficulty in TABLE_NAMES}
+
+# Round outcomes waiting to be written to the outcome table
+_outcome_buffer = OutcomeBuffer()
+
+# Low-level DynamoDB client shared by all invocations in this container
+_dynamodb_client = None
+_dynamodb_client_lock = threading.Lock()
+
+
+def load_snapshot_banks(path):
+    """
+    Load the word banks of a snapshot file, if it exists.
+
+    Args:
+        path (str): Location of the snapshot file
+
+    Returns:
+        dict: {table_name: WordBank}, empty if there is no snapshot
+    """
+    if not os.path.exists(path):
+        return {}
+    return {
+        table_name: WordBank(
+            dict(zip(bank['answers'], bank['clues'])),
+            dict(zip(bank['answers'], bank['ids'])),
+        )
+        for table_name, bank in load_snapshot(path).items()
+    }
+
+
+# Loaded once per container, during the Lambda init phase
+_snapshot_banks = load_snapshot_banks(SNAPSHOT_PATH)
+
+
+def invalidate_bank_cache(table_name=None):
+    """
+    Drop cached word banks so that the next request rescans the table.
+
+    Args:
+        table_name (str): Table whose cached bank should be dropped. If None, the
+                          banks of all tables are dropped.
+    """
+    if table_name is None:
+        _bank_cache.clear()
+    else:
+        _bank_cache.pop(table_name, None)
+
+
+def clear_daily_cache():
+    """Drop the cached daily sets so that the next daily request computes its set again."""
+    with _daily_cache_lock:
+        _daily_cache.clear()
+
+
+def get_cached_daily(key):
+    """Return the cached body of a daily set, keyed by (difficulty, day, bank fingerprint)."""
+    with _daily_cache_lock:
+        return _daily_cache.get(key)
+
+
+def cache_daily(key, body):
+    """Cache the body of a daily set, evicting the oldest set if the cache is full."""
+    with _daily_cache_lock:
+        _daily_cache[key] = body
+        while len(_daily_cache) > MAX_DAILY_CACHE_ENTRIES:
+            _daily_cache.popitem(last=False)
+
+
+def get_dynamodb_client():
+    """
+    Return the container's DynamoDB client, creating it on first use.
+
+    boto3 is imported here rather than at module load, so containers that serve every
+    request from the snapshot never pay for importing it.
+
+    Returns:
+        botocore.client.DynamoDB: Low-level DynamoDB client
+    """
+    global _dynamodb_client
+    if _dynamodb_client is None:
+        with _dynamodb_client_lock:
+            if _dynamodb_client is None:
+                import boto3
+                _dynamodb_client = boto3.client('dynamodb')
+    return _dynamodb_client
+
+
+def reset_dynamodb_client():
+    """Drop the container's DynamoDB client so that the next use creates a new one."""
+    global _dynamodb_client
+    _dynamodb_client = None
+
+
+def read_version_item(client, table_name, metrics=NULL_METRICS):
+    """
+    Read the table version and the number of answer index pages from the version item.
+
+    Args:
+        client (botocore.client.DynamoDB): Low-level DynamoDB client
+        table_name (str): Name of the DynamoDB table
+        metrics (RequestMetrics): Recorder for DynamoDB calls and consumed capacity
+
+    Returns:
+        tuple: (version, index_pages), each None if the table does not record it
+    """
+    kwargs = {}
+    if metrics.enabled:
+        kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+    response = client.get_item(
+        TableName=table_name,
+        Key={PARTITION_KEY: {'S': VERSION_KEY}},
+        ProjectionExpression='#version, #index_pages',
+        ExpressionAttributeNames={
+            '#version': VERSION_ATTRIBUTE,
+            '#index_pages': INDEX_PAGES_ATTRIBUTE,
+        },
+        **kwargs,
+    )
+    metrics.add('DynamoDBCalls')
+    metrics.add('ConsumedReadCapacity',
+                response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+    item = response.get('Item', {})
+    return tuple(
+        None if attribute not in item else int(item[attribute]['N'])
+        for attribute in (VERSION_ATTRIBUTE, INDEX_PAGES_ATTRIBUTE)
+    )
+
+
+def get_bank(table_name, metrics=NULL_METRICS):
+    """
+    Return the word bank of a table, serving it from the snapshot or the warm-container
+    cache if possible.
+
+    Banks in the snapshot are returned directly. Otherwise, within the TTL, the cached
+    bank is returned with zero DynamoDB round-trips. Once the TTL has expired, the
+    version item is read; the table is only rescanned if the version changed since the
+    bank was cached (or if the table is unversioned). Concurrent requests that miss the
+    cache of the same table wait for a single load instead of each scanning the table.
+
+    The source of the bank is recorded as the 'BankSource' property ('snapshot', 'cache',
+    'revalidated', 'index' or 'scan') and as a 'CacheHit' count.
+
+    Args:
+        table_name (str): Name of the DynamoDB table holding the word bank
+        metrics (RequestMetrics): Recorder for the bank source and DynamoDB usage
+
+    Returns:
+        WordBank: Word bank of the table
+    """
+    if table_name in _snapshot_banks:
+        record_bank_source(metrics, 'snapshot')
+        return _snapshot_banks[table_name]
+
+    entry = _bank_cache.get(table_name)
+    if entry is not None and time.monotonic() - entry['checked_at'] < BANK_CACHE_TTL_SECONDS:
+        record_bank_source(metrics, 'cache')
+        return entry['bank']
+
+    with _bank_locks.setdefault(table_name, threading.Lock()):
+        # Another request may have refreshed the bank while this one was waiting
+        entry = _bank_cache.get(table_name)
+        now = time.monotonic()
+        if entry is not None and now - entry['checked_at'] < BANK_CACHE_TTL_SECONDS:
+            record_bank_source(metrics, 'cache')
+            return entry['bank']
+        return load_bank(table_name, entry, now, metrics)
+
+
+def load_bank(table_name, entry, now, metrics=NULL_METRICS):
+    """
+    Revalidate or reload the cached bank of a table from DynamoDB.
+
+    The bank is read from the table's answer index if it has a complete one for the
+    current version with at least INDEX_MIN_ENTRIES answers, in which case it holds no
+    clues. Otherwise the table is scanned.
+
+    Args:
+        table_name (str): Name of the DynamoDB table holding the word bank
+        entry (dict): Current cache entry of the table, or None
+        now (float): time.monotonic() timestamp to record as the time of the check
+        metrics (RequestMetrics): Recorder for the bank source and DynamoDB usage
+
+    Returns:
+        WordBank: Word bank of the table
+    """
+    client = get_dynamodb_client()
+    version, index_pages = read_version_item(client, table_name, metrics)
+    if entry is not None and version is not None and version == entry['version']:
+        entry['checked_at'] = now
+        record_bank_source(metrics, 'revalidated')
+        return entry['bank']
+
+    stats = {} if metrics.enabled else None
+    entries = None
+    if USE_ANSWER_INDEX and index_pages is not None:
+        entries = read_index(client, table_name, version, index_pages, stats)
+    if entries is not None and len(entries) >= INDEX_MIN_ENTRIES:
+        record_bank_source(metrics, 'index')
+        bank = WordBank(
+            {answer: None for _, answer in entries},
+            {answer: entry_id for entry_id, answer in entries},
+        )
+    else:
+        items = scan_table(
+            client,
+            table_name,
+            attributes=(PARTITION_KEY, SECONDARY_KEY, ID_ATTRIBUTE),
+            total_segments=SCAN_TOTAL_SEGMENTS,
+            stats=stats,
+        )
+        record_bank_source(metrics, 'scan')
+        bank = WordBank(
+            {item[PARTITION_KEY]: item[SECONDARY_KEY] for item in items},
+            {item[PARTITION_KEY]: int(item[ID_ATTRIBUTE])
+             for item in items if ID_ATTRIBUTE in item},
+        )
+    if stats is not None:
+        metrics.add('DynamoDBCalls', stats.get('calls', 0))
+        metrics.add('ScannedItems', stats.get('scanned_count', 0))
+        metrics.add('ConsumedReadCapacity', stats.get('consumed_capacity', 0))
+    _bank_cache[table_name] = {'bank': bank, 'version': version, 'checked_at': now}
+    return bank
+
+
+def get_sampler(table_name, bank):
+    """
+    Return the sampler that draws the clues of a bank with the configured weighting.
+
+    The alias table of a weighted sampler takes O(bank) to build, so it is built once
+    per bank and reused until the cached bank of the table is replaced.
+
+    Args:
+        table_name (str): Name of the DynamoDB table holding the word bank
+        bank (WordBank): Current word bank of the table
+
+    Returns:
+        WordBank | WeightedSampler: The bank itself for uniform draws, otherwise a
+                                    weighted sampler of the bank
+    """
+    if CLUE_WEIGHTING != 'recent':
+        return bank
+    sampler = _weighted_samplers.get(table_name)
+    if sampler is None or sampler.bank is not bank:
+        weights = recency_weights(bank, NEW_CLUE_FRACTION, NEW_CLUE_WEIGHT)
+        sampler = _weighted_samplers[table_name] = WeightedSampler(bank, weights)
+    return sampler
+
+
+def fetch_clues(table_name, bank, indices, metrics=NULL_METRICS):
+    """
+    Read the clues of entries of a bank that was loaded from the answer index.
+
+    Args:
+        table_name (str): Name of the DynamoDB table holding the word bank
+        bank (WordBank): Word bank without clues
+        indices (list): Indices of the entries to read
+        metrics (RequestMetrics): Recorder for DynamoDB usage
+
+    Returns:
+        dict: {index: clue} for the entries that are still in the table
+    """
+    client = get_dynamodb_client()
+    stats = {} if metrics.enabled else None
+    answers = [bank.answers[index] for index in indices]
+    if len(answers) == 1:
+        kwargs = {}
+        if stats is not None:
+            kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+        response = client.get_item(
+            TableName=table_name,
+            Key={PARTITION_KEY: {'S': answers[0]}},
+            ProjectionExpression='#clue',
+            ExpressionAttributeNames={'#clue': SECONDARY_KEY},
+            **kwargs,
+        )
+        items = {}
+        if 'Item' in response:
+            items[answers[0]] = {SECONDARY_KEY: response['Item'][SECONDARY_KEY]['S']}
+        if stats is not None:
+            stats['calls'] = 1
+            stats['consumed_capacity'] = (
+                response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+            )
+    else:
+        items = batch_get_items(client, table_name, answers, (SECONDARY_KEY,), stats)
+    if stats is not None:
+        metrics.add('DynamoDBCalls', stats.get('calls', 0))
+        metrics.add('ConsumedReadCapacity', stats.get('consumed_capacity', 0))
+    return {
+        index: items[answer][SECONDARY_KEY]
+        for index, answer in zip(indices, answers) if answer in items
+    }
+
+
+def record_bank_source(metrics, source):
+    """Record where a word bank was served from, counting banks not read from DynamoDB
+    (or revalidated against it) as a hit."""
+    metrics.set_property('BankSource', source)
+    metrics.add('CacheHit', 0 if source in ('scan', 'index') else 1)
+
+
+def preload_banks():
+    """
+    Create the DynamoDB client and cache every word bank ahead of the first real request.
+
+    The banks are loaded concurrently, one thread per table, so the preload takes about
+    as long as the slowest bank rather than the sum of all three. Failures are reported
+    but not raised, since a failed preload only means the first request loads the bank
+    itself.
+
+    Returns:
+        dict: {'ms': total milliseconds, 'banks': {difficulty: report}}, where the report
+              of each bank holds its 'ms', 'source' (see get_bank) and 'size', or the
+              'error' that stopped it from loading
+    """
+    def preload(table_name):
+        recorder = RequestMetrics()
+        start = time.perf_counter()
+        try:
+            bank = get_bank(table_name, recorder)
+        except Exception as e:
+            print(f'Could not preload {table_name}: {e}')
+            return {'error': str(e)}
+        return {
+            'ms': round((time.perf_counter() - start) * 1000, 2),
+            'source': recorder.properties['BankSource'],
+            'size': len(bank),
+        }
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(TABLE_NAMES)) as executor:
+        reports = dict(zip(TABLE_NAMES, executor.map(preload, TABLE_NAMES.values())))
+    return {'ms': round((time.perf_counter() - start) * 1000, 2), 'banks': reports}
+
+
+def init_preload(environ=os.environ):
+    """
+    Preload the word banks during the Lambda init phase, if enabled.
+
+    With provisioned concurrency, the init phase runs before the container receives any
+    request, so preloading there takes the bank loads off the request path entirely. For
+    on-demand containers it would only make the cold start load three banks instead of
+    one, so by default it is left to the wake-up request. PRELOAD_ON_INIT overrides the
+    choice: '1'/'true' always preloads at init, '0'/'false' never does.
+
+    Args:
+        environ (dict): Environment variables to decide from (default: os.environ)
+
+    Returns:
+        dict: Report of the preload, as returned by preload_banks(), or None if the banks
+              were not preloaded
+    """
+    setting = environ.get('PRELOAD_ON_INIT', 'auto').lower()
+    if setting in ('1', 'true'):
+        enabled = True
+    elif setting in ('0', 'false'):
+        enabled = False
+    else:
+        enabled = environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency'
+    if not enabled:
+        return None
+    report = preload_banks()
+    print(json.dumps({'initPreload': report}))
+    return report
+
+
+def clue_body(bank, index, clues=None):
+    """
+    Build the response representation of one word bank entry.
+
+    Args:
+        bank (WordBank): Word bank holding the entry
+        index (int): Index of the entry in the bank
+        clues (dict): Clues read by fetch_clues() {index: clue}, for a bank without clues
+
+    Returns:
+        dict: {'clue': ..., 'answer': ..., 'id': ...}, without 'id' if none is assigned
+    """
+    clue = bank.clues[index] if clues is None else clues[index]
+    body = {'clue': clue, 'answer': bank.answers[index]}
+    if bank.ids[index] is not None:
+        body['id'] = bank.ids[index]
+    return body
+
+
 def lambda_handler(event, context):
     """
     AWS Lambda entry point for processing trivia game requests.
@@ -37,22 +555,86 @@ def lambda_handler(event, context):
     Request Format:
     {
         "difficulty": "normal|hard|drunk",
-        "seen": ["answer1", "answer2", ...] // Previously seen answers
+        "seen": ["answer1", "answer2", ...] // Previously seen answers, oldest first
+    }
+
+    Instead of a list of answers, "seen" may hold the IDs of previously seen clues as a
+    compact "bitmap:..." or "delta:..." string (see seen_encoding.py).
+
+    An optional "count" field (1 to MAX_CLUES_PER_REQUEST) requests several distinct
+    clues at once so that the frontend can prefetch the next rounds.
+
+    Session Mode:
+    {
+        "difficulty": "normal|hard|drunk",
+        "session": true | "token" // true starts a new deck, a token continues one
+    }
+    Clues are dealt from a per-player shuffled deck (see session_deck.py) and no seen
+    list needs to be sent. Responses carry the updated token in a "session" field, and
+    "sessionReset": true if the given token belonged to an older version of the bank.
+
+    Daily Mode:
+    {
+        "difficulty": "normal|hard|drunk",
+        "daily": true | "YYYY-MM-DD" // true (or "today") for the current UTC day
+    }
+    Every player gets the same DAILY_CLUE_COUNT clues of a difficulty for a day (see
+    daily_challenge.py), in the "clues" format below plus "date" and "difficulty" fields.
+    The response carries a Cache-Control header allowing shared caches to keep it until
+    the next UTC midnight, or for a year for past days. Future days are rejected with a
+    400. The same request can be sent as a GET with query string parameters, e.g.
+    ?difficulty=normal&daily=today, so that a CDN can cache it by URL.
+
+    Outcome Reports:
+    {
+        "outcomes": [
+            {"difficulty": "normal", "answer": "PARIS", "solved": true, "wrongGuesses": 3},
+            ... // At most MAX_OUTCOMES_PER_REQUEST rounds
+        ]
     }
+    Answered with a 202 and {"recorded": n} once the outcomes are buffered. They are
+    written to the outcome table by the report that fills the buffer or finds it old
+    enough, together with other rounds of the same clues.
+    Rounds of answers that are not in the word bank of their difficulty are ignored.
 
     Special Requests:
     {
         "wakeUp": "any_value" // Used to warm up the Lambda function
     }
+    A wake-up call loads all three word banks concurrently and answers with how long
+    that took, e.g. {"message": "Hello from Lambda!", "preload": {"ms": 84.1, "banks":
+    {"normal": {"ms": 84.0, "source": "index", "size": 1200}, ...}}, "initPreload": null}.
+    "initPreload" is the report of the preload done during the init phase, if any (see
+    init_preload).
 
     Response Format (Success):
     {
         "statusCode": 200,
         "body": {
             "clue": "Capital of France",
-            "answer": "PARIS"
+            "answer": "PARIS",
+            "id": 42 // Stable ID of the clue, omitted if the table has not assigned one
+        }
+    }
+
+    Response Format (Success, with "count"):
+    {
+        "statusCode": 200,
+        "body": {
+            "clues": [{"clue": ..., "answer": ..., "id": ...}, ...] // Up to "count" clues
+        }
+    }
+
+    Response Format (Bad Request):
+    {
+        "statusCode": 400,
+        "body": {
+            "error": "difficulty must be one of: normal, hard, drunk"
         }
     }
+    Malformed requests and requests over the size limits (MAX_BODY_LENGTH,
+    MAX_SEEN_ENCODED_LENGTH) are rejected before DynamoDB is touched. Only the newest
+    MAX_SEEN_ANSWERS answers of a legacy seen list are taken into account.
 
     Response Format (No Content):
     {
@@ -61,57 +643,522 @@ def lambda_handler(event, context):
             "message": "No more clues available for this difficulty level!"
         }
     }
+
+    If the HANGMANTRIVIA_METRICS environment variable is set, one EMF log line with the
+    timings of the invocation is printed as well (see metrics.py).
     """
+    metrics = start_request_metrics()
+    response = handle_request(event, metrics)
+    metrics.set_property('StatusCode', response['statusCode'])
+    metrics.emit()
+    return response
+
+
+class RequestError(ValueError):
+    """Raised for a request that is malformed or too large, answered with a 400."""
+
+
+def error_response(error):
+    """
+    Build the response for a request that failed with an exception.
+
+    Args:
+        error (Exception): The exception that ended the request
+
+    Returns:
+        dict: HTTP 400 response for a RequestError, HTTP 500 response otherwise, with the
+              error message in the JSON body
+    """
+    return {
+        'statusCode': 400 if isinstance(error, RequestError) else 500,
+        'body': json.dumps({'error': str(error)}),
+    }
+
+
+def validate_difficulty(data):
+    """
+    Check the difficulty of a parsed request.
+
+    Args:
+        data (dict): Parsed request body
+
+    Returns:
+        str: Difficulty, a key of TABLE_NAMES
+
+    Raises:
+        RequestError: If the body is not an object or the difficulty is unknown
+    """
+    if not isinstance(data, dict):
+        raise RequestError('Request body must be a JSON object')
+    difficulty = data.get('difficulty')
+    if type(difficulty) is not str or difficulty not in TABLE_NAMES:
+        raise RequestError('difficulty must be one of: ' + ', '.join(TABLE_NAMES))
+    return difficulty
+
+
+def validate_request(data):
+    """
+    Check a parsed clue request and decode its seen field, before any work is done.
+
+    Args:
+        data (dict): Parsed request body (see lambda_handler for the format)
+
+    Returns:
+        tuple: (difficulty, (seen answers, seen IDs), count or None, session or None),
+               with at most the MAX_SEEN_ANSWERS newest answers of a legacy seen list
+
+    Raises:
+        RequestError: If a field is missing, of the wrong type or over its size limit
+    """
+    difficulty = validate_difficulty(data)
+
+    seen = data.get('seen', [])
+    if isinstance(seen, list):
+        if not all(type(answer) is str for answer in seen):
+            raise RequestError('seen answers must be strings')
+        # Long-time players of the legacy frontend keep every answer they were served, so
+        # the oldest ones are dropped instead of failing all their requests
+        seen = seen[-MAX_SEEN_ANSWERS:]
+    elif isinstance(seen, str) and len(seen) > MAX_SEEN_ENCODED_LENGTH:
+        raise RequestError(f'seen is {len(seen)} characters long, the limit is '
+                           f'{MAX_SEEN_ENCODED_LENGTH}')
     try:
-        data = json.loads(event['body'])
+        seen = decode_seen(seen)
+    except ValueError as e:
+        raise RequestError(f'Invalid seen field: {e}') from None
+
+    count = data.get('count')
+    if count is not None and (type(count) is not int or count < 1):
+        raise RequestError('count must be a positive integer')
+    session = data.get('session')
+    if session is not None and session is not True and not isinstance(session, str):
+        raise RequestError('session must be true or a session token')
+    return difficulty, seen, count, session
+
+
+def validate_outcomes(data):
+    """
+    Check the round outcomes of a parsed outcome report.
+
+    Args:
+        data (dict): Parsed request body with an "outcomes" field (see lambda_handler)
+
+    Returns:
+        list: (difficulty, answer, solved, wrong guesses) of every reported round
 
-        # Return blank response if request is a wake-up call
+    Raises:
+        RequestError: If the list or one of its outcomes is malformed or too large
+    """
+    outcomes = data['outcomes']
+    if not isinstance(outcomes, list) or not outcomes:
+        raise RequestError('outcomes must be a non-empty list')
+    if len(outcomes) > MAX_OUTCOMES_PER_REQUEST:
+        raise RequestError(f'outcomes holds {len(outcomes)} rounds, the limit is '
+                           f'{MAX_OUTCOMES_PER_REQUEST}')
+    rounds = []
+    for outcome in outcomes:
+        if not isinstance(outcome, dict):
+            raise RequestError('each outcome must be an object')
+        difficulty = validate_difficulty(outcome)
+        answer = outcome.get('answer')
+        if type(answer) is not str or not 0 < len(answer) <= MAX_ANSWER_LENGTH:
+            raise RequestError(f'answer must be a string of 1 to {MAX_ANSWER_LENGTH} '
+                               f'characters')
+        solved = outcome.get('solved')
+        if type(solved) is not bool:
+            raise RequestError('solved must be true or false')
+        wrong_guesses = outcome.get('wrongGuesses', 0)
+        if type(wrong_guesses) is not int or not 0 <= wrong_guesses <= MAX_WRONG_GUESSES:
+            raise RequestError(f'wrongGuesses must be an integer from 0 to {MAX_WRONG_GUESSES}')
+        rounds.append((difficulty, answer, solved, wrong_guesses))
+    return rounds
+
+
+def record_outcomes(data, metrics=NULL_METRICS):
+    """
+    Add the rounds of an outcome report to the container's outcome buffer, then flush
+    the buffer if it is due.
+
+    Rounds are only counted for answers that are in the current word bank of their
+    difficulty, so that reports cannot create counters for made-up clues. Rounds of
+    other answers, e.g. of clues removed since they were served, are ignored.
+
+    Args:
+        data (dict): Parsed request body with an "outcomes" field (see lambda_handler)
+        metrics (RequestMetrics): Recorder for the timings of this request
+
+    Returns:
+        dict: HTTP 202 response with the number of rounds that were buffered
+
+    Raises:
+        RequestError: If the report is malformed, in which case nothing is buffered
+        Exception: If a word bank cannot be loaded
+    """
+    with metrics.phase('Parse'):
+        rounds = validate_outcomes(data)
+    with metrics.phase('LoadBank'):
+        banks = {
+            difficulty: get_bank(TABLE_NAMES[difficulty], metrics)
+            for difficulty in {difficulty for difficulty, _, _, _ in rounds}
+        }
+    known = [outcome for outcome in rounds if outcome[1] in banks[outcome[0]]]
+    recorded = sum(_outcome_buffer.record(*outcome) for outcome in known)
+    metrics.add('Outcomes', recorded)
+    metrics.add('UnknownOutcomes', len(rounds) - len(known))
+    flush_outcomes_if_due(metrics)
+    return {
+        'statusCode': 202,  # Accepted, written with a later flush
+        'body': json.dumps({'recorded': recorded}),
+    }
+
+
+def flush_outcomes_if_due(metrics=NULL_METRICS):
+    """
+    Write the buffered outcomes if the buffer reached its size or age threshold. Failures
+    are reported but not raised, since the buffer keeps the counts for the next flush.
+    Only outcome reports call this, so that the writes never delay a clue request.
+
+    Args:
+        metrics (RequestMetrics): Recorder for the timings of this invocation
+    """
+    if not _outcome_buffer.flush_due():
+        return
+    try:
+        with metrics.phase('FlushOutcomes'):
+            result = _outcome_buffer.flush(get_dynamodb_client())
+    except Exception as e:
+        print(f'Could not flush outcomes: {e}')
+        return
+    metrics.add('OutcomeWrites', result['written'])
+
+
+def init_shutdown_flush(environ=os.environ):
+    """
+    Flush the buffered outcomes on SIGTERM when running in Lambda (see outcome_stats.py).
+
+    Args:
+        environ (dict): Environment variables to decide from (default: os.environ)
+
+    Returns:
+        bool: Whether the signal handler was installed
+    """
+    if 'AWS_LAMBDA_FUNCTION_NAME' not in environ:
+        return False
+    install_shutdown_flush(_outcome_buffer, get_dynamodb_client)
+    return True
+
+
+def parse_body(event):
+    """
+    Parse the JSON body of a POST request, after checking its size.
+
+    Args:
+        event (dict): AWS Lambda event object containing HTTP request data
+
+    Returns:
+        dict: Parsed request body
+
+    Raises:
+        RequestError: If the body is missing, over MAX_BODY_LENGTH, not valid JSON,
+                      nested deeper than the parser can handle or not a JSON object
+    """
+    body = event.get('body')
+    if body is None:
+        raise RequestError('Request body is missing')
+    # Checked before parsing, so that oversized payloads cost no more than this
+    if isinstance(body, (str, bytes)) and len(body) > MAX_BODY_LENGTH:
+        raise RequestError(f'Request body is {len(body)} characters long, the limit is '
+                           f'{MAX_BODY_LENGTH}')
+    try:
+        data = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError) as e:
+        raise RequestError(f'Request body is not valid JSON: {e}') from None
+    except RecursionError:
+        raise RequestError('Request body is nested too deeply') from None
+    if not isinstance(data, dict):
+        raise RequestError('Request body must be a JSON object')
+    return data
+
+
+def request_method(event):
+    """Return the HTTP method of an API Gateway (REST or HTTP API) or function URL event."""
+    return event.get('httpMethod') or event.get('requestContext', {}).get('http', {}).get('method')
+
+
+def query_request(event):
+    """
+    Turn the query string of a GET request into a parsed request body.
+
+    Args:
+        event (dict): AWS Lambda event object of a GET request
+
+    Returns:
+        dict: Query string parameters, in the format of a request body
+
+    Raises:
+        RequestError: If the request is not a daily request, which is the only kind
+                      that can be cached and therefore the only kind served over GET
+    """
+    data = dict(event.get('queryStringParameters') or {})
+    if 'daily' not in data:
+        raise RequestError('Only daily clues can be requested with GET')
+    return data
+
+
+def handle_request(event, metrics):
+    """
+    Process a request for lambda_handler, recording each phase in `metrics`.
+
+    Args:
+        event (dict): AWS Lambda event object containing HTTP request data
+        metrics (RequestMetrics): Recorder for the timings of this invocation
+
+    Returns:
+        dict: HTTP response with status code and JSON body
+    """
+    try:
+        with metrics.phase('Parse'):
+            is_get = request_method(event) == 'GET'
+            data = query_request(event) if is_get else parse_body(event)
+        if is_get:
+            return serve_clues(data, metrics)
+
+        # Warm up the container and return a blank response if request is a wake-up call
         if 'wakeUp' in data:
+            with metrics.phase('Preload'):
+                report = preload_banks()
             return {
                 'statusCode': 200,
-                'body': json.dumps('Hello from Lambda!'),
+                'body': json.dumps({
+                    'message': 'Hello from Lambda!',
+                    'preload': report,
+                    'initPreload': _init_preload_report,
+                }),
             }
 
-        chosen_difficulty = data['difficulty']
-        seen_answers = data['seen'] if 'seen' in data else []
+        if 'outcomes' in data:
+            return record_outcomes(data, metrics)
 
-        match chosen_difficulty:
-            case 'normal':
-                table_name = TABLE_NAME_NORMAL
-            case 'hard':
-                table_name = TABLE_NAME_HARD
-            case 'drunk':
-                table_name = TABLE_NAME_DRUNK
+        return serve_clues(data, metrics)
 
-        ddb = boto3.resource('dynamodb')
-        table = ddb.Table(table_name)
+    except Exception as e:
+        return error_response(e)
 
-        response = table.scan()  # retrieve all database items
-        all_answers = response.get('Items', [])
 
-        seen_answers = set(seen_answers)
-        available_answers = {
-            item['answer']: item['clue']
-            for item in all_answers
-            if item['answer'] not in seen_answers
-        }
+def serve_clues(data, metrics=NULL_METRICS):
+    """
+    Serve the clues asked for by a parsed clue request.
 
-        if not available_answers:
-            return {
-            'statusCode': 204,  # No content
-            'body': json.dumps({'message': 'No more clues available for this difficulty level!'}),
-        }
+    Args:
+        data (dict): Parsed request body (see lambda_handler for the format)
+        metrics (RequestMetrics): Recorder for the timings of this request
+
+    Returns:
+        dict: HTTP response with status code and JSON body
+
+    Raises:
+        RequestError: If the request is malformed, before the word bank is loaded
+        Exception: If the word bank cannot be loaded
+    """
+    if isinstance(data, dict) and 'daily' in data:
+        return serve_daily(data, metrics)
+
+    with metrics.phase('Parse'):
+        chosen_difficulty, seen_fields, count, session = validate_request(data)
+    table_name = TABLE_NAMES[chosen_difficulty]
+    metrics.set_property('Difficulty', chosen_difficulty)
+
+    with metrics.phase('LoadBank'):
+        bank = get_bank(table_name, metrics)
 
-        answer, clue = random.choice(list(available_answers.items()))
+    limit = min(count or 1, MAX_CLUES_PER_REQUEST)
+    bank, indices, clues, session_token, session_reset = draw_clues(
+        table_name, bank, seen_fields, limit, session, metrics
+    )
 
+    if not indices:
         return {
-            'statusCode': 200,
-            'body': json.dumps({'clue': clue, 'answer': answer}),
-        }
+        'statusCode': 204,  # No content
+        'body': json.dumps({'message': 'No more clues available for this difficulty level!'}),
+    }
 
-    except Exception as e:
+    with metrics.phase('Serialize'):
+        if count is None:
+            body = clue_body(bank, indices[0], clues)
+        else:
+            body = {'clues': [clue_body(bank, index, clues) for index in indices]}
+        if session is not None:
+            body['session'] = session_token
+            if session_reset:
+                body['sessionReset'] = True
+        body = json.dumps(body)
+
+    return {
+        'statusCode': 200,
+        'body': body,
+    }
+
+
+def draw_clues(table_name, bank, seen_fields, count, session=None, metrics=NULL_METRICS):
+    """
+    Draw up to `count` unseen entries of a bank, reading their clues if it has none.
+
+    A bank loaded from the answer index can hold entries that a later sync deleted from
+    the table, whose clues can no longer be read. On the first such miss, the cached bank
+    is reloaded from the current index and the draw starts over. Entries still missing
+    after that are treated as seen and replaced by new draws, so that fewer entries are
+    only returned once the bank has no unseen entries left.
+
+    Args:
+        table_name (str): Name of the DynamoDB table holding the word bank
+        bank (WordBank): Word bank of the table, as returned by get_bank()
+        seen_fields (tuple): (seen answers, seen IDs), as returned by validate_request()
+        count (int): Maximum number of entries to draw
+        session (bool | str): True or a session token to deal from a session deck, or
+                              None to sample the unseen entries
+        metrics (RequestMetrics): Recorder for the timings of this request
+
+    Returns:
+        tuple: (bank, indices, clues, session token, session reset), where bank is the
+               bank the indices refer to, clues is {index: clue} for a bank without
+               clues (None otherwise) and the session fields are None without a session
+    """
+    token = None if session is True else session
+    with metrics.phase('Sample'):
+        seen = bank.seen_indices(*seen_fields)
+    indices, clues, reset, reloaded = [], {}, None, False
+    while len(indices) < count:
+        with metrics.phase('Sample'):
+            if session is None:
+                sampler = get_sampler(table_name, bank)
+                batch = sampler.sample_unseen_many(seen, count - len(indices))
+            else:
+                batch, token, dealt_reset = deal(bank, token, count - len(indices), seen)
+                reset = reset or dealt_reset
+        if not batch or bank.clues[batch[0]] is not None:
+            indices += batch
+            break
+
+        with metrics.phase('FetchClues'):
+            fetched = fetch_clues(table_name, bank, batch, metrics)
+        if len(fetched) < len(batch) and not reloaded:
+            reloaded = True
+            invalidate_bank_cache(table_name)
+            with metrics.phase('LoadBank'):
+                bank = get_bank(table_name, metrics)
+            with metrics.phase('Sample'):
+                seen = bank.seen_indices(*seen_fields)
+            token = None if session is True else session
+            indices, clues, reset = [], {}, None
+            continue
+        # Every round adds at least one entry to the seen ones, so the loop ends
+        seen.update(batch)
+        clues.update(fetched)
+        indices += [index for index in batch if index in fetched]
+    return bank, indices, clues or None, token, reset
+
+
+def serve_daily(data, metrics=NULL_METRICS, now=None):
+    """
+    Serve the daily set asked for by a parsed daily request, from the daily cache if it
+    has already been computed for the current bank in this container.
+
+    Args:
+        data (dict): Parsed request body with a "daily" field (see lambda_handler)
+        metrics (RequestMetrics): Recorder for the timings of this request
+        now (datetime): Current time in UTC (default: the clock)
+
+    Returns:
+        dict: HTTP response with status code, Cache-Control header and JSON body
+
+    Raises:
+        RequestError: If the difficulty or the day is invalid
+        Exception: If the word bank cannot be loaded
+    """
+    with metrics.phase('Parse'):
+        difficulty = validate_difficulty(data)
+        now = now or utc_now()
+        try:
+            day = parse_day(data['daily'], now)
+        except ValueError as e:
+            raise RequestError(str(e)) from None
+    metrics.set_property('Difficulty', difficulty)
+
+    table_name = TABLE_NAMES[difficulty]
+    with metrics.phase('LoadBank'):
+        bank = get_bank(table_name, metrics)
+    body = get_cached_daily((difficulty, day, bank.fingerprint))
+    metrics.set_property('DailySource', 'computed' if body is None else 'cache')
+    if body is None:
+        with _daily_locks[difficulty]:
+            # Another request may have computed the set while this one was waiting
+            body = get_cached_daily((difficulty, day, bank.fingerprint))
+            if body is None:
+                bank, body = build_daily_body(difficulty, day, bank, metrics)
+                if body is not None:
+                    cache_daily((difficulty, day, bank.fingerprint), body)
+
+    if body is None:
         return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)}),
+            'statusCode': 204,  # No content
+            'body': json.dumps({'message': 'No more clues available for this difficulty level!'}),
         }
+    return {
+        'statusCode': 200,
+        'headers': {'Cache-Control': cache_control(day, now)},
+        'body': body,
+    }
+
+
+def build_daily_body(difficulty, day, bank, metrics=NULL_METRICS):
+    """
+    Compute and serialize the daily set of a difficulty.
+
+    Args:
+        difficulty (str): Difficulty of the set
+        day (date): Day of the set
+        bank (WordBank): Current word bank of the difficulty, as returned by get_bank()
+        metrics (RequestMetrics): Recorder for the timings of this request
+
+    Returns:
+        tuple: (bank, body), where bank is the bank the set was chosen from (reloaded if
+               entries of the given one were deleted) and body is the JSON body
+               {"date": ..., "difficulty": ..., "clues": [...]}, or None if the bank is
+               empty
+    """
+    table_name = TABLE_NAMES[difficulty]
+    for attempt in range(2):
+        if attempt:
+            with metrics.phase('LoadBank'):
+                bank = get_bank(table_name, metrics)
+
+        with metrics.phase('Sample'):
+            indices = select_daily(bank, difficulty, day)
+
+        clues = None
+        if indices and bank.clues[indices[0]] is None:
+            with metrics.phase('FetchClues'):
+                clues = fetch_clues(table_name, bank, indices, metrics)
+            if len(clues) < len(indices) and not attempt:
+                # The index was read before a sync deleted some of the entries: choose
+                # the set again from the current index, as other containers do
+                invalidate_bank_cache(table_name)
+                continue
+            # Entries deleted without a sync are skipped
+            indices = [index for index in indices if index in clues]
+        break
+
+    if not indices:
+        return bank, None
+
+    with metrics.phase('Serialize'):
+        return bank, json.dumps({
+            'date': day.isoformat(),
+            'difficulty': difficulty,
+            'clues': [clue_body(bank, index, clues) for index in indices],
+        })
+
 
+# Runs during the Lambda init phase, once every function above is defined
+_init_preload_report = init_preload()
+init_shutdown_flush()
@@ -0,0 +1,141 @@
+"""
+Hangman Trivia Backend - Request Instrumentation
+
+Opt-in per-invocation instrumentation for lambda_handler. When the
+HANGMANTRIVIA_METRICS environment variable is set to "1" or "true", each invocation
+records how long every phase of the request took, how the word bank was obtained and
+how much DynamoDB work that cost, and prints it as a single CloudWatch Embedded Metric
+Format (EMF) log line. CloudWatch turns the numeric fields of that line into metrics
+without any extra API calls.
+
+When instrumentation is disabled, a shared no-op recorder is used instead, so the only
+overhead is a few empty method calls per request.
+
+@author Yahia Nassab
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+METRICS_ENABLED = os.environ.get('HANGMANTRIVIA_METRICS', '').lower() in ('1', 'true')
+
+METRICS_NAMESPACE = 'HangmanTrivia'
+
+# Properties that become CloudWatch dimensions when present
+DIMENSIONS = ('Difficulty',)
+
+
+class RequestMetrics:
+    """
+    Records per-phase timings, counters and properties of one invocation.
+
+    Attributes:
+        enabled (bool): Always True; lets callers skip work only needed for metrics
+        timings (dict): Milliseconds spent in each phase {phase: ms}
+        counts (dict): Accumulated counters {name: value}
+        properties (dict): Non-numeric context of the invocation {name: value}
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.timings = {}
+        self.counts = {}
+        self.properties = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed block and add the duration to the given phase.
+
+        Args:
+            name (str): Name of the phase, e.g. 'Parse'
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = self.timings.get(name, 0) + elapsed
+
+    def add(self, name, value=1):
+        """Add a value to a counter."""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def set_property(self, name, value):
+        """Record a non-numeric property of the invocation, e.g. the difficulty."""
+        self.properties[name] = value
+
+    def to_emf(self):
+        """
+        Build the EMF log record of the invocation.
+
+        Returns:
+            dict: EMF record with one metric per phase and counter
+        """
+        total = (time.perf_counter() - self._start) * 1000
+        values = {f'{name}Duration': value for name, value in self.timings.items()}
+        values['TotalDuration'] = total
+        values.update(self.counts)
+
+        dimensions = [name for name in DIMENSIONS if name in self.properties]
+        record = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [dimensions],
+                    'Metrics': [
+                        {
+                            'Name': name,
+                            'Unit': 'Milliseconds' if name.endswith('Duration') else 'Count',
+                        }
+                        for name in values
+                    ],
+                }],
+            },
+        }
+        record.update(self.properties)
+        record.update(values)
+        return record
+
+    def emit(self):
+        """Print the EMF record as a single log line."""
+        print(json.dumps(self.to_emf()))
+
+
+class NullMetrics:
+    """Recorder used when instrumentation is disabled; every method does nothing."""
+
+    enabled = False
+
+    _context = nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def add(self, name, value=1):
+        pass
+
+    def set_property(self, name, value):
+        pass
+
+    def emit(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+def start_request_metrics():
+    """
+    Return the recorder for a new invocation.
+
+    Returns:
+        RequestMetrics: A fresh recorder if instrumentation is enabled, otherwise the
+                        shared NullMetrics instance
+    """
+    return RequestMetrics() if METRICS_ENABLED else NULL_METRICS
@@ -0,0 +1,260 @@
+"""
+Hangman Trivia Backend - Clue Outcome Telemetry
+
+Counts how often each clue is played, solved and guessed wrong, without writing to
+DynamoDB on every round. Outcomes reported to lambda_handler are added to an in-memory
+buffer of the warm container, which holds one set of counters per clue. The buffer is
+flushed once it holds FLUSH_MAX_ROUNDS rounds or its oldest round is FLUSH_MAX_AGE_SECONDS
+old, with one atomic UpdateItem ADD per clue, so rounds of the same clue within a flush
+cost a single write and concurrent containers never overwrite each other's counts. The
+writes of a flush are sent FLUSH_MAX_WORKERS at a time from a thread pool, so a flush of
+100 clues takes about as long as 13 round trips rather than 100.
+
+Outcomes are stored in the OUTCOME_TABLE_NAME table, keyed by '<difficulty>#<answer>':
+
+    {"clue": "normal#PARIS", "plays": 120, "solved": 97, "wrong_guesses": 311}
+
+Loss bounds: Lambda freezes a container between invocations and may shut it down
+without running any more code, so counts still buffered at that point are lost. The
+thresholds are checked after every outcome report (clue requests never pay for a
+flush), so a container loses at most FLUSH_MAX_ROUNDS - 1 rounds this way, reported
+since the last report that arrived FLUSH_MAX_AGE_SECONDS or more after the oldest of
+them. If the runtime sends SIGTERM before shutting down (it only does when an extension
+is registered), the buffer is flushed then (see install_shutdown_flush). Writes that
+fail are put back into the buffer and retried with the next flush, up to
+MAX_BUFFERED_CLUES clues; outcomes of further clues are dropped and counted until the
+buffer drains.
+
+@author Yahia Nassab
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+OUTCOME_TABLE_NAME = os.environ.get('OUTCOME_TABLE_NAME', 'hangmantrivia-clue-outcomes')
+
+OUTCOME_PARTITION_KEY = 'clue'
+
+# Counter attributes, in the order of the counters held by the buffer
+COUNTER_ATTRIBUTES = ('plays', 'solved', 'wrong_guesses')
+
+# Rounds buffered before a flush, which also bounds the rounds lost on shutdown
+FLUSH_MAX_ROUNDS = int(os.environ.get('OUTCOME_FLUSH_MAX_ROUNDS', 100))
+
+# Age of the oldest buffered round at which the buffer is flushed
+FLUSH_MAX_AGE_SECONDS = float(os.environ.get('OUTCOME_FLUSH_MAX_AGE_SECONDS', 60))
+
+# Writes of a flush sent concurrently, which is also the most sent to a failing table
+FLUSH_MAX_WORKERS = int(os.environ.get('OUTCOME_FLUSH_MAX_WORKERS', 8))
+
+# Distinct clues held by the buffer while writes keep failing
+MAX_BUFFERED_CLUES = 10000
+
+
+def outcome_key(difficulty, answer):
+    """Return the key of a clue in the outcome table."""
+    return f'{difficulty}#{answer}'
+
+
+class OutcomeBuffer:
+    """
+    Aggregates round outcomes per clue until they are flushed to DynamoDB. Safe to use
+    from several threads.
+
+    Attributes:
+        rounds (int): Rounds buffered since the last flush
+        dropped (int): Rounds dropped because the buffer was full
+    """
+
+    def __init__(self, max_rounds=FLUSH_MAX_ROUNDS, max_age=FLUSH_MAX_AGE_SECONDS,
+                 max_clues=MAX_BUFFERED_CLUES, clock=time.monotonic):
+        """
+        Args:
+            max_rounds (int): Rounds buffered before a flush is due
+            max_age (float): Age in seconds of the oldest round at which a flush is due
+            max_clues (int): Distinct clues held before further outcomes are dropped
+            clock (callable): Monotonic clock in seconds
+        """
+        self.rounds = 0
+        self.dropped = 0
+        self._counters = {}  # {key: [plays, solved, wrong_guesses]}
+        self._oldest = None
+        self._max_rounds = max_rounds
+        self._max_age = max_age
+        self._max_clues = max_clues
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of clues with buffered counts."""
+        return len(self._counters)
+
+    def record(self, difficulty, answer, solved, wrong_guesses):
+        """
+        Add the outcome of one round to the buffer.
+
+        Args:
+            difficulty (str): Difficulty the clue was played at
+            answer (str): Answer of the clue
+            solved (bool): Whether the player solved the clue
+            wrong_guesses (int): Number of wrong letters guessed in the round
+
+        Returns:
+            bool: Whether the outcome was buffered (False if the buffer was full)
+        """
+        key = outcome_key(difficulty, answer)
+        with self._lock:
+            counters = self._counters.get(key)
+            if counters is None:
+                if len(self._counters) >= self._max_clues:
+                    self.dropped += 1
+                    return False
+                counters = self._counters[key] = [0, 0, 0]
+            counters[0] += 1
+            counters[1] += int(solved)
+            counters[2] += wrong_guesses
+            self.rounds += 1
+            if self._oldest is None:
+                self._oldest = self._clock()
+        return True
+
+    def flush_due(self):
+        """Return whether the buffer has reached its size or age threshold."""
+        with self._lock:
+            return self._oldest is not None and (
+                self.rounds >= self._max_rounds
+                or self._clock() - self._oldest >= self._max_age
+            )
+
+    def take(self):
+        """
+        Empty the buffer.
+
+        Returns:
+            dict: Counters of every buffered clue {key: [plays, solved, wrong_guesses]}
+        """
+        with self._lock:
+            counters = self._counters
+            self._counters = {}
+            self.rounds = 0
+            self._oldest = None
+        return counters
+
+    def restore(self, counters):
+        """
+        Put back counters whose write failed, so that the next flush retries them.
+
+        Args:
+            counters (dict): Counters as returned by take()
+        """
+        with self._lock:
+            for key, values in counters.items():
+                current = self._counters.get(key)
+                if current is None:
+                    if len(self._counters) >= self._max_clues:
+                        self.dropped += values[0]
+                        continue
+                    current = self._counters[key] = [0, 0, 0]
+                for i, value in enumerate(values):
+                    current[i] += value
+                self.rounds += values[0]
+            if self._counters and self._oldest is None:
+                self._oldest = self._clock()
+
+    def flush(self, client, table_name=OUTCOME_TABLE_NAME, max_workers=FLUSH_MAX_WORKERS):
+        """
+        Write the buffered counters with one UpdateItem ADD per clue.
+
+        The writes are sent in waves of `max_workers` concurrent calls. Concurrent
+        flushes are serialized, so each one writes the counters buffered since the
+        previous one. The flush stops after the first wave with a failed write, which
+        usually means the table is unavailable, and the counters not written are restored.
+
+        Args:
+            client (botocore.client.DynamoDB): Low-level DynamoDB client (thread-safe)
+            table_name (str): Name of the outcome table
+            max_workers (int): Writes sent at the same time
+
+        Returns:
+            dict: {'written': clues written, 'restored': clues put back into the buffer}
+        """
+        with self._flush_lock:
+            counters = list(self.take().items())
+            written = 0
+            unwritten = {}
+            if counters:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for start in range(0, len(counters), max_workers):
+                        wave = counters[start:start + max_workers]
+                        futures = [
+                            executor.submit(add_counters, client, table_name, key, values)
+                            for key, values in wave
+                        ]
+                        for (key, values), future in zip(wave, futures):
+                            try:
+                                future.result()
+                            except Exception as e:
+                                print(f'Could not write the outcomes of {key}: {e}')
+                                unwritten[key] = values
+                            else:
+                                written += 1
+                        if unwritten:
+                            unwritten.update(counters[start + max_workers:])
+                            break
+            if unwritten:
+                self.restore(unwritten)
+        return {'written': written, 'restored': len(unwritten)}
+
+
+def add_counters(client, table_name, key, values):
+    """
+    Atomically add counters to the outcome item of a clue, creating it if needed.
+
+    Args:
+        client (botocore.client.DynamoDB): Low-level DynamoDB client
+        table_name (str): Name of the outcome table
+        key (str): Key of the clue, as returned by outcome_key()
+        values (list): Increments of the counters, in the order of COUNTER_ATTRIBUTES
+    """
+    client.update_item(
+        TableName=table_name,
+        Key={OUTCOME_PARTITION_KEY: {'S': key}},
+        UpdateExpression='ADD ' + ', '.join(
+            f'#{attribute} :{attribute}' for attribute in COUNTER_ATTRIBUTES
+        ),
+        ExpressionAttributeNames={f'#{attribute}': attribute for attribute in COUNTER_ATTRIBUTES},
+        ExpressionAttributeValues={
+            f':{attribute}': {'N': str(value)}
+            for attribute, value in zip(COUNTER_ATTRIBUTES, values)
+        },
+    )
+
+
+def install_shutdown_flush(buffer, get_client):
+    """
+    Flush the buffer when the runtime sends SIGTERM before shutting the container down.
+
+    Args:
+        buffer (OutcomeBuffer): Buffer to flush
+        get_client (callable): Returns the DynamoDB client to flush with
+
+    Returns:
+        callable: The installed signal handler
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        if len(buffer):
+            print(f'Flushing outcomes on shutdown: {buffer.flush(get_client())}')
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            sys.exit(0)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    return handle_sigterm
@@ -0,0 +1,365 @@
+"""
+Hangman Trivia Backend - Clue Sampling
+
+Holds a word bank as parallel, precomputed arrays of answers, clues and stable IDs so
+that a random unseen clue can be drawn without materialising the unseen part of the bank
+on every request. The arrays are compact (see string_pool.py): answers and clues live in
+UTF-8 string pools and IDs in an integer array, so a cached bank takes about a quarter of
+the memory of the scanned items it was built from. The player's seen clues are mapped to
+a set of bank indices, and draws use rejection sampling over random indices, which costs
+O(|seen|) to build the seen set plus an expected n / (n - |seen|) draws. Only once most
+of the bank has been seen does sampling fall back to an explicit O(bank) set difference.
+
+Weighted draws (e.g. favouring newly added clues) use a Walker alias table built once
+per bank and set of weights, which draws an index in O(1) with a single random number.
+Seen entries are excluded the same way, by rejection, falling back to an explicit
+weighted choice over the unseen entries only if every attempt hit a seen entry.
+
+@author Yahia Nassab
+"""
+
+import math
+import random
+import zlib
+from array import array
+
+from .string_pool import IdColumn, NoneColumn, StringPool
+
+# Above this fraction of seen answers, rejection sampling needs too many draws on
+# average and the unseen answers are listed explicitly instead
+MAX_REJECTION_SEEN_FRACTION = 0.75
+
+# Draws attempted before falling back to the set difference, which bounds the worst case
+MAX_REJECTION_ATTEMPTS = 32
+
+# IDs are mapped to positions with a flat array as long as the highest ID is below this
+# many array slots per entry (IDs are assigned in sequence, with gaps where entries were
+# removed), and with a dict otherwise
+MAX_ID_SLOTS_PER_ENTRY = 4
+
+
+class WordBank:
+    """
+    Immutable word bank with answers, clues and IDs stored in index-aligned, compact
+    read-only sequences.
+
+    Attributes:
+        answers (StringPool): Answers of the bank, indexed for lookups by answer
+        clues (StringPool): Clue of each answer, at the same index (a NoneColumn if the
+                            bank was loaded without clues)
+        ids (IdColumn): Stable ID of each answer, at the same index (None if unassigned)
+    """
+
+    __slots__ = ('answers', 'clues', 'ids', '_id_positions', '_canonical_order',
+                 '_fingerprint')
+
+    def __init__(self, bank, ids=None):
+        """
+        Args:
+            bank (dict): Word bank dictionary {answer: clue, ...}, where every clue is
+                         None for a bank loaded without its clues
+            ids (dict): Stable non-negative IDs of the answers {answer: id, ...}
+                        (optional)
+
+        Raises:
+            ValueError: If only some of the clues are None, or an ID is negative
+        """
+        ids = ids or {}
+        self.answers = StringPool(bank, indexed=True)
+        missing_clues = sum(clue is None for clue in bank.values())
+        if missing_clues == len(bank):
+            self.clues = NoneColumn(len(bank))
+        elif missing_clues:
+            raise ValueError('Either every clue of a bank or none of them must be None')
+        else:
+            self.clues = StringPool(bank.values())
+        self.ids = IdColumn(ids.get(answer) for answer in bank)
+        self._id_positions = self._map_ids()
+        self._canonical_order = None
+        self._fingerprint = None
+
+    def _map_ids(self):
+        """Map the IDs to their positions, with an array if they are dense enough."""
+        highest = self.ids.max()
+        if highest is not None and highest < MAX_ID_SLOTS_PER_ENTRY * len(self.ids) + 1024:
+            positions = array('i', [-1]) * (highest + 1)
+        else:
+            positions = {}
+        for i, entry_id in enumerate(self.ids):
+            if entry_id is not None:
+                positions[entry_id] = i
+        return positions
+
+    def __len__(self):
+        return len(self.answers)
+
+    def __contains__(self, answer):
+        return answer in self.answers
+
+    def to_dict(self):
+        """Return the bank as a dictionary {answer: clue, ...}."""
+        return dict(zip(self.answers, self.clues))
+
+    @property
+    def canonical_order(self):
+        """
+        Indices of the entries sorted by ID (entries without an ID last, by answer).
+
+        Unlike the index order, which follows the order of the table scan, this order is
+        the same in every container that holds the same bank. It is computed on first use.
+        """
+        if self._canonical_order is None:
+            self._canonical_order = array('i', sorted(
+                range(len(self.answers)),
+                key=lambda i: (self.ids[i] is None, self.ids[i] or 0, self.answers[i]),
+            ))
+        return self._canonical_order
+
+    @property
+    def fingerprint(self):
+        """32-bit checksum of the answers in canonical order, which changes with the bank."""
+        if self._fingerprint is None:
+            joined = '\n'.join(self.answers[i] for i in self.canonical_order)
+            self._fingerprint = zlib.crc32(joined.encode('utf-8'))
+        return self._fingerprint
+
+    def seen_indices(self, answers=(), ids=()):
+        """
+        Map the answers and IDs a player has seen to indices into the bank.
+
+        Args:
+            answers (iterable): Seen answers (legacy encoding)
+            ids (iterable): Seen stable IDs (compact encodings)
+
+        Returns:
+            set: Indices of seen entries. Answers and IDs not in the bank are ignored.
+        """
+        find = self.answers.find
+        seen = {find(answer) for answer in answers}
+        seen.discard(None)
+        id_positions = self._id_positions
+        if isinstance(id_positions, dict):
+            seen.update(id_positions[entry_id] for entry_id in ids if entry_id in id_positions)
+        else:
+            size = len(id_positions)
+            seen.update(id_positions[entry_id] for entry_id in ids if 0 <= entry_id < size)
+            seen.discard(-1)
+        return seen
+
+    def sample_unseen(self, seen, rng=random):
+        """
+        Draw the index of a random entry that has not been seen.
+
+        Args:
+            seen (set): Indices of the entries the player has already seen, as returned
+                        by seen_indices()
+            rng (random.Random): Source of randomness (default: the random module)
+
+        Returns:
+            int: Index into answers/clues/ids of an unseen entry, or None if every entry
+                 in the bank has been seen
+        """
+        size = len(self.answers)
+        if len(seen) >= size:
+            return None
+
+        if len(seen) <= size * MAX_REJECTION_SEEN_FRACTION:
+            for _ in range(MAX_REJECTION_ATTEMPTS):
+                index = rng.randrange(size)
+                if index not in seen:
+                    return index
+
+        unseen = [i for i in range(size) if i not in seen]
+        return rng.choice(unseen)
+
+    def sample_unseen_many(self, seen, count, rng=random):
+        """
+        Draw the indices of up to `count` distinct random entries that have not been seen.
+
+        Args:
+            seen (set): Indices of the entries the player has already seen
+            count (int): Maximum number of entries to draw
+            rng (random.Random): Source of randomness (default: the random module)
+
+        Returns:
+            list: Indices of distinct unseen entries, shorter than `count` only if the
+                  bank ran out of unseen entries
+        """
+        seen = set(seen)
+        indices = []
+        for _ in range(count):
+            index = self.sample_unseen(seen, rng)
+            if index is None:
+                break
+            seen.add(index)
+            indices.append(index)
+        return indices
+
+
+class AliasTable:
+    """
+    Walker alias table for drawing indices with probabilities proportional to weights,
+    built with Vose's O(n) method.
+
+    Each of the n columns holds the probability of keeping its own index and the alias
+    drawn otherwise, so a draw picks a column and flips one biased coin, both from the
+    same random number.
+
+    Attributes:
+        probabilities (array): Probability of keeping the index of each column
+        aliases (array): Index drawn when a column does not keep its own index
+    """
+
+    __slots__ = ('probabilities', 'aliases')
+
+    def __init__(self, weights):
+        """
+        Args:
+            weights (sequence): Positive, finite weight of each index
+
+        Raises:
+            ValueError: If a weight is not positive and finite
+        """
+        if any(not 0 < weight < math.inf for weight in weights):
+            raise ValueError('Weights must be positive and finite')
+        size = len(weights)
+        total = math.fsum(weights)
+        scaled = [weight * size / total for weight in weights]
+        self.probabilities = array('d', bytes(8 * size))
+        self.aliases = array('l', range(size))
+
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is 1 up to rounding errors
+        for i in small + large:
+            self.probabilities[i] = 1.0
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def sample(self, rng=random):
+        """
+        Draw an index.
+
+        Args:
+            rng (random.Random): Source of randomness (default: the random module)
+
+        Returns:
+            int: Index drawn with probability weight / total weight
+        """
+        value = rng.random() * len(self.aliases)
+        column = int(value)
+        if value - column < self.probabilities[column]:
+            return column
+        return self.aliases[column]
+
+
+class WeightedSampler:
+    """
+    Draws unseen entries of a word bank with probabilities proportional to weights.
+
+    Attributes:
+        bank (WordBank): Word bank the sampler draws from
+        weights (array): Weight of each entry, at the same index as the bank's answers
+    """
+
+    __slots__ = ('bank', 'weights', '_table')
+
+    def __init__(self, bank, weights):
+        """
+        Args:
+            bank (WordBank): Word bank to draw from
+            weights (sequence): Positive weight of each entry of the bank
+
+        Raises:
+            ValueError: If there is not one positive, finite weight per entry
+        """
+        if len(weights) != len(bank):
+            raise ValueError(f'Expected {len(bank)} weights, got {len(weights)}')
+        self.bank = bank
+        self.weights = array('d', weights)
+        self._table = AliasTable(self.weights)
+
+    def sample_unseen(self, seen, rng=random):
+        """
+        Draw the index of an unseen entry, with probability proportional to its weight
+        among the unseen entries.
+
+        Unlike WordBank.sample_unseen, rejection is always tried first: deciding from
+        the seen fraction would take summing the weights of the seen entries, which
+        costs more than the MAX_REJECTION_ATTEMPTS draws it could save.
+
+        Args:
+            seen (set): Indices of the entries the player has already seen
+            rng (random.Random): Source of randomness (default: the random module)
+
+        Returns:
+            int: Index of an unseen entry, or None if every entry has been seen
+        """
+        size = len(self.weights)
+        if len(seen) >= size:
+            return None
+
+        for _ in range(MAX_REJECTION_ATTEMPTS):
+            index = self._table.sample(rng)
+            if index not in seen:
+                return index
+
+        unseen = [i for i in range(size) if i not in seen]
+        return rng.choices(unseen, [self.weights[i] for i in unseen])[0]
+
+    def sample_unseen_many(self, seen, count, rng=random):
+        """
+        Draw the indices of up to `count` distinct unseen entries, each one weighted
+        among the entries still unseen when it is drawn.
+
+        Args:
+            seen (set): Indices of the entries the player has already seen
+            count (int): Maximum number of entries to draw
+            rng (random.Random): Source of randomness (default: the random module)
+
+        Returns:
+            list: Indices of distinct unseen entries, shorter than `count` only if the
+                  bank ran out of unseen entries
+        """
+        seen = set(seen)
+        indices = []
+        for _ in range(count):
+            index = self.sample_unseen(seen, rng)
+            if index is None:
+                break
+            seen.add(index)
+            indices.append(index)
+        return indices
+
+
+def recency_weights(bank, newest_fraction, boost):
+    """
+    Weigh the most recently added entries of a bank more than the others.
+
+    Stable IDs are assigned in increasing order as entries are added to a table, so the
+    entries with the highest IDs are the newest ones.
+
+    Args:
+        bank (WordBank): Word bank to weigh
+        newest_fraction (float): Fraction of the entries with an ID that count as new
+        boost (float): Weight of the new entries, relative to 1 for every other entry
+
+    Returns:
+        list: Weight of each entry, at the same index as the bank's answers
+    """
+    ids = sorted(entry_id for entry_id in bank.ids if entry_id is not None)
+    newest = int(len(ids) * newest_fraction)
+    if not newest:
+        return [1.0] * len(bank)
+    threshold = ids[-newest]
+    return [
+        boost if entry_id is not None and entry_id >= threshold else 1.0
+        for entry_id in bank.ids
+    ]
@@ -0,0 +1,154 @@
+"""
+Hangman Trivia Backend - Compact Seen-Set Encoding
+
+Every word bank entry carries a stable integer ID (assigned by
+write_dynamodb_table.update_table), so the frontend can report the clues a player has
+seen as a compact string instead of the full list of answers. Two encodings are
+accepted in the "seen" field of a request, each marked by a prefix:
+
+    "bitmap:<base64url>"  Bit i (least significant bit first) is set if ID i was seen.
+                          Best for players who have seen a large part of the bank.
+    "delta:<base64url>"   Sorted IDs stored as LEB128 varints of the gap to the
+                          previous ID (the first gap is from -1). Runs of consecutive
+                          IDs cost one byte each.
+
+A JSON list of answer strings is still accepted as the legacy encoding.
+
+@author Yahia Nassab
+"""
+
+import base64
+import binascii
+
+BITMAP_PREFIX = 'bitmap:'
+DELTA_PREFIX = 'delta:'
+
+# Bit positions set in each possible byte value, so bitmaps decode a byte at a time
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    try:
+        return base64.b64decode(text + '=' * (-len(text) % 4), altchars=b'-_', validate=True)
+    except (binascii.Error, ValueError):
+        # Without validation, characters outside the alphabet would be silently dropped
+        raise ValueError('Seen set payload is not valid base64url') from None
+
+
+def encode_bitmap(ids):
+    """
+    Encode a collection of IDs as a prefixed base64url bitmap.
+
+    Args:
+        ids (iterable): Non-negative integer IDs
+
+    Returns:
+        str: Encoded seen set
+    """
+    ids = list(ids)
+    bitmap = bytearray((max(ids) // 8 + 1) if ids else 0)
+    for entry_id in ids:
+        bitmap[entry_id // 8] |= 1 << (entry_id % 8)
+    return BITMAP_PREFIX + _b64encode(bytes(bitmap))
+
+
+def decode_bitmap(text):
+    """
+    Decode the payload of a bitmap-encoded seen set.
+
+    Args:
+        text (str): base64url bitmap, without the prefix
+
+    Returns:
+        list: IDs whose bit is set, in ascending order
+
+    Raises:
+        ValueError: If the payload is not valid base64url
+    """
+    ids = []
+    for byte_index, byte in enumerate(_b64decode(text)):
+        if byte:
+            base = byte_index * 8
+            ids.extend(base + bit for bit in _BYTE_BITS[byte])
+    return ids
+
+
+def encode_deltas(ids):
+    """
+    Encode a collection of IDs as a prefixed base64url list of varint gaps.
+
+    Args:
+        ids (iterable): Non-negative integer IDs
+
+    Returns:
+        str: Encoded seen set
+    """
+    data = bytearray()
+    previous = -1
+    for entry_id in sorted(set(ids)):
+        gap = entry_id - previous
+        previous = entry_id
+        while gap >= 0x80:
+            data.append(gap & 0x7F | 0x80)
+            gap >>= 7
+        data.append(gap)
+    return DELTA_PREFIX + _b64encode(bytes(data))
+
+
+def decode_deltas(text):
+    """
+    Decode the payload of a delta-encoded seen set.
+
+    Args:
+        text (str): base64url varint gaps, without the prefix
+
+    Returns:
+        list: Decoded IDs in ascending order
+
+    Raises:
+        ValueError: If the payload is not valid base64url or ends in the middle of a
+                    varint
+    """
+    ids = []
+    previous = -1
+    gap = 0
+    shift = 0
+    for byte in _b64decode(text):
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += gap
+        ids.append(previous)
+        gap = 0
+        shift = 0
+    if shift:
+        raise ValueError('Truncated delta-encoded seen set')
+    return ids
+
+
+def decode_seen(seen):
+    """
+    Split the "seen" field of a request into seen answers and seen IDs.
+
+    Args:
+        seen (list or str): Legacy list of answers, or a prefixed compact encoding
+
+    Returns:
+        tuple: (answers, ids) where exactly one of the two may be non-empty
+
+    Raises:
+        ValueError: If the field is neither a list nor a known compact encoding
+    """
+    if isinstance(seen, list):
+        return seen, []
+    if isinstance(seen, str):
+        if seen.startswith(BITMAP_PREFIX):
+            return [], decode_bitmap(seen[len(BITMAP_PREFIX):])
+        if seen.startswith(DELTA_PREFIX):
+            return [], decode_deltas(seen[len(DELTA_PREFIX):])
+    raise ValueError('Unrecognised encoding of seen clues')
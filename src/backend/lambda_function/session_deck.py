@@ -0,0 +1,140 @@
+"""
+Hangman Trivia Backend - Per-Player Shuffled Decks
+
+An optional session mode in which the backend deals clues from a per-player shuffled
+deck instead of filtering a seen list. The deck is a keyed pseudo-random permutation of
+the bank's canonical order, so it never has to be stored: a session token holds the
+permutation seed, the position of the next card (the cursor) and the fingerprint of the
+bank it was dealt from. Drawing the next clue is a single permutation evaluation, O(1)
+regardless of the size of the bank or the number of clues already played.
+
+The permutation is a four-round Feistel network over the smallest even power of two
+covering the bank, keyed with the seed. Values outside the bank are cycle-walked, which
+keeps it a bijection on [0, size), so every clue is dealt exactly once per deck.
+
+When the bank changes (e.g. after write_dynamodb_table.update_table), its fingerprint
+changes, and tokens issued for the old bank are answered with a freshly shuffled deck.
+
+Tokens are not signed: tampering with one only changes which clues that player gets.
+
+@author Yahia Nassab
+"""
+
+import base64
+import binascii
+import hashlib
+import random
+import struct
+
+TOKEN_FORMAT = 1
+
+# Format version, seed, bank fingerprint and cursor
+_TOKEN_STRUCT = struct.Struct('>BQII')
+
+FEISTEL_ROUNDS = 4
+
+
+def encode_token(seed, fingerprint, cursor):
+    """
+    Pack the state of a deck into a URL-safe session token.
+
+    Args:
+        seed (int): 64-bit permutation seed
+        fingerprint (int): Fingerprint of the bank the deck is dealt from
+        cursor (int): Position of the next card in the deck
+
+    Returns:
+        str: Session token
+    """
+    data = _TOKEN_STRUCT.pack(TOKEN_FORMAT, seed, fingerprint, cursor)
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def decode_token(token):
+    """
+    Unpack a session token.
+
+    Args:
+        token (str): Session token as issued by encode_token()
+
+    Returns:
+        tuple: (seed, fingerprint, cursor), or None if the token is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        token_format, seed, fingerprint, cursor = _TOKEN_STRUCT.unpack(data)
+    except (binascii.Error, struct.error, TypeError, ValueError):
+        return None
+    if token_format != TOKEN_FORMAT:
+        return None
+    return seed, fingerprint, cursor
+
+
+def _round_function(value, round_number, key):
+    digest = hashlib.blake2b(
+        value.to_bytes(8, 'big') + bytes([round_number]), key=key, digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def permute(position, size, seed):
+    """
+    Map a deck position to a bank position through the keyed permutation.
+
+    Args:
+        position (int): Position in the deck, 0 <= position < size
+        size (int): Number of cards in the deck
+        seed (int): 64-bit permutation seed
+
+    Returns:
+        int: Position in the bank's canonical order
+    """
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+    key = seed.to_bytes(8, 'big')
+
+    value = position
+    while True:
+        left, right = value >> half_bits, value & mask
+        for round_number in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ (_round_function(right, round_number, key) & mask)
+        value = (left << half_bits) | right
+        if value < size:
+            return value
+
+
+def deal(bank, token, count=1, seen=frozenset(), rng=random):
+    """
+    Deal the next clues of a player's deck.
+
+    Args:
+        bank (WordBank): Word bank the deck is dealt from
+        token (str): Session token of the deck, or None to start a new deck
+        count (int): Maximum number of clues to deal
+        seen (set): Bank indices to skip, e.g. clues seen before the deck was reset
+        rng (random.Random): Source of randomness for the seed of a new deck
+
+    Returns:
+        tuple: (indices, token, reset) where indices are the dealt bank indices (empty
+               once the deck is exhausted), token is the updated session token and reset
+               tells whether the given token was malformed or issued for another bank,
+               so that a new deck had to be started
+    """
+    state = decode_token(token) if isinstance(token, str) else None
+    if state is not None and state[1] == bank.fingerprint:
+        seed, _, cursor = state
+        reset = False
+    else:
+        seed, cursor = rng.getrandbits(64), 0
+        reset = token is not None
+
+    size = len(bank)
+    order = bank.canonical_order
+    indices = []
+    while len(indices) < count and cursor < size:
+        index = order[permute(cursor, size, seed)]
+        cursor += 1
+        if index not in seen:
+            indices.append(index)
+
+    return indices, encode_token(seed, bank.fingerprint, cursor), reset
@@ -0,0 +1,181 @@
+"""
+Hangman Trivia Backend - Compact Word Bank Columns
+
+Read-only sequences that store the columns of a word bank in a few flat buffers instead
+of one Python object per value, which is what keeps cached banks small in a warm
+container:
+
+    StringPool   Strings encoded as UTF-8 into a single bytes buffer, with an array of
+                 offsets. An optional open-addressing hash index over the buffer finds
+                 the position of a string without keeping a dict of string objects.
+    IdColumn     Optional integer IDs in a signed 64-bit array, where -1 stands for None.
+    NoneColumn   A column of None values that takes no memory per value, for banks
+                 loaded without their clues.
+
+A Python str costs at least 49 bytes on top of its characters and a dict entry about
+100 bytes with its hash table, whereas a pooled string costs its UTF-8 length plus a
+4-byte offset and 4 to 8 bytes of index. Values are decoded when they are read, which
+costs well under a microsecond per value.
+
+@author Yahia Nassab
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+# Index slots per string, at least. Keeps probe sequences short.
+MIN_INDEX_SLOTS_PER_STRING = 2
+
+
+class StringPool(Sequence):
+    """
+    Immutable sequence of strings stored in one UTF-8 buffer.
+
+    String i is held by the bytes between offsets i and i + 1. If the pool is indexed,
+    find(), index() and `in` use a hash table of positions, stored as position + 1
+    with 0 for an empty slot, probed linearly from the hash of the encoded string.
+    Otherwise they scan the pool.
+    """
+
+    __slots__ = ('_data', '_offsets', '_slots', '_mask')
+
+    def __init__(self, strings, indexed=False):
+        """
+        Args:
+            strings (iterable): Strings to store, in order
+            indexed (bool): Whether to build the hash index (the strings must be unique)
+        """
+        encoded = [string.encode('utf-8') for string in strings]
+        data = b''.join(encoded)
+        self._data = memoryview(data)
+        self._offsets = array('I' if len(data) < 2**32 else 'Q',
+                              accumulate(map(len, encoded), initial=0))
+        self._slots = None
+        self._mask = 0
+        if indexed:
+            self._build_index(encoded)
+
+    def _build_index(self, encoded):
+        size = 1
+        while size < len(encoded) * MIN_INDEX_SLOTS_PER_STRING:
+            size *= 2
+        slots = array('i', [0]) * size
+        mask = size - 1
+        for position, value in enumerate(encoded):
+            slot = hash(value) & mask
+            while slots[slot]:
+                slot = (slot + 1) & mask
+            slots[slot] = position + 1
+        self._slots = slots
+        self._mask = mask
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('StringPool index out of range')
+        offsets = self._offsets
+        return str(self._data[offsets[position]:offsets[position + 1]], 'utf-8')
+
+    def find(self, string):
+        """
+        Return the position of a string in the pool, in O(1) if the pool is indexed and
+        O(pool) otherwise.
+
+        Args:
+            string (str): String to look for
+
+        Returns:
+            int: Position of the (first occurrence of the) string, or None if it is not in
+                 the pool
+        """
+        value = string.encode('utf-8')
+        slots, mask, offsets, data = self._slots, self._mask, self._offsets, self._data
+        if slots is None:
+            for position in range(len(self)):
+                if data[offsets[position]:offsets[position + 1]] == value:
+                    return position
+            return None
+        slot = hash(value) & mask
+        while True:
+            entry = slots[slot]
+            if not entry:
+                return None
+            position = entry - 1
+            if data[offsets[position]:offsets[position + 1]] == value:
+                return position
+            slot = (slot + 1) & mask
+
+    def index(self, string, start=0, stop=None):
+        if start or stop is not None:
+            return super().index(string, start, len(self) if stop is None else stop)
+        position = self.find(string) if isinstance(string, str) else None
+        if position is None:
+            raise ValueError(f'{string!r} is not in the pool')
+        return position
+
+    def __contains__(self, string):
+        return isinstance(string, str) and self.find(string) is not None
+
+
+class IdColumn(Sequence):
+    """Immutable sequence of optional non-negative integer IDs, stored in an array."""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, ids):
+        """
+        Args:
+            ids (iterable): Non-negative integers or None, in order
+
+        Raises:
+            ValueError: If an ID is negative
+        """
+        values = array('q')
+        for entry_id in ids:
+            if entry_id is None:
+                values.append(-1)
+            elif entry_id < 0:
+                raise ValueError(f'IDs must be non-negative, got {entry_id}')
+            else:
+                values.append(entry_id)
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        value = self._values[position]
+        return None if value < 0 else value
+
+    def max(self):
+        """Return the highest ID, or None if no entry has one."""
+        highest = max(self._values, default=-1)
+        return None if highest < 0 else highest
+
+
+class NoneColumn(Sequence):
+    """Immutable sequence of a given number of None values."""
+
+    __slots__ = ('_size',)
+
+    def __init__(self, size):
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [None] * len(range(*position.indices(self._size)))
+        if not -self._size <= position < self._size:
+            raise IndexError('NoneColumn index out of range')
+        return None
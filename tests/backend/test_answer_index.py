@@ -0,0 +1,159 @@
+"""
+Test Suite: Answer Index (Hangman Trivia Backend)
+
+Test coverage for answer_index.py - Paged index items of the word bank tables
+"""
+
+import pytest
+from unittest import mock
+from moto import mock_aws
+import boto3
+
+# The module to test
+from backend.common import answer_index
+
+TABLE_NAME = 'test-table'
+
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+
+AWS_REGION = 'us-east-1'
+
+def create_table():
+    """Create an empty mock word bank table."""
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    return dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+def put_pages(table, pages, version):
+    """Store index pages the way write_dynamodb_table.write_index does."""
+    for page_number, page in enumerate(pages):
+        table.put_item(Item={
+            PARTITION_KEY: answer_index.index_page_key(page_number),
+            'version': version,
+            'answers': page['answers'],
+            'ids': page['ids'],
+        })
+
+
+class TestBuildIndexPages:
+    """Test cases for splitting a table into index pages."""
+
+    def test_single_page_ordered_by_id(self):
+        """Test that a small table fits one page, ordered by ID."""
+        pages = answer_index.build_index_pages({'ROME': 2, 'PARIS': 0, 'OSLO': 1})
+
+        assert pages == [{'answers': ['PARIS', 'OSLO', 'ROME'], 'ids': [0, 1, 2]}]
+
+    def test_pages_carry_hashes(self):
+        """Test that entry hashes are stored alongside their answers when given."""
+        pages = answer_index.build_index_pages({'ROME': 1, 'PARIS': 0},
+                                               hashes={'ROME': 'bb', 'PARIS': 'aa'})
+
+        assert pages == [{'answers': ['PARIS', 'ROME'], 'ids': [0, 1], 'hashes': ['aa', 'bb']}]
+
+    def test_empty_table(self):
+        """Test that an empty table still has one (empty) page."""
+        assert answer_index.build_index_pages({}) == [{'answers': [], 'ids': []}]
+
+    def test_pages_respect_size_budget(self):
+        """Test that large tables are split into pages without losing entries."""
+        ids = {f'ANSWER {i}': i for i in range(100)}
+
+        pages = answer_index.build_index_pages(ids, page_bytes=200)
+
+        assert len(pages) > 1
+        assert [entry_id for page in pages for entry_id in page['ids']] == list(range(100))
+        for page in pages:
+            assert sum(len(answer) + len(str(entry_id)) + 6
+                       for answer, entry_id in zip(page['answers'], page['ids'])) <= 200
+
+
+class TestReadIndex:
+    """Test cases for reading the index with a low-level client."""
+
+    @mock_aws
+    def test_round_trip(self):
+        """Test that every page is read back into (id, answer) entries."""
+        table = create_table()
+        ids = {f'ANSWER {i}': i for i in range(50)}
+        pages = answer_index.build_index_pages(ids, page_bytes=100)
+        put_pages(table, pages, version=3)
+        client = boto3.client('dynamodb', region_name=AWS_REGION)
+        stats = {}
+
+        entries = answer_index.read_index(client, TABLE_NAME, 3, len(pages), stats)
+
+        assert entries == [(i, f'ANSWER {i}') for i in range(50)]
+        assert stats['calls'] == 1
+
+    @mock_aws
+    def test_stale_page_is_rejected(self):
+        """Test that pages written for another table version invalidate the index."""
+        table = create_table()
+        pages = answer_index.build_index_pages({'PARIS': 0})
+        put_pages(table, pages, version=3)
+        client = boto3.client('dynamodb', region_name=AWS_REGION)
+
+        assert answer_index.read_index(client, TABLE_NAME, 4, len(pages)) is None
+
+    @mock_aws
+    def test_missing_page_is_rejected(self):
+        """Test that an incomplete index is not used."""
+        table = create_table()
+        put_pages(table, answer_index.build_index_pages({'PARIS': 0}), version=1)
+        client = boto3.client('dynamodb', region_name=AWS_REGION)
+
+        assert answer_index.read_index(client, TABLE_NAME, 1, 2) is None
+
+
+class TestBatchGetItems:
+    """Test cases for reading items by key."""
+
+    @mock_aws
+    def test_reads_in_chunks_and_skips_missing_keys(self):
+        """Test that more than 100 keys are split across calls and missing keys ignored."""
+        table = create_table()
+        with table.batch_writer() as batch:
+            for i in range(150):
+                batch.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: f'Clue {i}'})
+        client = boto3.client('dynamodb', region_name=AWS_REGION)
+        keys = [f'ANSWER {i}' for i in range(160)]
+
+        with mock.patch.object(client, 'batch_get_item',
+                               wraps=client.batch_get_item) as mock_batch_get:
+            items = answer_index.batch_get_items(client, TABLE_NAME, keys, (SECONDARY_KEY,))
+
+        assert mock_batch_get.call_count == 2
+        assert len(items) == 150
+        assert items['ANSWER 7'] == {PARTITION_KEY: 'ANSWER 7', SECONDARY_KEY: 'Clue 7'}
+
+    def test_unprocessed_keys_are_retried(self):
+        """Test that keys DynamoDB did not process are requested again."""
+        client = mock.Mock()
+        client.batch_get_item.side_effect = [
+            {
+                'Responses': {TABLE_NAME: [{PARTITION_KEY: {'S': 'A'}, SECONDARY_KEY: {'S': '1'}}]},
+                'UnprocessedKeys': {TABLE_NAME: {'Keys': [{PARTITION_KEY: {'S': 'B'}}]}},
+            },
+            {
+                'Responses': {TABLE_NAME: [{PARTITION_KEY: {'S': 'B'}, SECONDARY_KEY: {'S': '2'}}]},
+                'UnprocessedKeys': {},
+            },
+        ]
+
+        items = answer_index.batch_get_items(client, TABLE_NAME, ['A', 'B'], (SECONDARY_KEY,))
+
+        assert items == {
+            'A': {PARTITION_KEY: 'A', SECONDARY_KEY: '1'},
+            'B': {PARTITION_KEY: 'B', SECONDARY_KEY: '2'},
+        }
+        assert client.batch_get_item.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+"""
+Test Suite: Concurrent Multi-Request Handler (Hangman Trivia Backend)
+
+Test coverage for async_handler.py - Several clue requests served in one invocation
+"""
+
+import pytest
+import os
+import json
+from unittest import mock
+from moto import mock_aws
+import boto3
+
+# The module to test
+from backend.lambda_function import async_handler
+from backend.lambda_function import lambda_function
+
+TABLE_NAME_NORMAL = 'hangmantrivia-wordbank-normal'
+TABLE_NAME_HARD = 'hangmantrivia-wordbank-hard'
+TABLE_NAME_DRUNK = 'hangmantrivia-wordbank-drunk'
+
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+
+AWS_REGION = 'us-east-1'
+
+@pytest.fixture(autouse=True)
+def clear_bank_cache():
+    """Prevent word banks and clients cached by one test from leaking into the next."""
+    lambda_function.invalidate_bank_cache()
+    lambda_function.reset_dynamodb_client()
+    yield
+    lambda_function.invalidate_bank_cache()
+    lambda_function.reset_dynamodb_client()
+
+def create_table(table_name, items):
+    """Create a mock word bank table populated with {answer: clue} items."""
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    for answer, clue in items.items():
+        table.put_item(Item={PARTITION_KEY: answer, SECONDARY_KEY: clue})
+    return table
+
+def batch_event(requests):
+    """Lambda event for a batch of clue requests."""
+    return {'body': json.dumps({'requests': requests})}
+
+
+class TestBatchLambdaHandler:
+    """Test cases for the concurrent multi-request handler."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_serves_every_difficulty_in_order(self):
+        """Test that requests for several difficulties are answered in request order."""
+        create_table(TABLE_NAME_NORMAL, {'NORMAL ANSWER': 'Normal clue'})
+        create_table(TABLE_NAME_HARD, {'HARD ANSWER': 'Hard clue'})
+        create_table(TABLE_NAME_DRUNK, {'DRUNK ANSWER': 'Drunk clue'})
+
+        result = async_handler.batch_lambda_handler(batch_event([
+            {'difficulty': 'drunk'},
+            {'difficulty': 'normal'},
+            {'difficulty': 'hard', 'seen': ['HARD ANSWER']},
+        ]), None)
+
+        assert result['statusCode'] == 200
+        responses = json.loads(result['body'])['responses']
+        assert [response['statusCode'] for response in responses] == [200, 200, 204]
+        assert responses[0]['body'][PARTITION_KEY] == 'DRUNK ANSWER'
+        assert responses[1]['body'][PARTITION_KEY] == 'NORMAL ANSWER'
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_failed_request_does_not_fail_batch(self):
+        """Test that a malformed request only fails its own response."""
+        create_table(TABLE_NAME_NORMAL, {'NORMAL ANSWER': 'Normal clue'})
+
+        result = async_handler.batch_lambda_handler(batch_event([
+            {'difficulty': 'normal'},
+            {'seen': []},
+        ]), None)
+
+        responses = json.loads(result['body'])['responses']
+        assert responses[0]['statusCode'] == 200
+        assert responses[1]['statusCode'] == 400
+        assert 'difficulty' in responses[1]['body']['error']
+
+    def test_bad_requests_are_rejected_before_loading(self):
+        """Test that malformed requests in a batch are answered with 400 without a load."""
+        with mock.patch.object(lambda_function, 'get_bank') as mock_get_bank:
+            result = async_handler.batch_lambda_handler(batch_event([
+                'normal',
+                {'difficulty': 'normal', 'count': 0},
+                {'difficulty': 'normal',
+                 'seen': 'bitmap:' + 'A' * lambda_function.MAX_SEEN_ENCODED_LENGTH},
+            ]), None)
+
+        responses = json.loads(result['body'])['responses']
+        assert [response['statusCode'] for response in responses] == [400, 400, 400]
+        assert responses[0]['body']['error'] == 'Request body must be a JSON object'
+        mock_get_bank.assert_not_called()
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_concurrent_misses_load_bank_once(self):
+        """Test that many requests for a cold table trigger a single scan."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(20)})
+        load_bank = lambda_function.load_bank
+
+        with mock.patch.object(lambda_function, 'load_bank', wraps=load_bank) as mock_load:
+            result = async_handler.batch_lambda_handler(
+                batch_event([{'difficulty': 'normal'}] * 16), None
+            )
+
+        responses = json.loads(result['body'])['responses']
+        assert all(response['statusCode'] == 200 for response in responses)
+        assert mock_load.call_count == 1
+
+    @pytest.mark.parametrize('body', [
+        {},
+        {'requests': []},
+        {'requests': 'normal'},
+        {'requests': [{'difficulty': 'normal'}] * 51},
+    ])
+    def test_invalid_batch(self, body):
+        """Test that malformed batches are bad requests."""
+        with mock.patch.object(async_handler, 'serve_batch') as mock_serve:
+            result = async_handler.batch_lambda_handler({'body': json.dumps(body)}, None)
+
+        assert result['statusCode'] == 400
+        assert 'requests' in json.loads(result['body'])['error']
+        mock_serve.assert_not_called()
+
+    @pytest.mark.parametrize('event', [{}, {'body': 'invalid json'}, {'body': '[]'}])
+    def test_unparseable_batch(self, event):
+        """Test that a missing, invalid or non-object body is a bad request."""
+        result = async_handler.batch_lambda_handler(event, None)
+
+        assert result['statusCode'] == 400
+        assert 'Request body' in json.loads(result['body'])['error']
+
+    def test_huge_batch_is_not_parsed(self):
+        """Test that a batch over the body size limit is rejected without being parsed."""
+        body = json.dumps({'requests': [{'difficulty': 'normal', 'seen': ['A'] * 100000}]})
+
+        with mock.patch('json.loads', wraps=json.loads) as mock_loads:
+            result = async_handler.batch_lambda_handler({'body': body}, None)
+
+        assert result['statusCode'] == 400
+        assert f'limit is {lambda_function.MAX_BODY_LENGTH}' in json.loads(result['body'])['error']
+        mock_loads.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+Test Suite: Daily Challenge (Hangman Trivia Backend)
+
+Test coverage for daily_challenge.py - Date-seeded clue sets shared by every player
+"""
+
+import pytest
+from datetime import date, datetime, timezone
+
+# The module to test
+from backend.lambda_function import daily_challenge
+from backend.lambda_function.sampling import WordBank
+
+NOW = datetime(2026, 10, 18, 18, 0, tzinfo=timezone.utc)
+TODAY = date(2026, 10, 18)
+
+@pytest.fixture
+def bank():
+    """Word bank with 200 synthetic clues and IDs."""
+    return WordBank(
+        {f'ANSWER {i}': f'Clue {i}' for i in range(200)},
+        {f'ANSWER {i}': i for i in range(200)},
+    )
+
+
+class TestParseDay:
+    """Test cases for resolving the day of a daily request."""
+
+    def test_utc_now(self):
+        """Test that days are resolved against the UTC clock."""
+        assert daily_challenge.utc_now().tzinfo is timezone.utc
+
+    @pytest.mark.parametrize('value', [True, 'today'])
+    def test_today(self, value):
+        """Test that true and 'today' ask for the current UTC day."""
+        assert daily_challenge.parse_day(value, NOW) == TODAY
+
+    @pytest.mark.parametrize('value', ['2026-10-18', '2026-10-17', '2020-01-01'])
+    def test_current_and_past_days(self, value):
+        """Test that the current and past days can be asked for by date."""
+        assert daily_challenge.parse_day(value, NOW) == date.fromisoformat(value)
+
+    @pytest.mark.parametrize('value, message', [
+        ('2026-10-19', 'not available yet'),
+        ('2026-13-01', 'not a valid date'),
+        ('20261018', 'must be true'),
+        (False, 'must be true'),
+        (20261018, 'must be true'),
+    ])
+    def test_rejects_invalid_days(self, value, message):
+        """Test that future days and values that are not dates are rejected."""
+        with pytest.raises(ValueError, match=message):
+            daily_challenge.parse_day(value, NOW)
+
+
+class TestSelectDaily:
+    """Test cases for choosing the daily set of a difficulty."""
+
+    def test_set_is_deterministic(self, bank):
+        """Test that the same day and difficulty always give the same set."""
+        first = daily_challenge.select_daily(bank, 'normal', TODAY)
+
+        assert len(first) == daily_challenge.DAILY_CLUE_COUNT
+        assert len(set(first)) == len(first)
+        assert daily_challenge.select_daily(bank, 'normal', TODAY) == first
+
+    def test_set_depends_on_day_and_difficulty(self, bank):
+        """Test that each day and each difficulty get their own set."""
+        today = daily_challenge.select_daily(bank, 'normal', TODAY)
+
+        assert daily_challenge.select_daily(bank, 'normal', date(2026, 10, 17)) != today
+        assert daily_challenge.select_daily(bank, 'hard', TODAY) != today
+
+    def test_set_does_not_depend_on_load_order(self, bank):
+        """Test that a bank loaded in another order gives the same entries."""
+        reordered = WordBank(
+            dict(reversed(bank.to_dict().items())),
+            {answer: entry_id for answer, entry_id in zip(bank.answers, bank.ids)},
+        )
+
+        expected = [bank.answers[i] for i in daily_challenge.select_daily(bank, 'normal', TODAY)]
+        chosen = daily_challenge.select_daily(reordered, 'normal', TODAY)
+
+        assert [reordered.answers[i] for i in chosen] == expected
+
+    def test_set_survives_unrelated_changes(self, bank):
+        """Test that removing entries outside the set leaves the set unchanged."""
+        chosen = daily_challenge.select_daily(bank, 'normal', TODAY)
+        answers = [bank.answers[i] for i in chosen]
+        kept = set(answers) | {bank.answers[i] for i in range(0, 200, 2)}
+        smaller = WordBank(
+            {answer: clue for answer, clue in bank.to_dict().items() if answer in kept},
+            {answer: entry_id for answer, entry_id in zip(bank.answers, bank.ids)},
+        )
+
+        chosen = daily_challenge.select_daily(smaller, 'normal', TODAY)
+
+        assert [smaller.answers[i] for i in chosen] == answers
+
+    def test_entries_without_ids(self):
+        """Test that entries without an ID are chosen by their answer."""
+        bank = WordBank({'PARIS': 'A', 'ROME': 'B', 'OSLO': 'C'})
+
+        chosen = daily_challenge.select_daily(bank, 'normal', TODAY, count=5)
+
+        assert sorted(chosen) == [0, 1, 2]
+
+    def test_empty_bank(self):
+        """Test that an empty bank has an empty set."""
+        assert daily_challenge.select_daily(WordBank({}), 'normal', TODAY) == []
+
+
+class TestCacheControl:
+    """Test cases for the cache lifetime of daily sets."""
+
+    def test_current_day_expires_at_midnight(self):
+        """Test that the current day's set may be cached until the next UTC midnight."""
+        assert daily_challenge.cache_control(TODAY, NOW) == 'public, max-age=21600, immutable'
+
+    def test_past_day_is_cached_for_a_year(self):
+        """Test that sets of past days may be cached for a year."""
+        assert daily_challenge.cache_control(date(2026, 10, 17), NOW) == (
+            f'public, max-age={daily_challenge.PAST_DAY_MAX_AGE}, immutable'
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
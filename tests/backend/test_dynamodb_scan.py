@@ -0,0 +1,138 @@
+"""
+Test Suite: DynamoDB Scan Helper (Hangman Trivia Backend)
+
+Test coverage for dynamodb_scan.py - Paginated, parallel table scans
+"""
+
+import pytest
+from unittest import mock
+from moto import mock_aws
+import boto3
+
+# The module to test
+from backend.common import dynamodb_scan
+
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+
+AWS_REGION = 'us-east-1'
+
+LARGE_TABLE_SIZE = 10000
+
+@pytest.fixture
+def table():
+    """Mock word bank table, created inside a mocked AWS environment."""
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        yield dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+def fill_table(table, size):
+    """Write `size` synthetic clues (with an extra unprojected attribute) to the table."""
+    with table.batch_writer() as batch:
+        for i in range(size):
+            batch.put_item(Item={
+                PARTITION_KEY: f'ANSWER {i}',
+                SECONDARY_KEY: f'Clue {i}',
+                'notes': 'x' * 20,
+            })
+
+
+class TestDynamoDBScan:
+    """Test cases for the shared scan helper."""
+
+    def test_scan_table_follows_pagination(self, table):
+        """Test that every page is read when the scan is split across many calls."""
+        fill_table(table, 50)
+
+        with mock.patch.object(table.meta.client, 'scan',
+                               wraps=table.meta.client.scan) as mock_scan:
+            items = dynamodb_scan.scan_table(table.meta.client, table.name, page_size=7)
+
+        assert len(items) == 50
+        assert mock_scan.call_count == 8  # ceil(50 / 7) pages
+        assert {item[PARTITION_KEY] for item in items} == {f'ANSWER {i}' for i in range(50)}
+
+    def test_iter_segment_fetches_pages_lazily(self, table):
+        """Test that the next page is only requested once the previous one is consumed."""
+        fill_table(table, 20)
+
+        with mock.patch.object(table.meta.client, 'scan',
+                               wraps=table.meta.client.scan) as mock_scan:
+            items = dynamodb_scan.iter_segment(
+                table.meta.client, table.name, (PARTITION_KEY,), page_size=5
+            )
+            first = [next(items) for _ in range(5)]
+            assert mock_scan.call_count == 1
+            rest = list(items)
+
+        assert mock_scan.call_count == 4
+        assert len(first) + len(rest) == 20
+
+    def test_scan_table_projects_attributes(self, table):
+        """Test that only the requested attributes are fetched and deserialized."""
+        fill_table(table, 3)
+
+        items = dynamodb_scan.scan_table(table.meta.client, table.name)
+        assert all(set(item) == {PARTITION_KEY, SECONDARY_KEY} for item in items)
+
+        items = dynamodb_scan.scan_table(
+            table.meta.client, table.name, attributes=(PARTITION_KEY,)
+        )
+        assert all(set(item) == {PARTITION_KEY} for item in items)
+
+    def test_scan_table_skips_metadata_items(self, table):
+        """Test that metadata items are only returned when asked for."""
+        fill_table(table, 2)
+        table.put_item(Item={PARTITION_KEY: '#VERSION', 'version': 3})
+
+        items = dynamodb_scan.scan_table(table.meta.client, table.name)
+        assert len(items) == 2
+
+        items = dynamodb_scan.scan_table(
+            table.meta.client, table.name, skip_metadata=False
+        )
+        assert len(items) == 3
+
+    def test_scan_table_collects_stats(self, table):
+        """Test that calls, scanned items and consumed capacity are counted on request."""
+        fill_table(table, 25)
+        stats = {}
+
+        dynamodb_scan.scan_table(table.meta.client, table.name, page_size=10, stats=stats)
+
+        assert stats['calls'] == 3
+        assert stats['scanned_count'] == 25
+        assert stats['consumed_capacity'] > 0
+
+    def test_parallel_scan_collects_stats(self, table):
+        """Test that the stats of parallel segments are summed."""
+        fill_table(table, 30)
+        stats = {}
+
+        dynamodb_scan.scan_table(table.meta.client, table.name, total_segments=3, stats=stats)
+
+        assert stats['calls'] >= 3
+        assert stats['scanned_count'] == 30
+
+    def test_scan_table_empty(self, table):
+        """Test that an empty table scans to an empty list."""
+        assert dynamodb_scan.scan_table(table.meta.client, table.name) == []
+
+    def test_parallel_scan_large_table(self, table):
+        """Test that a parallel segment scan returns every item of a large table exactly once."""
+        fill_table(table, LARGE_TABLE_SIZE)
+
+        items = dynamodb_scan.scan_table(table.meta.client, table.name, total_segments=4)
+
+        answers = [item[PARTITION_KEY] for item in items]
+        assert len(answers) == LARGE_TABLE_SIZE
+        assert len(set(answers)) == LARGE_TABLE_SIZE
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
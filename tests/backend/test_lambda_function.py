@@ -7,12 +7,24 @@ Test coverage for lambda_function.py - AWS Lambda handler for the backend API
 import pytest
 import os
 import json
+import threading
+from datetime import datetime, timezone
 from unittest import mock
 from moto import mock_aws
 import boto3
 
 # The module to test
 from backend.lambda_function import lambda_function
+from backend.lambda_function import metrics
+from backend.lambda_function import outcome_stats
+from backend.lambda_function import seen_encoding
+from backend.lambda_function.sampling import WordBank
+from backend.common import answer_index
+from backend.common import word_bank_snapshot
+
+# Patch the environment variable before importing the sync script, which needs it
+with mock.patch.dict(os.environ, {'AWS_ACCOUNT_ID': '123456789012'}):
+    from backend.db_management import write_dynamodb_table
 
 TABLE_NAME_NORMAL = 'hangmantrivia-wordbank-normal'
 TABLE_NAME_HARD = 'hangmantrivia-wordbank-hard'
@@ -58,6 +70,30 @@ def lambda_context():
     """Mock Lambda context object."""
     return mock.Mock()
 
+@pytest.fixture(autouse=True)
+def clear_bank_cache():
+    """Prevent word banks and clients cached by one test from leaking into the next."""
+    lambda_function.invalidate_bank_cache()
+    lambda_function.clear_daily_cache()
+    lambda_function.reset_dynamodb_client()
+    yield
+    lambda_function.invalidate_bank_cache()
+    lambda_function.clear_daily_cache()
+    lambda_function.reset_dynamodb_client()
+
+def create_table(table_name, items):
+    """Create a mock word bank table populated with {answer: clue} items."""
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    for answer, clue in items.items():
+        table.put_item(Item={PARTITION_KEY: answer, SECONDARY_KEY: clue})
+    return table
+
 
 class TestLambdaFunction:
     """Test cases for the AWS Lambda function handler."""
@@ -72,6 +108,26 @@ class TestLambdaFunction:
 
         assert result['statusCode'] == 200
 
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_wake_up_call_preloads_banks(self, lambda_event_normal,
+                                                        lambda_context):
+        """Test that a wake-up call creates the client and caches the word banks."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        event = {
+            'body': json.dumps({'wakeUp': 'Hello from Hangman Trivia!'})
+        }
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        assert lambda_function._dynamodb_client is not None
+        assert TABLE_NAME_NORMAL in lambda_function._bank_cache
+        with mock.patch.object(lambda_function, 'get_dynamodb_client') as mock_client:
+            result = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+        mock_client.assert_not_called()
+        assert json.loads(result['body'])[PARTITION_KEY] == 'ANSWER 1'
+
     @mock_aws
     @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
     def test_lambda_handler_normal_difficulty_success(self, lambda_event_normal, lambda_context):
@@ -223,19 +279,18 @@ class TestLambdaFunction:
 
         result = lambda_function.lambda_handler(event, lambda_context)
 
-        assert result['statusCode'] == 500
+        assert result['statusCode'] == 400
         body = json.loads(result['body'])
-        assert 'error' in body
+        assert body['error'].startswith('Request body is not valid JSON: ')
 
-    def test_lambda_handler_missing_body(self, lambda_context):
+    @pytest.mark.parametrize('event', [{}, {'body': None}])
+    def test_lambda_handler_missing_body(self, event, lambda_context):
         """Test error handling when request body is missing."""
-        event = {}
-
         result = lambda_function.lambda_handler(event, lambda_context)
 
-        assert result['statusCode'] == 500
+        assert result['statusCode'] == 400
         body = json.loads(result['body'])
-        assert 'error' in body
+        assert body['error'] == 'Request body is missing'
 
     @mock_aws
     @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
@@ -265,6 +320,1258 @@ class TestLambdaFunction:
         body = json.loads(result['body'])
         assert body[PARTITION_KEY] == 'ANSWER 1'
 
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @pytest.mark.parametrize('encode', [seen_encoding.encode_bitmap, seen_encoding.encode_deltas])
+    def test_lambda_handler_with_compact_seen_ids(self, encode, lambda_context):
+        """Test filtering out previously seen clues reported by their stable IDs."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        for i in range(3):
+            table.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: f'Clue {i}', 'id': i})
+
+        event = {
+            'body': json.dumps({
+                'difficulty': 'normal',
+                'seen': encode([0, 2])
+            })
+        }
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        body = json.loads(result['body'])
+        assert body[PARTITION_KEY] == 'ANSWER 1'
+        assert body['id'] == 1
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_invalid_seen_encoding(self, lambda_event_normal, lambda_context):
+        """Test error handling for a seen field in an unknown encoding."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': 'ANSWER 1'})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert 'error' in json.loads(result['body'])
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_with_count(self, lambda_context):
+        """Test that several distinct unseen clues are returned when a count is given."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(10)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER 0'], 'count': 5})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        clues = json.loads(result['body'])['clues']
+        answers = [clue[PARTITION_KEY] for clue in clues]
+        assert len(answers) == 5
+        assert len(set(answers)) == 5
+        assert 'ANSWER 0' not in answers
+        assert all(clue[SECONDARY_KEY] == clue[PARTITION_KEY].replace('ANSWER', 'Clue')
+                   for clue in clues)
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_with_count_larger_than_unseen(self, lambda_context):
+        """Test that a count beyond the unseen clues returns only what is left."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'})
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER 1'], 'count': 5})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        assert json.loads(result['body']) == {
+            'clues': [{SECONDARY_KEY: 'Clue 2', PARTITION_KEY: 'ANSWER 2'}]
+        }
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_count_is_capped(self, lambda_context):
+        """Test that no more than MAX_CLUES_PER_REQUEST clues are returned."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(50)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'count': 1000})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        clues = json.loads(result['body'])['clues']
+        assert len(clues) == lambda_function.MAX_CLUES_PER_REQUEST
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_with_count_no_content(self, lambda_context):
+        """Test that a count request on an exhausted bank still returns 204."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER 1'], 'count': 3})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 204
+
+    @pytest.mark.parametrize('count', [0, -1, 'five', 2.5, True])
+    def test_lambda_handler_invalid_count(self, count, lambda_context):
+        """Test error handling for a count that is not a positive integer."""
+        event = {'body': json.dumps({'difficulty': 'normal', 'count': count})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert 'error' in json.loads(result['body'])
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_session_deals_whole_bank(self, lambda_context):
+        """Test that a session deals every clue once without a seen list, then returns 204."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(5)})
+
+        session = True
+        answers = []
+        for _ in range(5):
+            event = {'body': json.dumps({'difficulty': 'normal', 'session': session})}
+            result = lambda_function.lambda_handler(event, lambda_context)
+            assert result['statusCode'] == 200
+            body = json.loads(result['body'])
+            assert 'sessionReset' not in body
+            answers.append(body[PARTITION_KEY])
+            session = body['session']
+
+        assert sorted(answers) == [f'ANSWER {i}' for i in range(5)]
+        event = {'body': json.dumps({'difficulty': 'normal', 'session': session})}
+        assert lambda_function.lambda_handler(event, lambda_context)['statusCode'] == 204
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_session_with_count(self, lambda_context):
+        """Test that a session can deal several clues at once."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(5)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'session': True, 'count': 3})}
+
+        body = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+
+        assert len({clue[PARTITION_KEY] for clue in body['clues']}) == 3
+        assert 'session' in body
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_session_reset_after_bank_change(self, lambda_context):
+        """Test that a token from before a bank change is answered with a new deck."""
+        table = create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'})
+        event = {'body': json.dumps({'difficulty': 'normal', 'session': True})}
+        token = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])['session']
+
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 3', SECONDARY_KEY: 'Clue 3'})
+        lambda_function.invalidate_bank_cache()
+        event = {'body': json.dumps({'difficulty': 'normal', 'session': token})}
+        body = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+
+        assert body['sessionReset'] is True
+        assert body['session'] != token
+
+    @pytest.mark.parametrize('session', [False, 1, ['token']])
+    def test_lambda_handler_invalid_session(self, session, lambda_context):
+        """Test error handling for a session field that is neither true nor a token."""
+        event = {'body': json.dumps({'difficulty': 'normal', 'session': session})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+
+
+class TestRequestValidation:
+    """Test cases for the checks that reject bad requests before any DynamoDB work."""
+
+    @pytest.fixture(autouse=True)
+    def no_dynamodb(self):
+        """Fail the test if a rejected request tries to reach DynamoDB."""
+        with mock.patch.object(lambda_function, 'get_dynamodb_client') as mock_client:
+            yield
+        mock_client.assert_not_called()
+
+    @pytest.mark.parametrize('data', [
+        {'seen': []},
+        {'difficulty': 'easy'},
+        {'difficulty': 5},
+        {'difficulty': ['normal']},
+        {'difficulty': None},
+    ])
+    def test_unknown_difficulty(self, data, lambda_context):
+        """Test that a missing or unknown difficulty is a bad request."""
+        result = lambda_function.lambda_handler({'body': json.dumps(data)}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert json.loads(result['body'])['error'] == (
+            'difficulty must be one of: normal, hard, drunk'
+        )
+
+    @pytest.mark.parametrize('body', [b'\xff\xfe{', {'difficulty': 'normal'}])
+    def test_body_not_json_text(self, body, lambda_context):
+        """Test that a body that is not UTF-8 or not text at all is a bad request."""
+        result = lambda_function.lambda_handler({'body': body}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert 'not valid JSON' in json.loads(result['body'])['error']
+
+    @pytest.mark.parametrize('body', [
+        '[' * 100_000,
+        '{"difficulty": "normal", "seen": ' + '[' * 100_000,
+    ])
+    def test_deeply_nested_body(self, body, lambda_context):
+        """Test that a body nested too deeply to parse is a bad request, not a 500."""
+        result = lambda_function.lambda_handler({'body': body}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert json.loads(result['body'])['error'] == 'Request body is nested too deeply'
+
+    @pytest.mark.parametrize('body', ['[]', '"normal"', '42'])
+    def test_body_not_an_object(self, body, lambda_context):
+        """Test that a body holding valid JSON other than an object is a bad request."""
+        result = lambda_function.lambda_handler({'body': body}, lambda_context)
+
+        assert result['statusCode'] == 400
+
+    def test_huge_body_is_not_parsed(self, lambda_context):
+        """Test that a body over the size limit is rejected without being parsed."""
+        seen = ['ANSWER'] * 2_000_000
+        body = json.dumps({'difficulty': 'normal', 'seen': seen})
+
+        with mock.patch('json.loads', wraps=json.loads) as mock_loads:
+            result = lambda_function.lambda_handler({'body': body}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert f'limit is {lambda_function.MAX_BODY_LENGTH}' in json.loads(result['body'])['error']
+        mock_loads.assert_not_called()
+
+    def test_huge_wake_up_is_rejected(self, lambda_context):
+        """Test that the size limit applies to wake-up calls, which preload the banks."""
+        body = json.dumps({'wakeUp': 'x' * (lambda_function.MAX_BODY_LENGTH + 1)})
+
+        with mock.patch.object(lambda_function, 'preload_banks') as mock_preload:
+            result = lambda_function.lambda_handler({'body': body}, lambda_context)
+
+        assert result['statusCode'] == 400
+        mock_preload.assert_not_called()
+
+    def test_too_many_seen_answers(self, lambda_context):
+        """Test that a legacy seen list over its limit is served, forgetting its oldest
+        answers rather than rejecting the request."""
+        bank = WordBank({'OLDEST': 'Clue 1', 'NEWEST': 'Clue 2'})
+        fillers = [f'ANSWER {i}' for i in range(lambda_function.MAX_SEEN_ANSWERS - 1)]
+        seen = ['OLDEST'] + fillers + ['NEWEST']
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': seen})}
+
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank):
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        assert json.loads(result['body'])[PARTITION_KEY] == 'OLDEST'
+
+    def test_seen_answers_must_be_strings(self, lambda_context):
+        """Test that a legacy seen list holding other values is a bad request."""
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER', {'a': 1}]})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+
+    @pytest.mark.parametrize('seen', [
+        'bitmap:' + 'A' * lambda_function.MAX_SEEN_ENCODED_LENGTH,
+        'delta:' + 'A' * lambda_function.MAX_SEEN_ENCODED_LENGTH,
+    ])
+    def test_oversized_compact_seen(self, seen, lambda_context):
+        """Test that a compact seen encoding over its limit is rejected before decoding."""
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': seen})}
+
+        with mock.patch.object(lambda_function, 'decode_seen') as mock_decode:
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+        mock_decode.assert_not_called()
+
+    @pytest.mark.parametrize('seen', ['delta:gA', 'bitmap:!!!'])
+    def test_corrupt_compact_seen(self, seen, lambda_context):
+        """Test that a compact seen encoding that does not decode is a bad request."""
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': seen})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert json.loads(result['body'])['error'].startswith('Invalid seen field:')
+
+
+class TestPreload:
+    """Test cases for preloading the word banks on wake-up and during the init phase."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_wake_up_reports_preload(self, lambda_context):
+        """Test that a wake-up call reports how each bank was preloaded."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'})
+        create_table(TABLE_NAME_HARD, {'ANSWER 3': 'Clue 3'})
+        event = {'body': json.dumps({'wakeUp': 'Hello from Hangman Trivia!'})}
+
+        body = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+
+        assert body['message'] == 'Hello from Lambda!'
+        assert body['initPreload'] is None
+        banks = body['preload']['banks']
+        assert banks['normal']['source'] == 'scan'
+        assert banks['normal']['size'] == 2
+        assert banks['hard']['size'] == 1
+        assert 'error' in banks['drunk']
+        assert body['preload']['ms'] >= max(banks['normal']['ms'], banks['hard']['ms'])
+
+        body = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+        assert body['preload']['banks']['normal']['source'] == 'cache'
+
+    def test_banks_are_preloaded_concurrently(self):
+        """Test that the three banks are loaded at the same time rather than in turn."""
+        barrier = threading.Barrier(3, timeout=5)
+        loaded = []
+
+        def get_bank(table_name, metrics):
+            barrier.wait()  # Only passes once all three loads are in progress
+            metrics.set_property('BankSource', 'scan')
+            loaded.append(table_name)
+            return WordBank({'ANSWER': 'Clue'})
+
+        with mock.patch.object(lambda_function, 'get_bank', side_effect=get_bank):
+            report = lambda_function.preload_banks()
+
+        assert sorted(loaded) == sorted([TABLE_NAME_NORMAL, TABLE_NAME_HARD, TABLE_NAME_DRUNK])
+        assert all(bank['size'] == 1 for bank in report['banks'].values())
+
+    @pytest.mark.parametrize('environ, preloaded', [
+        ({}, False),
+        ({'AWS_LAMBDA_INITIALIZATION_TYPE': 'on-demand'}, False),
+        ({'AWS_LAMBDA_INITIALIZATION_TYPE': 'provisioned-concurrency'}, True),
+        ({'AWS_LAMBDA_INITIALIZATION_TYPE': 'provisioned-concurrency',
+          'PRELOAD_ON_INIT': 'false'}, False),
+        ({'AWS_LAMBDA_INITIALIZATION_TYPE': 'on-demand', 'PRELOAD_ON_INIT': '1'}, True),
+    ])
+    def test_init_preload(self, environ, preloaded, capsys):
+        """Test that the init phase only preloads for provisioned concurrency by default."""
+        report = {'ms': 12.5, 'banks': {}}
+
+        with mock.patch.object(lambda_function, 'preload_banks',
+                               return_value=report) as mock_preload:
+            result = lambda_function.init_preload(environ)
+
+        assert mock_preload.called is preloaded
+        assert result == (report if preloaded else None)
+        output = capsys.readouterr().out
+        assert (json.dumps({'initPreload': report}) in output) is preloaded
+
+
+class TestBankCache:
+    """Test cases for the warm-container word bank cache."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_cache_hit_makes_no_dynamodb_calls(self, lambda_event_normal, lambda_context):
+        """Test that a cached bank is served without touching DynamoDB."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        with mock.patch.object(lambda_function, 'get_dynamodb_client') as mock_client:
+            result = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        mock_client.assert_not_called()
+        assert result['statusCode'] == 200
+        assert json.loads(result['body'])[PARTITION_KEY] == 'ANSWER 1'
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_indexed_cache_hit_makes_no_dynamodb_calls(self, lambda_event_normal,
+                                                       lambda_context):
+        """Test that a small bank with an answer index is cached with its clues."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(5)}
+        write_dynamodb_table.update_table(items, table)
+        wake_up = {'body': json.dumps({'wakeUp': 'Hello from Hangman Trivia!'})}
+        lambda_function.lambda_handler(wake_up, lambda_context)
+
+        with mock.patch.object(lambda_function, 'get_dynamodb_client',
+                               return_value=mock.Mock()) as mock_client:
+            results = [lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+                       for _ in range(5)]
+
+        assert mock_client.return_value.method_calls == []
+        for result in results:
+            body = json.loads(result['body'])
+            assert items[body[PARTITION_KEY]] == body[SECONDARY_KEY]
+        assert lambda_function.get_bank(TABLE_NAME_NORMAL).to_dict() == items
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_version_item_is_not_served_as_clue(self, lambda_event_normal, lambda_context):
+        """Test that the table version metadata item is excluded from the bank."""
+        table = create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 1})
+
+        bank = lambda_function.get_bank(TABLE_NAME_NORMAL)
+
+        assert bank.to_dict() == {'ANSWER 1': 'Clue 1'}
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'BANK_CACHE_TTL_SECONDS', 0)
+    def test_expired_cache_with_unchanged_version_is_reused(self):
+        """Test that an expired cache is kept without rescanning if the version is unchanged."""
+        table = create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 1})
+        lambda_function.get_bank(TABLE_NAME_NORMAL)
+
+        # Written without bumping the version, so the cached bank should still be served
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 2', SECONDARY_KEY: 'Clue 2'})
+
+        assert lambda_function.get_bank(TABLE_NAME_NORMAL).to_dict() == {'ANSWER 1': 'Clue 1'}
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'BANK_CACHE_TTL_SECONDS', 0)
+    def test_expired_cache_with_new_version_is_rescanned(self):
+        """Test that a version bump causes the bank to be rescanned after the TTL."""
+        table = create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 1})
+        lambda_function.get_bank(TABLE_NAME_NORMAL)
+
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 2', SECONDARY_KEY: 'Clue 2'})
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 2})
+
+        assert lambda_function.get_bank(TABLE_NAME_NORMAL).to_dict() == {
+            'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'
+        }
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_invalidate_bank_cache(self):
+        """Test that explicit invalidation forces a rescan within the TTL."""
+        table = create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        lambda_function.get_bank(TABLE_NAME_NORMAL)
+        table.delete_item(Key={PARTITION_KEY: 'ANSWER 1'})
+
+        assert lambda_function.get_bank(TABLE_NAME_NORMAL).to_dict() == {'ANSWER 1': 'Clue 1'}
+        lambda_function.invalidate_bank_cache(TABLE_NAME_NORMAL)
+        assert lambda_function.get_bank(TABLE_NAME_NORMAL).to_dict() == {}
+
+
+class TestDynamoDBClient:
+    """Test cases for the per-container DynamoDB client."""
+
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_client_is_created_once(self):
+        """Test that the client is created lazily and then reused."""
+        assert lambda_function._dynamodb_client is None
+
+        client = lambda_function.get_dynamodb_client()
+
+        assert lambda_function.get_dynamodb_client() is client
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_read_version_item(self):
+        """Test that the version and index pages are read as ints, or None if missing."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        client = lambda_function.get_dynamodb_client()
+        assert lambda_function.read_version_item(client, TABLE_NAME_NORMAL) == (None, None)
+
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 7})
+        assert lambda_function.read_version_item(client, TABLE_NAME_NORMAL) == (7, None)
+
+        table.put_item(Item={PARTITION_KEY: lambda_function.VERSION_KEY, 'version': 8,
+                             answer_index.INDEX_PAGES_ATTRIBUTE: 2})
+        assert lambda_function.read_version_item(client, TABLE_NAME_NORMAL) == (8, 2)
+
+
+class TestInstrumentation:
+    """Test cases for the opt-in per-invocation metrics."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_metrics_are_emitted_per_invocation(self, lambda_event_normal, lambda_context,
+                                                capsys):
+        """Test that each invocation logs one EMF line with its phases and bank source."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'})
+
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        cold, warm = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert cold['BankSource'] == 'scan'
+        assert cold['CacheHit'] == 0
+        assert cold['ScannedItems'] == 2
+        assert cold['DynamoDBCalls'] == 2  # version read and one scan page
+        assert 'ConsumedReadCapacity' in cold
+        assert cold['Difficulty'] == 'normal'
+        assert cold['StatusCode'] == 200
+        for phase in ('Parse', 'LoadBank', 'Sample', 'Serialize', 'Total'):
+            assert f'{phase}Duration' in cold
+
+        assert warm['BankSource'] == 'cache'
+        assert warm['CacheHit'] == 1
+        assert 'DynamoDBCalls' not in warm
+
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_metrics_are_emitted_for_errors(self, lambda_event_normal, lambda_context, capsys):
+        """Test that failed invocations are logged with their status code."""
+        lambda_function.lambda_handler({'body': 'invalid json'}, lambda_context)
+        with mock.patch.object(lambda_function, 'get_bank', side_effect=RuntimeError('Down')):
+            lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [record['StatusCode'] for record in records] == [400, 500]
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_metrics_disabled_by_default(self, lambda_event_normal, lambda_context, capsys):
+        """Test that nothing is logged unless instrumentation is enabled."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        assert capsys.readouterr().out == ''
+
+
+class TestSnapshotMode:
+    """Test cases for serving clues from a bundled word bank snapshot."""
+
+    @pytest.fixture
+    def snapshot_path(self, tmp_path):
+        """Snapshot file holding a normal bank only."""
+        path = str(tmp_path / 'wordbank_snapshot.json')
+        word_bank_snapshot.dump_snapshot({
+            TABLE_NAME_NORMAL: {
+                'version': 1,
+                'entries': [(0, 'SNAPSHOT ANSWER', 'Snapshot clue'), (1, 'OTHER', 'Other clue')],
+            },
+        }, path)
+        return path
+
+    def test_load_snapshot_banks_missing_file(self, tmp_path):
+        """Test that a missing snapshot yields no banks."""
+        assert lambda_function.load_snapshot_banks(str(tmp_path / 'missing.json')) == {}
+
+    def test_lambda_handler_serves_from_snapshot(self, snapshot_path, lambda_context):
+        """Test that snapshot banks are served without any DynamoDB calls."""
+        banks = lambda_function.load_snapshot_banks(snapshot_path)
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['OTHER']})}
+
+        with mock.patch.object(lambda_function, '_snapshot_banks', banks), \
+                mock.patch.object(lambda_function, 'get_dynamodb_client') as mock_client:
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        mock_client.assert_not_called()
+        assert json.loads(result['body']) == {
+            SECONDARY_KEY: 'Snapshot clue', PARTITION_KEY: 'SNAPSHOT ANSWER', 'id': 0
+        }
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_falls_back_to_dynamodb(self, snapshot_path, lambda_event_hard,
+                                                   lambda_context):
+        """Test that tables missing from the snapshot are read from DynamoDB."""
+        create_table(TABLE_NAME_HARD, {'HARD ANSWER': 'Hard clue'})
+        banks = lambda_function.load_snapshot_banks(snapshot_path)
+
+        with mock.patch.object(lambda_function, '_snapshot_banks', banks):
+            result = lambda_function.lambda_handler(lambda_event_hard, lambda_context)
+
+        assert json.loads(result['body'])[PARTITION_KEY] == 'HARD ANSWER'
+
+
+def create_indexed_table(table_name, items, version=1, index_version=None):
+    """Create a mock word bank table with IDs and an answer index, as synced by the
+    database management script."""
+    table = create_table(table_name, {})
+    ids = {}
+    for entry_id, (answer, clue) in enumerate(items.items()):
+        table.put_item(Item={PARTITION_KEY: answer, SECONDARY_KEY: clue, 'id': entry_id})
+        ids[answer] = entry_id
+    pages = answer_index.build_index_pages(ids)
+    for page_number, page in enumerate(pages):
+        table.put_item(Item={
+            PARTITION_KEY: answer_index.index_page_key(page_number),
+            'version': version if index_version is None else index_version,
+            'answers': page['answers'],
+            'ids': page['ids'],
+        })
+    table.put_item(Item={
+        PARTITION_KEY: lambda_function.VERSION_KEY, 'version': version, 'index_pages': len(pages)
+    })
+    return table
+
+
+@mock.patch.object(lambda_function, 'INDEX_MIN_ENTRIES', 0)
+class TestAnswerIndex:
+    """Test cases for loading banks from the answer index instead of scanning."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_serves_from_index(self, lambda_event_normal, lambda_context):
+        """Test that an indexed table is never scanned and the clue is read by key."""
+        create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+
+        with mock.patch.object(lambda_function, 'scan_table') as mock_scan:
+            result = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        mock_scan.assert_not_called()
+        assert json.loads(result['body']) == {
+            SECONDARY_KEY: 'Clue 1', PARTITION_KEY: 'ANSWER 1', 'id': 0
+        }
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_lambda_handler_with_count_from_index(self, lambda_context):
+        """Test that several clues are read in one batch and matched to their answers."""
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(5)}
+        create_indexed_table(TABLE_NAME_NORMAL, items)
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER 0'], 'count': 3})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        clues = json.loads(result['body'])['clues']
+        assert len(clues) == 3
+        for clue in clues:
+            assert clue[PARTITION_KEY] != 'ANSWER 0'
+            assert items[clue[PARTITION_KEY]] == clue[SECONDARY_KEY]
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_index_is_cached(self, lambda_event_normal, lambda_context):
+        """Test that warm requests reuse the index and only read the served clue."""
+        create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+        client = lambda_function.get_dynamodb_client()
+
+        with mock.patch.object(client, 'batch_get_item') as mock_batch_get, \
+                mock.patch.object(client, 'get_item', wraps=client.get_item) as mock_get:
+            result = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        mock_batch_get.assert_not_called()
+        assert mock_get.call_count == 1
+        assert json.loads(result['body'])[SECONDARY_KEY] == 'Clue 1'
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_index_metrics(self, lambda_context, capsys):
+        """Test that index loads and clue reads are counted as DynamoDB calls."""
+        create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'})
+        single = {'body': json.dumps({'difficulty': 'normal'})}
+        several = {'body': json.dumps({'difficulty': 'normal', 'count': 2})}
+
+        lambda_function.lambda_handler(single, lambda_context)
+        lambda_function.lambda_handler(several, lambda_context)
+
+        cold, warm = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert cold['BankSource'] == 'index'
+        assert cold['CacheHit'] == 0
+        assert cold['DynamoDBCalls'] == 3  # version read, index page and clue
+        assert 'FetchCluesDuration' in cold
+        assert warm['BankSource'] == 'cache'
+        assert warm['DynamoDBCalls'] == 1  # one batch of clues
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_stale_index_falls_back_to_scan(self):
+        """Test that an index written for another version is ignored."""
+        create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'}, version=2, index_version=1)
+
+        bank = lambda_function.get_bank(TABLE_NAME_NORMAL)
+
+        assert bank.to_dict() == {'ANSWER 1': 'Clue 1'}
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'USE_ANSWER_INDEX', False)
+    def test_index_can_be_disabled(self):
+        """Test that banks are scanned when the index is switched off."""
+        create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+
+        bank = lambda_function.get_bank(TABLE_NAME_NORMAL)
+
+        assert bank.to_dict() == {'ANSWER 1': 'Clue 1'}
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_entry_removed_after_index_was_read(self, lambda_event_normal, lambda_context):
+        """Test that entries deleted since the index was cached are not served."""
+        table = create_indexed_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        lambda_function.get_bank(TABLE_NAME_NORMAL)
+        table.delete_item(Key={PARTITION_KEY: 'ANSWER 1'})
+
+        result = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+
+        assert result['statusCode'] == 204
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_entry_deleted_after_index_was_cached(self, lambda_event_normal, lambda_context):
+        """Test that an entry deleted by a sync is replaced by an unseen one, not a 204."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        write_dynamodb_table.update_table({'ALPHA ONE': 'Clue A', 'BRAVO TWO': 'Clue B'}, table)
+        lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+        write_dynamodb_table.update_table({'ALPHA ONE': 'Clue A'}, table)
+
+        results = [lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+                   for _ in range(6)]
+
+        several = {'body': json.dumps({'difficulty': 'normal', 'count': 2})}
+        both = json.loads(lambda_function.lambda_handler(several, lambda_context)['body'])
+
+        assert [result['statusCode'] for result in results] == [200] * 6
+        assert {json.loads(result['body'])[PARTITION_KEY] for result in results} == {'ALPHA ONE'}
+        assert [clue[PARTITION_KEY] for clue in both['clues']] == ['ALPHA ONE']
+        assert len(lambda_function.get_bank(TABLE_NAME_NORMAL)) == 1  # Reloaded
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_entry_deleted_without_sync_is_redrawn(self, lambda_context):
+        """Test that entries missing from a current index are treated as seen."""
+        table = create_indexed_table(TABLE_NAME_NORMAL, {'ALPHA': 'Clue A', 'BRAVO': 'Clue B'})
+        table.delete_item(Key={PARTITION_KEY: 'BRAVO'})
+        several = {'body': json.dumps({'difficulty': 'normal', 'count': 2})}
+        rest = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ALPHA']})}
+
+        result = lambda_function.lambda_handler(several, lambda_context)
+
+        assert [clue[PARTITION_KEY] for clue in json.loads(result['body'])['clues']] == ['ALPHA']
+        assert lambda_function.lambda_handler(rest, lambda_context)['statusCode'] == 204
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_session_skips_entry_deleted_after_index_was_cached(self, lambda_context):
+        """Test that a deck deals past a deleted entry instead of dealing it again."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(3)}
+        write_dynamodb_table.update_table(items, table)
+        lambda_function.get_bank(TABLE_NAME_NORMAL)
+        table.delete_item(Key={PARTITION_KEY: 'ANSWER 1'})
+
+        dealt, token = [], True
+        for _ in range(3):
+            event = {'body': json.dumps({'difficulty': 'normal', 'session': token})}
+            result = lambda_function.lambda_handler(event, lambda_context)
+            if result['statusCode'] != 200:
+                break
+            body = json.loads(result['body'])
+            dealt.append(body[PARTITION_KEY])
+            token = body['session']
+
+        assert sorted(dealt) == ['ANSWER 0', 'ANSWER 2']
+        assert result['statusCode'] == 204
+
+
+NOW = datetime(2026, 10, 18, 18, 0, tzinfo=timezone.utc)
+
+
+@mock.patch.object(lambda_function, 'utc_now', return_value=NOW)
+class TestDailyMode:
+    """Test cases for the daily sets shared by every player."""
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_daily_set_is_computed_once(self, mock_now, lambda_context):
+        """Test that the daily set is served from the daily cache after the first request."""
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(30)}
+        create_table(TABLE_NAME_NORMAL, items)
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+
+        first = lambda_function.lambda_handler(event, lambda_context)
+        with mock.patch.object(lambda_function, 'select_daily') as mock_select, \
+                mock.patch.object(lambda_function, 'load_bank') as mock_load:
+            second = lambda_function.lambda_handler(event, lambda_context)
+
+        mock_select.assert_not_called()
+        mock_load.assert_not_called()
+        assert first == second
+        assert first['statusCode'] == 200
+        assert first['headers'] == {'Cache-Control': 'public, max-age=21600, immutable'}
+        body = json.loads(first['body'])
+        assert body['date'] == '2026-10-18'
+        assert body['difficulty'] == 'normal'
+        assert len(body['clues']) == 10
+        for clue in body['clues']:
+            assert items[clue[PARTITION_KEY]] == clue[SECONDARY_KEY]
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_daily_set_ignores_seen(self, mock_now, lambda_context):
+        """Test that every player gets the same set, whatever they have seen."""
+        create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(30)})
+        fresh = {'body': json.dumps({'difficulty': 'normal', 'daily': 'today'})}
+        body = json.loads(lambda_function.lambda_handler(fresh, lambda_context)['body'])
+        answers = [clue[PARTITION_KEY] for clue in body['clues']]
+        lambda_function.clear_daily_cache()
+        seen = {'body': json.dumps({'difficulty': 'normal', 'daily': True, 'seen': answers})}
+
+        result = lambda_function.lambda_handler(seen, lambda_context)
+
+        assert [clue[PARTITION_KEY] for clue in json.loads(result['body'])['clues']] == answers
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_daily_metrics(self, mock_now, lambda_context, capsys):
+        """Test that daily requests record whether the set came from the daily cache."""
+        create_table(TABLE_NAME_NORMAL, {'ANSWER 1': 'Clue 1'})
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+
+        lambda_function.lambda_handler(event, lambda_context)
+        lambda_function.lambda_handler(event, lambda_context)
+
+        computed, cached = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert computed['DailySource'] == 'computed'
+        assert computed['BankSource'] == 'scan'
+        assert cached['DailySource'] == 'cache'
+        assert cached['BankSource'] == 'cache'
+        assert 'SampleDuration' not in cached
+
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_get_request_phases(self, mock_now, lambda_context, capsys):
+        """Test that the Parse phase of a GET request ends before the set is served."""
+        event = {'httpMethod': 'GET', 'queryStringParameters': {'difficulty': 'hard',
+                                                                'daily': 'today'}}
+
+        clock = [100.0]
+
+        def slow_get_bank(table_name, recorder):
+            clock[0] += 0.05  # Loading the bank takes 50 ms on the fake clock
+            return WordBank({'ANSWER 1': 'Clue 1'})
+
+        with mock.patch('time.perf_counter', side_effect=lambda: clock[0]), \
+                mock.patch.object(lambda_function, 'get_bank', side_effect=slow_get_bank):
+            lambda_function.lambda_handler(event, lambda_context)
+
+        record = json.loads(capsys.readouterr().out)
+        assert record['LoadBankDuration'] == pytest.approx(50)
+        assert record['ParseDuration'] == 0
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_daily_set_follows_bank_changes(self, mock_now, lambda_context):
+        """Test that a container that reloads a changed bank serves the set of the new
+        bank, as a cold container does, instead of its cached set."""
+        table = create_table(TABLE_NAME_NORMAL, {f'ANSWER {i}': f'Clue {i}' for i in range(30)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+        first = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+        removed = first['clues'][0][PARTITION_KEY]
+        table.delete_item(Key={PARTITION_KEY: removed})
+        lambda_function.invalidate_bank_cache()  # As after a version change
+
+        warm = lambda_function.lambda_handler(event, lambda_context)
+        lambda_function.clear_daily_cache()
+        cold = lambda_function.lambda_handler(event, lambda_context)
+
+        assert removed not in [clue[PARTITION_KEY] for clue in json.loads(warm['body'])['clues']]
+        assert warm['body'] == cold['body']
+
+    @pytest.mark.parametrize('event', [
+        {'httpMethod': 'GET', 'queryStringParameters': {'difficulty': 'hard', 'daily': 'today'}},
+        {'requestContext': {'http': {'method': 'GET'}},
+         'queryStringParameters': {'difficulty': 'hard', 'daily': '2026-10-17'}},
+    ])
+    def test_daily_set_over_get(self, mock_now, event, lambda_context):
+        """Test that daily sets can be requested with GET from API Gateway or a function URL."""
+        bank = WordBank({'ANSWER 1': 'Clue 1'}, {'ANSWER 1': 7})
+
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank):
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert result['statusCode'] == 200
+        assert json.loads(result['body'])['clues'] == [
+            {SECONDARY_KEY: 'Clue 1', PARTITION_KEY: 'ANSWER 1', 'id': 7}
+        ]
+
+    @pytest.mark.parametrize('event', [
+        {'httpMethod': 'GET', 'queryStringParameters': {'difficulty': 'normal'}},
+        {'httpMethod': 'GET', 'queryStringParameters': None},
+        {'httpMethod': 'GET', 'queryStringParameters': {'difficulty': 'easy', 'daily': 'today'}},
+        {'body': json.dumps({'difficulty': 'normal', 'daily': '2026-10-19'})},
+        {'body': json.dumps({'difficulty': 'normal', 'daily': 'tomorrow'})},
+    ])
+    def test_invalid_daily_requests(self, mock_now, event, lambda_context):
+        """Test that non-daily GET requests, unknown difficulties and future days are 400s."""
+        with mock.patch.object(lambda_function, 'get_bank') as mock_get_bank:
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        mock_get_bank.assert_not_called()
+        assert result['statusCode'] == 400
+        assert 'headers' not in result
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'INDEX_MIN_ENTRIES', 0)
+    def test_daily_set_from_index(self, mock_now, lambda_context):
+        """Test that the clues of a daily set are read by key from an indexed table."""
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(30)}
+        create_indexed_table(TABLE_NAME_DRUNK, items)
+        event = {'body': json.dumps({'difficulty': 'drunk', 'daily': True})}
+
+        with mock.patch.object(lambda_function, 'scan_table') as mock_scan:
+            result = lambda_function.lambda_handler(event, lambda_context)
+
+        mock_scan.assert_not_called()
+        clues = json.loads(result['body'])['clues']
+        assert len(clues) == 10
+        for clue in clues:
+            assert items[clue[PARTITION_KEY]] == clue[SECONDARY_KEY]
+            assert clue['id'] == int(clue[PARTITION_KEY].split()[1])
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'INDEX_MIN_ENTRIES', 0)
+    def test_daily_entry_deleted_after_index_was_cached(self, mock_now, lambda_context):
+        """Test that a set is chosen again from the current index when a sync deleted one
+        of its entries, so that it matches the set of a cold container."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        items = {f'ANSWER {i}': f'Clue {i}' for i in range(30)}
+        write_dynamodb_table.update_table(items, table)
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+        first = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+        removed = first['clues'][0][PARTITION_KEY]
+        write_dynamodb_table.update_table(
+            {answer: clue for answer, clue in items.items() if answer != removed}, table
+        )
+        lambda_function.clear_daily_cache()
+
+        warm = lambda_function.lambda_handler(event, lambda_context)
+        lambda_function.invalidate_bank_cache()
+        lambda_function.clear_daily_cache()
+        cold = lambda_function.lambda_handler(event, lambda_context)
+
+        clues = json.loads(warm['body'])['clues']
+        assert len(clues) == 10
+        assert removed not in [clue[PARTITION_KEY] for clue in clues]
+        assert warm['body'] == cold['body']
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(lambda_function, 'INDEX_MIN_ENTRIES', 0)
+    def test_daily_entry_deleted_without_sync_is_skipped(self, mock_now, lambda_context):
+        """Test that an entry missing from a current index is left out of the set."""
+        table = create_indexed_table(TABLE_NAME_NORMAL,
+                                     {f'ANSWER {i}': f'Clue {i}' for i in range(30)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+        first = json.loads(lambda_function.lambda_handler(event, lambda_context)['body'])
+        removed = first['clues'][0][PARTITION_KEY]
+        table.delete_item(Key={PARTITION_KEY: removed})
+        lambda_function.clear_daily_cache()
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+
+        assert json.loads(result['body'])['clues'] == first['clues'][1:]
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_empty_daily_set_is_not_cached(self, mock_now, lambda_context):
+        """Test that an empty bank is answered with a 204 that is computed again later."""
+        table = create_table(TABLE_NAME_NORMAL, {})
+        event = {'body': json.dumps({'difficulty': 'normal', 'daily': True})}
+
+        result = lambda_function.lambda_handler(event, lambda_context)
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 1', SECONDARY_KEY: 'Clue 1'})
+        lambda_function.invalidate_bank_cache()
+
+        assert result['statusCode'] == 204
+        assert lambda_function.lambda_handler(event, lambda_context)['statusCode'] == 200
+
+    @mock.patch.object(lambda_function, 'MAX_DAILY_CACHE_ENTRIES', 2)
+    def test_daily_cache_is_bounded(self, mock_now):
+        """Test that the oldest daily sets are dropped once the cache is full."""
+        bank = WordBank({'ANSWER 1': 'Clue 1'})
+
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank):
+            for day in ('2026-10-16', '2026-10-17', '2026-10-18'):
+                lambda_function.serve_daily({'difficulty': 'normal', 'daily': day})
+
+        assert [day.isoformat() for _, day, _ in lambda_function._daily_cache] == [
+            '2026-10-17', '2026-10-18'
+        ]
+
+    @mock.patch.object(lambda_function, 'MAX_DAILY_CACHE_ENTRIES', 2)
+    def test_daily_cache_is_shared_by_difficulties(self, mock_now):
+        """Test that difficulties filling the cache concurrently keep it bounded."""
+        bank = WordBank({'ANSWER 1': 'Clue 1'})
+        days = [f'2026-09-{day:02}' for day in range(1, 31)]
+        barrier = threading.Barrier(len(lambda_function.TABLE_NAMES), timeout=5)
+        statuses = []
+
+        def request(difficulty):
+            barrier.wait()
+            for day in days:
+                response = lambda_function.serve_daily({'difficulty': difficulty, 'daily': day})
+                statuses.append(response['statusCode'])
+
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank):
+            threads = [threading.Thread(target=request, args=(difficulty,))
+                       for difficulty in lambda_function.TABLE_NAMES]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert statuses == [200] * len(days) * len(threads)
+        assert len(lambda_function._daily_cache) == 2
+
+    def test_concurrent_requests_compute_the_set_once(self, mock_now):
+        """Test that requests arriving together for the same set wait for one computation."""
+        barrier = threading.Barrier(4, timeout=5)
+        bank = WordBank({'ANSWER 1': 'Clue 1'})
+        responses = []
+
+        def request():
+            barrier.wait()
+            responses.append(lambda_function.serve_daily({'difficulty': 'hard', 'daily': True}))
+
+        select_daily = lambda_function.select_daily
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank), \
+                mock.patch.object(lambda_function, 'select_daily',
+                                  wraps=select_daily) as mock_select:
+            threads = [threading.Thread(target=request) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_select.call_count == 1
+        assert len(responses) == 4
+        assert all(response == responses[0] for response in responses)
+
+
+class TestWeightedSelection:
+    """Test cases for drawing newly added clues more often."""
+
+    @pytest.fixture(autouse=True)
+    def recent_weighting(self):
+        """Favour the newest half of each bank."""
+        with mock.patch.object(lambda_function, 'CLUE_WEIGHTING', 'recent'), \
+                mock.patch.object(lambda_function, 'NEW_CLUE_FRACTION', 0.5), \
+                mock.patch.object(lambda_function, 'NEW_CLUE_WEIGHT', 1000), \
+                mock.patch.dict(lambda_function._weighted_samplers, clear=True):
+            yield
+
+    def test_new_clues_are_drawn_more_often(self, lambda_context):
+        """Test that requests mostly get clues with the highest IDs."""
+        bank = WordBank({f'ANSWER {i}': f'Clue {i}' for i in range(10)},
+                        {f'ANSWER {i}': i for i in range(10)})
+        event = {'body': json.dumps({'difficulty': 'normal', 'seen': ['ANSWER 9'], 'count': 3})}
+
+        with mock.patch.object(lambda_function, 'get_bank', return_value=bank):
+            served = [clue['id'] for _ in range(20) for clue in json.loads(
+                lambda_function.lambda_handler(event, lambda_context)['body'])['clues']]
+
+        assert 9 not in served
+        assert sum(entry_id >= 5 for entry_id in served) > 0.9 * len(served)
+
+    def test_sampler_is_rebuilt_with_the_bank(self):
+        """Test that the alias table is reused until the bank is replaced."""
+        bank = WordBank({'ANSWER 1': 'Clue 1'}, {'ANSWER 1': 1})
+
+        sampler = lambda_function.get_sampler(TABLE_NAME_NORMAL, bank)
+
+        assert lambda_function.get_sampler(TABLE_NAME_NORMAL, bank) is sampler
+        replaced = WordBank({'ANSWER 1': 'Clue 1'}, {'ANSWER 1': 1})
+        assert lambda_function.get_sampler(TABLE_NAME_NORMAL, replaced) is not sampler
+        assert lambda_function.get_sampler(TABLE_NAME_HARD, bank) is not sampler
+
+    def test_uniform_by_default(self):
+        """Test that the bank draws its own clues when weighting is off."""
+        bank = WordBank({'ANSWER 1': 'Clue 1'})
+
+        with mock.patch.object(lambda_function, 'CLUE_WEIGHTING', 'uniform'):
+            assert lambda_function.get_sampler(TABLE_NAME_NORMAL, bank) is bank
+
+
+def create_outcome_table():
+    """Create a mock outcome table."""
+    boto3.client('dynamodb').create_table(
+        TableName=outcome_stats.OUTCOME_TABLE_NAME,
+        KeySchema=[{'AttributeName': outcome_stats.OUTCOME_PARTITION_KEY, 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': outcome_stats.OUTCOME_PARTITION_KEY, 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST',
+    )
+
+def outcome_event(*outcomes):
+    """Lambda event reporting (difficulty, answer, solved, wrongGuesses) outcomes."""
+    return {'body': json.dumps({'outcomes': [
+        {'difficulty': difficulty, 'answer': answer, 'solved': solved, 'wrongGuesses': wrong}
+        for difficulty, answer, solved, wrong in outcomes
+    ]})}
+
+
+class TestOutcomeReports:
+    """Test cases for reporting round outcomes to the handler."""
+
+    @pytest.fixture(autouse=True)
+    def outcome_buffer(self):
+        """Fresh outcome buffer flushed every three rounds."""
+        buffer = outcome_stats.OutcomeBuffer(max_rounds=3)
+        with mock.patch.object(lambda_function, '_outcome_buffer', buffer):
+            yield buffer
+
+    @pytest.fixture(autouse=True)
+    def banks(self):
+        """Snapshot banks of every difficulty holding the answers reported by the tests."""
+        answers = ['PARIS', 'ROME'] + [f'ANSWER {i}' for i in range(3)]
+        bank = WordBank({answer: f'Clue of {answer}' for answer in answers})
+        banks = {table_name: bank for table_name in lambda_function.TABLE_NAMES.values()}
+        with mock.patch.object(lambda_function, '_snapshot_banks', banks):
+            yield banks
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_outcomes_are_buffered_then_flushed(self, outcome_buffer, lambda_context):
+        """Test that outcomes are only written once the buffer reaches its threshold."""
+        create_outcome_table()
+        client = boto3.client('dynamodb')
+
+        result = lambda_function.lambda_handler(
+            outcome_event(('normal', 'PARIS', True, 2), ('normal', 'PARIS', False, 6)),
+            lambda_context,
+        )
+
+        assert result['statusCode'] == 202
+        assert json.loads(result['body']) == {'recorded': 2}
+        assert client.scan(TableName=outcome_stats.OUTCOME_TABLE_NAME)['Count'] == 0
+
+        lambda_function.lambda_handler(outcome_event(('hard', 'ROME', True, 0)), lambda_context)
+
+        items = client.scan(TableName=outcome_stats.OUTCOME_TABLE_NAME)['Items']
+        assert sorted((item['clue']['S'], item['plays']['N'], item['solved']['N'],
+                       item['wrong_guesses']['N']) for item in items) == [
+            ('hard#ROME', '1', '1', '0'), ('normal#PARIS', '2', '1', '8')
+        ]
+        assert outcome_buffer.rounds == 0
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_only_reports_flush_old_outcomes(self, outcome_buffer, lambda_event_normal,
+                                             lambda_context, capsys):
+        """Test that clue requests never write outcomes, even old ones, and the next
+        report does."""
+        create_outcome_table()
+        lambda_function.lambda_handler(outcome_event(('normal', 'PARIS', True, 2)), lambda_context)
+
+        with mock.patch.object(outcome_buffer, '_max_age', 0):
+            served = lambda_function.lambda_handler(lambda_event_normal, lambda_context)
+            assert outcome_buffer.rounds == 1
+            lambda_function.lambda_handler(outcome_event(('normal', 'ROME', True, 0)),
+                                           lambda_context)
+
+        assert served['statusCode'] == 200
+        assert outcome_buffer.rounds == 0
+        first, clue, second = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert first['Outcomes'] == 1
+        assert 'FlushOutcomesDuration' not in first
+        assert 'FlushOutcomesDuration' not in clue
+        assert second['OutcomeWrites'] == 2
+
+    @mock_aws
+    @mock.patch.dict(os.environ, {'AWS_DEFAULT_REGION': AWS_REGION})
+    def test_failed_flush_keeps_outcomes(self, outcome_buffer, lambda_context, capsys):
+        """Test that outcomes that cannot be written stay buffered and the report succeeds."""
+        result = lambda_function.lambda_handler(
+            outcome_event(*[('normal', f'ANSWER {i}', True, 0) for i in range(3)]),
+            lambda_context,
+        )
+
+        assert result['statusCode'] == 202
+        assert outcome_buffer.rounds == 3
+        assert 'Could not write the outcomes' in capsys.readouterr().out
+
+    def test_flush_without_client_keeps_outcomes(self, outcome_buffer, capsys):
+        """Test that a failure to create the client does not fail the invocation."""
+        outcome_buffer.record('normal', 'PARIS', True, 0)
+
+        with mock.patch.object(outcome_buffer, '_max_age', 0), \
+                mock.patch.object(lambda_function, 'get_dynamodb_client',
+                                  side_effect=RuntimeError('No region')):
+            lambda_function.flush_outcomes_if_due()
+
+        assert outcome_buffer.rounds == 1
+        assert 'Could not flush outcomes: No region' in capsys.readouterr().out
+
+    @pytest.mark.parametrize('body', [
+        {'outcomes': []},
+        {'outcomes': 'PARIS'},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': True}] * 51},
+        {'outcomes': ['PARIS']},
+        {'outcomes': [{'difficulty': 'easy', 'answer': 'PARIS', 'solved': True}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': '', 'solved': True}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'A' * 101, 'solved': True}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': 1}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': True,
+                       'wrongGuesses': 27}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': True,
+                       'wrongGuesses': True}]},
+        {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': True},
+                      {'difficulty': 'normal', 'answer': 'ROME', 'solved': None}]},
+    ])
+    def test_invalid_reports(self, outcome_buffer, body, lambda_context):
+        """Test that malformed reports are rejected with a 400 and nothing is buffered."""
+        result = lambda_function.lambda_handler({'body': json.dumps(body)}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert outcome_buffer.rounds == 0
+
+    @pytest.mark.parametrize('outcome', ['PARIS', ['normal', 'PARIS', True], None])
+    def test_outcome_not_an_object(self, outcome_buffer, outcome, lambda_context):
+        """Test that an outcome that is not an object is reported as such."""
+        body = {'outcomes': [{'difficulty': 'normal', 'answer': 'PARIS', 'solved': True},
+                             outcome]}
+
+        result = lambda_function.lambda_handler({'body': json.dumps(body)}, lambda_context)
+
+        assert result['statusCode'] == 400
+        assert json.loads(result['body'])['error'] == 'each outcome must be an object'
+        assert outcome_buffer.rounds == 0
+
+    @mock.patch.object(metrics, 'METRICS_ENABLED', True)
+    def test_unknown_answers_are_ignored(self, outcome_buffer, lambda_context, capsys):
+        """Test that rounds of answers missing from the bank of their difficulty are not
+        counted, so that made-up answers never reach the outcome table."""
+        junk = [('normal', f'JUNK0-{i}', True, 0) for i in range(49)]
+
+        result = lambda_function.lambda_handler(
+            outcome_event(('hard', 'ROME', False, 4), *junk), lambda_context
+        )
+
+        assert result['statusCode'] == 202
+        assert json.loads(result['body']) == {'recorded': 1}
+        assert outcome_buffer.take() == {'hard#ROME': [1, 0, 4]}
+        record = json.loads(capsys.readouterr().out)
+        assert record['Outcomes'] == 1
+        assert record['UnknownOutcomes'] == 49
+
+    def test_wrong_guesses_default_to_zero(self, outcome_buffer):
+        """Test that a round reported without wrong guesses counts none."""
+        lambda_function.record_outcomes(
+            {'outcomes': [{'difficulty': 'drunk', 'answer': 'PARIS', 'solved': True}]}
+        )
+
+        assert outcome_buffer.take() == {'drunk#PARIS': [1, 1, 0]}
+
+    @pytest.mark.parametrize('environ, installed', [
+        ({}, False),
+        ({'AWS_LAMBDA_FUNCTION_NAME': 'hangmantrivia'}, True),
+    ])
+    def test_init_shutdown_flush(self, outcome_buffer, environ, installed):
+        """Test that the SIGTERM flush is only installed when running in Lambda."""
+        with mock.patch.object(lambda_function, 'install_shutdown_flush') as mock_install:
+            assert lambda_function.init_shutdown_flush(environ) is installed
+
+        assert mock_install.called is installed
+        if installed:
+            mock_install.assert_called_once_with(
+                outcome_buffer, lambda_function.get_dynamodb_client
+            )
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
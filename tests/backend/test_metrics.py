@@ -0,0 +1,97 @@
+"""
+Test Suite: Request Instrumentation (Hangman Trivia Backend)
+
+Test coverage for metrics.py - Per-invocation timings emitted as CloudWatch EMF
+"""
+
+import pytest
+import json
+from unittest import mock
+
+# The module to test
+from backend.lambda_function import metrics
+
+
+class TestRequestMetrics:
+    """Test cases for the metrics recorders."""
+
+    def test_phase_timings_accumulate(self):
+        """Test that repeated phases add up and counters accumulate."""
+        recorder = metrics.RequestMetrics()
+
+        with mock.patch('time.perf_counter', side_effect=[1.0, 1.002, 2.0, 2.003]):
+            with recorder.phase('Parse'):
+                pass
+            with recorder.phase('Parse'):
+                pass
+        recorder.add('ScannedItems', 10)
+        recorder.add('ScannedItems', 5)
+
+        assert recorder.timings['Parse'] == pytest.approx(5.0)
+        assert recorder.counts == {'ScannedItems': 15}
+
+    def test_phase_is_recorded_when_block_raises(self):
+        """Test that a failing phase still records its duration."""
+        recorder = metrics.RequestMetrics()
+
+        with pytest.raises(ValueError):
+            with recorder.phase('Sample'):
+                raise ValueError('boom')
+
+        assert 'Sample' in recorder.timings
+
+    def test_emf_record(self):
+        """Test that the record follows the CloudWatch Embedded Metric Format."""
+        recorder = metrics.RequestMetrics()
+        with recorder.phase('LoadBank'):
+            pass
+        recorder.add('CacheHit')
+        recorder.set_property('Difficulty', 'hard')
+        recorder.set_property('BankSource', 'cache')
+
+        record = recorder.to_emf()
+
+        directive = record['_aws']['CloudWatchMetrics'][0]
+        assert directive['Namespace'] == 'HangmanTrivia'
+        assert directive['Dimensions'] == [['Difficulty']]
+        units = {metric['Name']: metric['Unit'] for metric in directive['Metrics']}
+        assert units == {
+            'LoadBankDuration': 'Milliseconds',
+            'TotalDuration': 'Milliseconds',
+            'CacheHit': 'Count',
+        }
+        assert record['Difficulty'] == 'hard'
+        assert record['BankSource'] == 'cache'
+        assert record['CacheHit'] == 1
+        assert all(name in record for name in units)
+
+    def test_emit_prints_single_json_line(self, capsys):
+        """Test that emitting prints exactly one JSON log line."""
+        metrics.RequestMetrics().emit()
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1
+        assert '_aws' in json.loads(lines[0])
+
+    def test_null_metrics_records_nothing(self, capsys):
+        """Test that the disabled recorder is inert."""
+        recorder = metrics.NULL_METRICS
+        with recorder.phase('Parse'):
+            pass
+        recorder.add('CacheHit')
+        recorder.set_property('Difficulty', 'normal')
+        recorder.emit()
+
+        assert recorder.enabled is False
+        assert capsys.readouterr().out == ''
+
+    def test_start_request_metrics(self):
+        """Test that a fresh recorder is only created when instrumentation is enabled."""
+        with mock.patch.object(metrics, 'METRICS_ENABLED', False):
+            assert metrics.start_request_metrics() is metrics.NULL_METRICS
+        with mock.patch.object(metrics, 'METRICS_ENABLED', True):
+            assert isinstance(metrics.start_request_metrics(), metrics.RequestMetrics)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,278 @@
+"""
+Test Suite: Clue Outcome Telemetry (Hangman Trivia Backend)
+
+Test coverage for outcome_stats.py - Per-clue outcome counters written in batches
+"""
+
+import pytest
+import signal
+import threading
+from unittest import mock
+from moto import mock_aws
+import boto3
+
+# The module to test
+from backend.lambda_function import outcome_stats
+
+AWS_REGION = 'us-east-1'
+
+@pytest.fixture
+def dynamodb_client():
+    """DynamoDB client of a mock account holding an empty outcome table."""
+    with mock_aws():
+        client = boto3.client('dynamodb', region_name=AWS_REGION)
+        client.create_table(
+            TableName=outcome_stats.OUTCOME_TABLE_NAME,
+            KeySchema=[{'AttributeName': outcome_stats.OUTCOME_PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[
+                {'AttributeName': outcome_stats.OUTCOME_PARTITION_KEY, 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        yield client
+
+@pytest.fixture
+def restore_sigterm():
+    """Put back the SIGTERM handler replaced by a test."""
+    handler = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, handler)
+
+def stored_counters(client):
+    """Return the counters of the outcome table {key: (plays, solved, wrong_guesses)}."""
+    items = client.scan(TableName=outcome_stats.OUTCOME_TABLE_NAME)['Items']
+    return {
+        item[outcome_stats.OUTCOME_PARTITION_KEY]['S']: tuple(
+            int(item[attribute]['N']) for attribute in outcome_stats.COUNTER_ATTRIBUTES
+        )
+        for item in items
+    }
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOutcomeBuffer:
+    """Test cases for aggregating outcomes and flushing them."""
+
+    def test_rounds_of_a_clue_are_aggregated(self, dynamodb_client):
+        """Test that rounds of the same clue are written with a single ADD."""
+        buffer = outcome_stats.OutcomeBuffer()
+        buffer.record('normal', 'PARIS', True, 2)
+        buffer.record('normal', 'PARIS', False, 6)
+        buffer.record('normal', 'PARIS', True, 0)
+        buffer.record('hard', 'PARIS', True, 1)
+
+        with mock.patch.object(dynamodb_client, 'update_item',
+                               wraps=dynamodb_client.update_item) as mock_update:
+            result = buffer.flush(dynamodb_client)
+
+        assert mock_update.call_count == 2
+        assert result == {'written': 2, 'restored': 0}
+        assert stored_counters(dynamodb_client) == {
+            'normal#PARIS': (3, 2, 8), 'hard#PARIS': (1, 1, 1)
+        }
+        assert len(buffer) == 0
+        assert buffer.rounds == 0
+
+    def test_flushes_add_to_stored_counters(self, dynamodb_client):
+        """Test that later flushes (e.g. of other containers) add to the stored counts."""
+        first = outcome_stats.OutcomeBuffer()
+        second = outcome_stats.OutcomeBuffer()
+        first.record('normal', 'PARIS', True, 2)
+        second.record('normal', 'PARIS', False, 6)
+
+        first.flush(dynamodb_client)
+        second.flush(dynamodb_client)
+
+        assert stored_counters(dynamodb_client) == {'normal#PARIS': (2, 1, 8)}
+
+    def test_flush_of_empty_buffer(self, dynamodb_client):
+        """Test that flushing an empty buffer writes nothing."""
+        assert outcome_stats.OutcomeBuffer().flush(dynamodb_client) == {
+            'written': 0, 'restored': 0
+        }
+        assert stored_counters(dynamodb_client) == {}
+
+    def test_flush_is_due_by_size(self):
+        """Test that a flush is due once the buffer holds the maximum number of rounds."""
+        buffer = outcome_stats.OutcomeBuffer(max_rounds=3, clock=FakeClock())
+
+        assert not buffer.flush_due()
+        buffer.record('normal', 'PARIS', True, 0)
+        buffer.record('normal', 'PARIS', True, 0)
+        assert not buffer.flush_due()
+        buffer.record('normal', 'ROME', True, 0)
+        assert buffer.flush_due()
+
+    def test_flush_is_due_by_age(self):
+        """Test that a flush is due once the oldest buffered round is old enough."""
+        clock = FakeClock()
+        buffer = outcome_stats.OutcomeBuffer(max_age=60, clock=clock)
+        buffer.record('normal', 'PARIS', True, 0)
+
+        clock.now += 59
+        buffer.record('normal', 'ROME', True, 0)
+        assert not buffer.flush_due()
+        clock.now += 1
+        assert buffer.flush_due()
+
+        buffer.take()
+        buffer.record('normal', 'OSLO', True, 0)
+        assert not buffer.flush_due()
+
+    def test_writes_are_concurrent(self, dynamodb_client):
+        """Test that the writes of a wave are in flight at the same time."""
+        buffer = outcome_stats.OutcomeBuffer()
+        for answer in ('PARIS', 'ROME', 'OSLO', 'BERN'):
+            buffer.record('normal', answer, True, 1)
+        # Only returns once all four writes have started, which sequential writes never do
+        barrier = threading.Barrier(4, timeout=5)
+
+        with mock.patch.object(outcome_stats, 'add_counters',
+                               side_effect=lambda *args: barrier.wait()):
+            result = buffer.flush(dynamodb_client, max_workers=4)
+
+        assert result == {'written': 4, 'restored': 0}
+
+    def test_failed_wave_stops_flush(self, dynamodb_client):
+        """Test that no wave is sent after a wave with a failed write."""
+        buffer = outcome_stats.OutcomeBuffer()
+        for i in range(5):
+            buffer.record('normal', f'ANSWER {i}', True, 1)
+        keys = []
+
+        def add_counters(client, table_name, key, values):
+            keys.append(key)
+            if key == 'normal#ANSWER 1':
+                raise RuntimeError('Throttled')
+
+        with mock.patch.object(outcome_stats, 'add_counters', side_effect=add_counters):
+            result = buffer.flush(dynamodb_client, max_workers=2)
+
+        assert sorted(keys) == ['normal#ANSWER 0', 'normal#ANSWER 1']
+        assert result == {'written': 1, 'restored': 4}
+        assert buffer.rounds == 4
+
+    def test_failed_write_is_retried(self, dynamodb_client):
+        """Test that a flush stops at a failed write and the next one writes every count."""
+        buffer = outcome_stats.OutcomeBuffer()
+        for answer in ('PARIS', 'ROME', 'OSLO'):
+            buffer.record('normal', answer, True, 1)
+        update_item = dynamodb_client.update_item
+        calls = []
+
+        def failing_update(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise RuntimeError('Throttled')
+            return update_item(**kwargs)
+
+        with mock.patch.object(dynamodb_client, 'update_item', side_effect=failing_update):
+            result = buffer.flush(dynamodb_client, max_workers=1)
+
+        assert result == {'written': 1, 'restored': 2}
+        assert len(calls) == 2
+        assert buffer.rounds == 2
+
+        buffer.record('normal', 'ROME', False, 4)
+        assert buffer.flush(dynamodb_client) == {'written': 2, 'restored': 0}
+        assert stored_counters(dynamodb_client) == {
+            'normal#PARIS': (1, 1, 1), 'normal#ROME': (2, 1, 5), 'normal#OSLO': (1, 1, 1)
+        }
+
+    def test_full_buffer_drops_new_clues(self):
+        """Test that outcomes of new clues are dropped and counted once the buffer is full."""
+        buffer = outcome_stats.OutcomeBuffer(max_clues=2)
+        assert buffer.record('normal', 'PARIS', True, 0)
+        assert buffer.record('normal', 'ROME', True, 0)
+
+        assert not buffer.record('normal', 'OSLO', True, 0)
+        assert buffer.record('normal', 'PARIS', False, 3)
+        assert buffer.dropped == 1
+        assert buffer.rounds == 3
+
+    def test_restore_into_full_buffer_drops(self):
+        """Test that restored counters only come back while there is room for them."""
+        buffer = outcome_stats.OutcomeBuffer(max_clues=1)
+        buffer.record('normal', 'PARIS', True, 0)
+
+        buffer.restore({'normal#PARIS': [2, 1, 3], 'normal#ROME': [4, 0, 9]})
+
+        assert buffer.take() == {'normal#PARIS': [3, 2, 3]}
+        assert buffer.dropped == 4
+
+
+class TestLossBounds:
+    """Test cases for the counts that can be lost when a container shuts down."""
+
+    def test_shutdown_loses_less_than_one_batch(self, dynamodb_client):
+        """Test that a container killed without warning only loses its unflushed rounds."""
+        buffer = outcome_stats.OutcomeBuffer(max_rounds=10, clock=FakeClock())
+        for i in range(25):
+            # One report per round, each followed by the flush check of the handler
+            buffer.record('normal', f'ANSWER {i % 3}', True, 1)
+            if buffer.flush_due():
+                buffer.flush(dynamodb_client)
+
+        stored = sum(plays for plays, _, _ in stored_counters(dynamodb_client).values())
+        assert stored == 20
+        assert buffer.rounds == 5  # Lost if the container is shut down now
+        assert buffer.rounds < 10
+
+    def test_idle_container_flushes_on_next_invocation(self, dynamodb_client):
+        """Test that old rounds are written by the next invocation, whatever it is."""
+        clock = FakeClock()
+        buffer = outcome_stats.OutcomeBuffer(max_age=60, clock=clock)
+        buffer.record('normal', 'PARIS', True, 1)
+
+        clock.now += 600
+        assert buffer.flush_due()
+        buffer.flush(dynamodb_client)
+
+        assert stored_counters(dynamodb_client) == {'normal#PARIS': (1, 1, 1)}
+
+    def test_sigterm_flushes_buffer(self, dynamodb_client, restore_sigterm):
+        """Test that the buffer is written when the runtime announces the shutdown."""
+        buffer = outcome_stats.OutcomeBuffer()
+        buffer.record('normal', 'PARIS', True, 1)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        handler = outcome_stats.install_shutdown_flush(buffer, lambda: dynamodb_client)
+
+        assert signal.getsignal(signal.SIGTERM) is handler
+        with pytest.raises(SystemExit):
+            handler(signal.SIGTERM, None)
+        assert stored_counters(dynamodb_client) == {'normal#PARIS': (1, 1, 1)}
+
+    def test_sigterm_chains_previous_handler(self, restore_sigterm):
+        """Test that an existing SIGTERM handler still runs, and nothing is written for an
+        empty buffer."""
+        previous = mock.Mock()
+        signal.signal(signal.SIGTERM, previous)
+        get_client = mock.Mock()
+
+        handler = outcome_stats.install_shutdown_flush(outcome_stats.OutcomeBuffer(), get_client)
+        handler(signal.SIGTERM, None)
+
+        previous.assert_called_once_with(signal.SIGTERM, None)
+        get_client.assert_not_called()
+
+    def test_sigterm_stays_ignored(self, restore_sigterm):
+        """Test that a process ignoring SIGTERM keeps running after the flush."""
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+        handler = outcome_stats.install_shutdown_flush(outcome_stats.OutcomeBuffer(), mock.Mock())
+
+        handler(signal.SIGTERM, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,281 @@
+"""
+Test Suite: Paced Writer (Hangman Trivia Backend)
+
+Test coverage for paced_writer.py - Throttling-aware batch writes of the bank sync
+"""
+
+import pytest
+import random
+from unittest import mock
+from moto import mock_aws
+import boto3
+from botocore.exceptions import ClientError
+
+# The module to test
+from backend.db_management import paced_writer
+
+PARTITION_KEY = 'answer'
+SECONDARY_KEY = 'clue'
+
+AWS_REGION = 'us-east-1'
+
+def create_table():
+    """Create an empty mock word bank table."""
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    return dynamodb.create_table(
+        TableName='test-table',
+        KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+def throttling_error(operation='BatchWriteItem'):
+    """ClientError as raised by boto3 when DynamoDB throttles a call."""
+    return ClientError(
+        {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Slow down'}},
+        operation,
+    )
+
+def inject_throttling(client, operation, failures):
+    """
+    Make the next `failures` calls of an operation fail with a throttling error before
+    they reach (moto's) DynamoDB.
+
+    Returns:
+        list: Names of the operations that were throttled, appended as they happen
+    """
+    throttled = []
+
+    def throttle(model, **kwargs):
+        if len(throttled) < failures:
+            throttled.append(model.name)
+            http_response = mock.Mock(status_code=400)
+            return http_response, {
+                'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': ''}
+            }
+
+    client.meta.events.register(f'before-call.dynamodb.{operation}', throttle)
+    return throttled
+
+def table_items(table):
+    """Return the entries of a table as {answer: clue}."""
+    return {item[PARTITION_KEY]: item[SECONDARY_KEY] for item in table.scan()['Items']}
+
+
+class TestBackoff:
+    """Test cases for exponential backoff with full jitter."""
+
+    def test_delays_grow_up_to_cap(self):
+        """Test that every delay lies between 0 and the capped exponential bound."""
+        sleeps = []
+        backoff = paced_writer.Backoff(base=0.1, cap=1.0, rng=random.Random(0),
+                                       sleep=sleeps.append)
+
+        for attempt in range(8):
+            backoff.wait(attempt)
+
+        for attempt, delay in enumerate(sleeps):
+            assert 0 <= delay <= min(1.0, 0.1 * 2 ** attempt)
+
+    def test_call_retries_throttling(self):
+        """Test that throttled calls are retried until they succeed."""
+        sleeps = []
+        operation = mock.Mock(side_effect=[throttling_error(), throttling_error(), 'done'])
+        backoff = paced_writer.Backoff(sleep=sleeps.append)
+
+        assert backoff.call(operation, Key={'answer': 'A'}) == 'done'
+        assert operation.call_count == 3
+        assert len(sleeps) == 2
+        operation.assert_called_with(Key={'answer': 'A'})
+
+    def test_call_gives_up(self):
+        """Test that the throttling error is raised after the last attempt."""
+        operation = mock.Mock(side_effect=throttling_error())
+        backoff = paced_writer.Backoff(max_attempts=3, sleep=lambda delay: None)
+
+        with pytest.raises(ClientError):
+            backoff.call(operation)
+        assert operation.call_count == 3
+
+    def test_call_does_not_retry_other_errors(self):
+        """Test that errors other than throttling are raised immediately."""
+        error = ClientError({'Error': {'Code': 'ValidationException'}}, 'PutItem')
+        operation = mock.Mock(side_effect=error)
+        backoff = paced_writer.Backoff(sleep=lambda delay: None)
+
+        with pytest.raises(ClientError):
+            backoff.call(operation)
+        assert operation.call_count == 1
+
+
+class TestRateLimiter:
+    """Test cases for pacing writes to a WCU budget."""
+
+    def test_paces_to_budget(self):
+        """Test that consuming more than the budget waits for the tokens to refill."""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(delay):
+            sleeps.append(delay)
+            now[0] += delay
+
+        limiter = paced_writer.RateLimiter(10, clock=lambda: now[0], sleep=sleep)
+        for _ in range(6):
+            limiter.acquire(5)
+
+        # 30 units at 10 per second, with the first second of tokens available at once
+        assert sum(sleeps) == pytest.approx(2.0)
+
+    def test_adapts_rate(self):
+        """Test that the rate halves on throttling and recovers up to the budget."""
+        limiter = paced_writer.RateLimiter(100, min_units_per_second=10, clock=lambda: 0)
+
+        for _ in range(5):
+            limiter.throttled()
+        assert limiter.rate == 10
+
+        limiter.succeeded()
+        assert limiter.rate == 20
+        for _ in range(20):
+            limiter.succeeded()
+        assert limiter.rate == 100
+
+
+class TestSyncCheckpoint:
+    """Test cases for the progress file of a sync."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that progress is read back for the same list of writes only."""
+        path = str(tmp_path / 'checkpoints' / 'table.json')
+        plan = paced_writer.SyncCheckpoint.plan_id(['A', {'answer': 'B', 'id': 1}])
+        other_plan = paced_writer.SyncCheckpoint.plan_id(['A', {'answer': 'B', 'id': 2}])
+
+        paced_writer.SyncCheckpoint(path, plan).advance(25)
+
+        assert paced_writer.SyncCheckpoint(path, plan).completed == 25
+        assert paced_writer.SyncCheckpoint(path, other_plan).completed == 0
+
+    def test_clear(self, tmp_path):
+        """Test that a cleared checkpoint is gone."""
+        path = str(tmp_path / 'table.json')
+        checkpoint = paced_writer.SyncCheckpoint(path, 'plan')
+        checkpoint.advance(1)
+
+        checkpoint.clear()
+        checkpoint.clear()
+
+        assert not (tmp_path / 'table.json').exists()
+
+
+class TestPacedBatchWriter:
+    """Test cases for the paced batch writer against moto."""
+
+    def test_write_units(self):
+        """Test that items are charged one WCU per started kilobyte."""
+        assert paced_writer.write_units({'PutRequest': {'Item': {'answer': 'A'}}}) == 1
+        assert paced_writer.write_units({'PutRequest': {'Item': {'clue': 'x' * 1500}}}) == 2
+        assert paced_writer.write_units({'DeleteRequest': {'Key': {'answer': 'A'}}}) == 1
+
+    @mock_aws
+    def test_writes_in_batches(self):
+        """Test that puts and deletes are sent 25 per BatchWriteItem call."""
+        table = create_table()
+        table.put_item(Item={PARTITION_KEY: 'OLD', SECONDARY_KEY: 'Old clue'})
+        client = table.meta.client
+
+        with mock.patch.object(client, 'batch_write_item',
+                               wraps=client.batch_write_item) as mock_batch_write:
+            with paced_writer.PacedBatchWriter(table) as batch:
+                batch.delete_item(Key={PARTITION_KEY: 'OLD'})
+                for i in range(59):
+                    batch.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: 'Clue'})
+
+        assert mock_batch_write.call_count == 3
+        assert len(table_items(table)) == 59
+
+    @mock_aws
+    def test_retries_throttled_batches(self):
+        """Test that batches rejected by throttling are retried and slow the writer down."""
+        table = create_table()
+        throttled = inject_throttling(table.meta.client, 'BatchWriteItem', failures=3)
+        sleeps = []
+
+        writer = paced_writer.PacedBatchWriter(table, units_per_second=1000, sleep=sleeps.append)
+        with writer as batch:
+            for i in range(50):
+                batch.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: 'Clue'})
+
+        assert len(throttled) == 3
+        assert len(table_items(table)) == 50
+        assert writer.limiter.rate < 1000
+
+    @mock_aws
+    def test_retries_unprocessed_items(self):
+        """Test that UnprocessedItems are resubmitted until they are written."""
+        table = create_table()
+        client = table.meta.client
+        batch_write_item = client.batch_write_item
+
+        def partially_process(RequestItems):
+            requests = RequestItems['test-table']
+            if len(requests) > 10:
+                batch_write_item(RequestItems={'test-table': requests[:10]})
+                return {'UnprocessedItems': {'test-table': requests[10:]}}
+            return batch_write_item(RequestItems=RequestItems)
+
+        sleeps = []
+        with mock.patch.object(client, 'batch_write_item', side_effect=partially_process):
+            with paced_writer.PacedBatchWriter(table, sleep=sleeps.append) as batch:
+                for i in range(25):
+                    batch.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: 'Clue'})
+
+        assert len(table_items(table)) == 25
+        assert len(sleeps) == 2  # 15, then 5 items were left unprocessed
+
+    @mock_aws
+    def test_gives_up_after_max_attempts(self):
+        """Test that writes that stay throttled fail the sync."""
+        table = create_table()
+        inject_throttling(table.meta.client, 'BatchWriteItem', failures=100)
+        backoff = paced_writer.Backoff(max_attempts=4, sleep=lambda delay: None)
+
+        with pytest.raises(RuntimeError, match='still throttled after 4 attempts'):
+            with paced_writer.PacedBatchWriter(table, backoff=backoff) as batch:
+                batch.put_item(Item={PARTITION_KEY: 'ANSWER', SECONDARY_KEY: 'Clue'})
+
+    @mock_aws
+    def test_other_errors_are_raised(self):
+        """Test that errors other than throttling are not retried."""
+        table = create_table()
+        client = table.meta.client
+        error = ClientError({'Error': {'Code': 'ValidationException'}}, 'BatchWriteItem')
+
+        with mock.patch.object(client, 'batch_write_item', side_effect=error) as mock_write:
+            with pytest.raises(ClientError):
+                with paced_writer.PacedBatchWriter(table) as batch:
+                    batch.put_item(Item={PARTITION_KEY: 'ANSWER', SECONDARY_KEY: 'Clue'})
+
+        assert mock_write.call_count == 1
+
+    @mock_aws
+    def test_resumes_from_checkpoint(self, tmp_path):
+        """Test that writes completed by an earlier attempt are skipped."""
+        table = create_table()
+        checkpoint = paced_writer.SyncCheckpoint(str(tmp_path / 'table.json'), 'plan')
+        checkpoint.advance(25)
+        client = table.meta.client
+
+        with mock.patch.object(client, 'batch_write_item',
+                               wraps=client.batch_write_item) as mock_batch_write:
+            with paced_writer.PacedBatchWriter(table, checkpoint=checkpoint) as batch:
+                for i in range(30):
+                    batch.put_item(Item={PARTITION_KEY: f'ANSWER {i}', SECONDARY_KEY: 'Clue'})
+
+        assert mock_batch_write.call_count == 1
+        assert sorted(table_items(table)) == sorted(f'ANSWER {i}' for i in range(25, 30))
+        assert checkpoint.completed == 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,202 @@
+"""
+Test Suite: Role Credentials (Hangman Trivia Backend)
+
+Test coverage for role_credentials.py - In-process STS assume-role with a credential cache
+"""
+
+import pytest
+import json
+import os
+import stat
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from moto import mock_aws
+import boto3
+
+# The module to test
+from backend.db_management import role_credentials
+
+TEST_AWS_ACCOUNT_ID = '123456789012'
+ROLE_ARN = f'arn:aws:iam::{TEST_AWS_ACCOUNT_ID}:role/PortfolioWebsiteRole'
+
+AWS_REGION = 'us-east-1'
+
+
+def sts_session(*lifetimes):
+    """
+    Mock source session whose STS client returns credentials that expire after each of
+    the given numbers of seconds in turn.
+    """
+    session = mock.Mock()
+    session.client.return_value.assume_role.side_effect = [
+        {'Credentials': {
+            'AccessKeyId': f'KEY{i}',
+            'SecretAccessKey': f'SECRET{i}',
+            'SessionToken': f'TOKEN{i}',
+            'Expiration': datetime.now(timezone.utc) + timedelta(seconds=lifetime),
+        }}
+        for i, lifetime in enumerate(lifetimes)
+    ]
+    return session
+
+
+def file_mode(path):
+    """Permission bits of a file."""
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+class TestRoleCredentialProvider:
+    """Test cases for assuming the role and caching its credentials."""
+
+    @mock_aws
+    def test_assumes_role_and_caches_credentials(self, tmp_path):
+        """Test that credentials from STS are cached for the current user only."""
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path / 'cache'),
+            source_session=boto3.Session(region_name=AWS_REGION),
+        )
+
+        credentials = provider()
+
+        assert set(credentials) == {'access_key', 'secret_key', 'token', 'expiry_time'}
+        with open(provider.cache_path) as file:
+            assert json.load(file) == credentials
+        assert file_mode(provider.cache_path) == 0o600
+        assert file_mode(tmp_path / 'cache') == 0o700
+
+    def test_fresh_cache_skips_sts(self, tmp_path):
+        """Test that a later run reuses cached credentials without calling STS."""
+        first = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600)
+        )
+        credentials = first()
+        source_session = sts_session()
+
+        second = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=source_session
+        )
+
+        assert second() == credentials
+        source_session.client.assert_not_called()
+
+    def test_cache_is_per_role(self, tmp_path):
+        """Test that credentials of one role are never handed out for another."""
+        normal = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600)
+        )
+        other = role_credentials.RoleCredentialProvider(
+            ROLE_ARN.replace('PortfolioWebsiteRole', 'OtherRole'), cache_dir=str(tmp_path),
+            source_session=sts_session(3600),
+        )
+
+        assert normal.cache_path != other.cache_path
+
+    def test_credentials_near_expiry_are_replaced(self, tmp_path):
+        """Test that cached credentials within the refresh margin are not reused."""
+        stale = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(600)
+        )
+        stale()
+
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600)
+        )
+        credentials = provider()
+
+        assert credentials['access_key'] == 'KEY0'
+        assert provider.is_fresh(credentials)
+        with open(provider.cache_path) as file:
+            assert json.load(file) == credentials
+
+    def test_refresh_margin_uses_clock(self, tmp_path):
+        """Test that freshness is judged against the provider's clock."""
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600),
+            clock=lambda: time.time() + 3600 - role_credentials.REFRESH_MARGIN_SECONDS + 1,
+        )
+        credentials = provider()
+
+        assert not provider.is_fresh(credentials)
+
+    @pytest.mark.parametrize('contents', ['not json', '{}', '{"expiry_time": "soon"}', '[]'])
+    def test_unreadable_cache_is_ignored(self, tmp_path, contents):
+        """Test that a damaged cache file only costs an STS call."""
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600)
+        )
+        with open(provider.cache_path, 'w') as file:
+            file.write(contents)
+
+        assert provider()['access_key'] == 'KEY0'
+
+    def test_cache_permissions_are_tightened(self, tmp_path):
+        """Test that a leftover temporary file with wider permissions is not reused as is."""
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=str(tmp_path), source_session=sts_session(3600)
+        )
+        temporary_path = f'{provider.cache_path}.tmp'
+        with open(temporary_path, 'w') as file:
+            file.write('{}')
+        os.chmod(temporary_path, 0o644)
+
+        provider()
+
+        assert file_mode(provider.cache_path) == 0o600
+        assert not os.path.exists(temporary_path)
+
+    def test_without_cache(self):
+        """Test that caching can be switched off."""
+        source_session = sts_session(3600, 3600)
+        provider = role_credentials.RoleCredentialProvider(
+            ROLE_ARN, cache_dir=None, source_session=source_session
+        )
+
+        assert provider()['access_key'] == 'KEY0'
+        assert provider()['access_key'] == 'KEY1'
+
+    @mock.patch('boto3.Session')
+    def test_source_profile_session_is_created_on_demand(self, mock_session, tmp_path):
+        """Test that the source profile is only loaded when STS has to be called."""
+        mock_session.return_value = sts_session(3600)
+        provider = role_credentials.RoleCredentialProvider(ROLE_ARN, cache_dir=str(tmp_path))
+        mock_session.assert_not_called()
+
+        provider()
+
+        mock_session.assert_called_once_with(profile_name='PortfolioWebsiteUser')
+
+
+class TestCreateRoleSession:
+    """Test cases for the boto3 session acting as the role."""
+
+    @mock_aws
+    def test_session_uses_role_credentials(self, tmp_path):
+        """Test that the session's clients are signed with the role's credentials."""
+        environ = dict(os.environ)
+        session = role_credentials.create_role_session(
+            TEST_AWS_ACCOUNT_ID, cache_dir=str(tmp_path),
+            source_session=boto3.Session(region_name=AWS_REGION),
+        )
+
+        identity = session.client('sts').get_caller_identity()
+
+        assert ':assumed-role/PortfolioWebsiteRole/PortfolioWebsiteSession' in identity['Arn']
+        assert session.region_name == AWS_REGION
+        assert dict(os.environ) == environ
+
+    def test_session_refreshes_expiring_credentials(self, tmp_path):
+        """Test that credentials about to expire are refreshed before they are used."""
+        source_session = sts_session(300, 3600)
+        session = role_credentials.create_role_session(
+            TEST_AWS_ACCOUNT_ID, cache_dir=str(tmp_path), source_session=source_session
+        )
+
+        credentials = session.get_credentials().get_frozen_credentials()
+
+        assert credentials.access_key == 'KEY1'
+        assert source_session.client.return_value.assume_role.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,338 @@
+"""
+Test Suite: Clue Sampling (Hangman Trivia Backend)
+
+Test coverage for sampling.py - Random draws of unseen clues from a word bank
+"""
+
+import pytest
+import random
+import tracemalloc
+from collections import Counter
+from decimal import Decimal
+from unittest import mock
+
+# The module to test
+from backend.lambda_function import sampling
+
+@pytest.fixture
+def bank():
+    """Word bank with 100 synthetic clues, where ANSWER i has ID 1000 + i."""
+    return sampling.WordBank(
+        {f'ANSWER {i}': f'Clue {i}' for i in range(100)},
+        {f'ANSWER {i}': 1000 + i for i in range(100)},
+    )
+
+
+class TestWordBank:
+    """Test cases for the word bank and its unseen-clue sampler."""
+
+    def test_answers_and_clues_are_aligned(self, bank):
+        """Test that answers and clues share indices and round-trip to a dict."""
+        assert len(bank) == 100
+        assert 'ANSWER 7' in bank
+        assert bank.clues[bank.answers.index('ANSWER 7')] == 'Clue 7'
+        assert bank.ids[bank.answers.index('ANSWER 7')] == 1007
+        assert bank.to_dict() == {f'ANSWER {i}': f'Clue {i}' for i in range(100)}
+
+    def test_missing_ids_are_none(self):
+        """Test that entries without an assigned ID are marked with None."""
+        bank = sampling.WordBank({'ANSWER 1': 'Clue 1'})
+
+        assert list(bank.ids) == [None]
+
+    def test_canonical_order_and_fingerprint(self):
+        """Test that the canonical order follows IDs and ignores the insertion order."""
+        bank = sampling.WordBank({'B': 'b', 'A': 'a', 'C': 'c'}, {'B': 0, 'C': 1})
+        same = sampling.WordBank({'C': 'c', 'A': 'a', 'B': 'b'}, {'B': 0, 'C': 1})
+        other = sampling.WordBank({'B': 'b', 'A': 'a'}, {'B': 0})
+
+        assert [bank.answers[i] for i in bank.canonical_order] == ['B', 'C', 'A']
+        assert bank.fingerprint == same.fingerprint
+        assert bank.fingerprint != other.fingerprint
+
+    def test_seen_indices_from_answers_and_ids(self, bank):
+        """Test that seen answers and IDs both map to bank indices, ignoring unknowns."""
+        seen = bank.seen_indices(['ANSWER 3', 'OLD ANSWER'], [1005, 1003, 99999])
+
+        assert seen == {bank.answers.index('ANSWER 3'), bank.answers.index('ANSWER 5')}
+
+    def test_seen_indices_with_sparse_ids(self):
+        """Test that IDs too sparse for a position array are mapped all the same."""
+        bank = sampling.WordBank({'A': 'a', 'B': 'b', 'C': 'c'}, {'A': 7, 'B': 10**12})
+
+        assert bank.seen_indices(ids=[10**12, 7, 8]) == {0, 1}
+
+    def test_bank_without_clues(self):
+        """Test that a bank loaded without its clues holds None for every clue."""
+        bank = sampling.WordBank({'A': None, 'B': None})
+
+        assert list(bank.clues) == [None, None]
+        assert bank.to_dict() == {'A': None, 'B': None}
+
+    def test_rejects_partly_missing_clues(self):
+        """Test that a bank where only some clues are None is rejected."""
+        with pytest.raises(ValueError, match='every clue'):
+            sampling.WordBank({'A': 'a', 'B': None})
+
+    def test_sample_unseen_never_returns_seen_answer(self, bank):
+        """Test that draws only ever return unseen answers."""
+        seen = bank.seen_indices([f'ANSWER {i}' for i in range(50)])
+        rng = random.Random(0)
+
+        for _ in range(500):
+            index = bank.sample_unseen(seen, rng)
+            assert index not in seen
+
+    def test_sample_unseen_is_uniform_over_unseen(self, bank):
+        """Test that every unseen answer is drawn with roughly equal frequency."""
+        seen = bank.seen_indices([f'ANSWER {i}' for i in range(90)])
+        rng = random.Random(1)
+
+        counts = Counter(bank.answers[bank.sample_unseen(seen, rng)] for _ in range(5000))
+
+        assert set(counts) == {f'ANSWER {i}' for i in range(90, 100)}
+        assert min(counts.values()) > 350  # 500 expected per answer
+
+    def test_sample_unseen_exhausted(self, bank):
+        """Test that None is returned once every answer has been seen."""
+        seen = bank.seen_indices(list(bank.answers) + ['NOT IN BANK'])
+
+        assert bank.sample_unseen(seen) is None
+
+    def test_sample_unseen_ignores_answers_not_in_bank(self, bank):
+        """Test that stale seen answers do not count towards exhaustion."""
+        seen = bank.seen_indices([f'OLD ANSWER {i}' for i in range(1000)])
+
+        assert bank.sample_unseen(seen) is not None
+
+    def test_sample_unseen_empty_bank(self):
+        """Test that an empty bank has nothing to sample."""
+        assert sampling.WordBank({}).sample_unseen(set()) is None
+
+    def test_sample_unseen_rejection_does_not_scan_bank(self, bank):
+        """Test that a low seen fraction is served by rejection sampling alone."""
+        seen = {0}
+        rng = mock.Mock()
+        rng.randrange.side_effect = [0, 5]
+
+        assert bank.sample_unseen(seen, rng) == 5
+        rng.choice.assert_not_called()
+
+    def test_sample_unseen_falls_back_to_set_difference(self, bank):
+        """Test that a high seen fraction lists the unseen answers explicitly."""
+        seen = set(range(99))
+        rng = mock.Mock()
+        rng.choice.side_effect = lambda options: options[0]
+
+        assert bank.sample_unseen(seen, rng) == 99
+        rng.randrange.assert_not_called()
+        rng.choice.assert_called_once_with([99])
+
+    def test_sample_unseen_many_is_distinct_and_unseen(self, bank):
+        """Test that a batch draw returns distinct unseen entries without mutating seen."""
+        seen = set(range(80))
+
+        indices = bank.sample_unseen_many(seen, 15, random.Random(2))
+
+        assert len(indices) == 15
+        assert len(set(indices)) == 15
+        assert not seen & set(indices)
+        assert seen == set(range(80))
+
+    def test_sample_unseen_many_stops_when_exhausted(self, bank):
+        """Test that a batch draw returns fewer entries once the bank runs out."""
+        indices = bank.sample_unseen_many(set(range(97)), 10)
+
+        assert sorted(indices) == [97, 98, 99]
+
+
+class TestWordBankMemory:
+    """Test cases for the memory held by a cached word bank."""
+
+    SIZE = 100000
+
+    @staticmethod
+    def traced_size(build):
+        """Return the object built by `build` and the memory it holds, per tracemalloc."""
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            built = build()
+            return built, tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+    def scanned_items(self):
+        """Items of a bank of SIZE clues as returned by a DynamoDB scan."""
+        return [
+            {'answer': f'SYNTHETIC ANSWER {i}',
+             'clue': f'Synthetic clue number {i} for the memory test of a word bank',
+             'id': Decimal(i)}
+            for i in range(self.SIZE)
+        ]
+
+    def build_bank(self):
+        """Word bank of the scanned items, with its lazily computed attributes."""
+        bank = sampling.WordBank(
+            {f'SYNTHETIC ANSWER {i}':
+             f'Synthetic clue number {i} for the memory test of a word bank'
+             for i in range(self.SIZE)},
+            {f'SYNTHETIC ANSWER {i}': i for i in range(self.SIZE)},
+        )
+        bank.canonical_order
+        bank.fingerprint
+        return bank
+
+    def test_bank_is_three_times_smaller_than_scanned_items(self):
+        """Test that a bank of 100k clues holds under a third of the memory of its items."""
+        items, items_size = self.traced_size(self.scanned_items)
+        del items
+        bank, bank_size = self.traced_size(self.build_bank)
+
+        assert len(bank) == self.SIZE
+        assert bank.seen_indices(['SYNTHETIC ANSWER 99999'], [5]) == {99999, 5}
+        assert items_size >= 3 * bank_size
+
+
+def alias_probabilities(table):
+    """Exact probability of drawing each index from an alias table."""
+    size = len(table)
+    probabilities = [table.probabilities[i] / size for i in range(size)]
+    for column in range(size):
+        probabilities[table.aliases[column]] += (1 - table.probabilities[column]) / size
+    return probabilities
+
+
+class TestAliasTable:
+    """Test cases for the Walker alias table."""
+
+    @pytest.mark.parametrize('weights', [
+        [1],
+        [1, 1, 1, 1],
+        [1, 2, 3, 4],
+        [1000, 1, 1, 1, 1],
+        [0.001, 5, 0.5, 2.5, 7, 0.1, 3],
+    ])
+    def test_probabilities_match_weights(self, weights):
+        """Test that every index is drawn with probability weight / total weight."""
+        table = sampling.AliasTable(weights)
+
+        assert alias_probabilities(table) == pytest.approx(
+            [weight / sum(weights) for weight in weights]
+        )
+
+    def test_random_weights(self):
+        """Test the construction on a larger table of random weights."""
+        rng = random.Random(3)
+        weights = [rng.expovariate(1) for _ in range(1000)]
+
+        table = sampling.AliasTable(weights)
+
+        assert alias_probabilities(table) == pytest.approx(
+            [weight / sum(weights) for weight in weights]
+        )
+
+    def test_sample_uses_one_random_number(self):
+        """Test that a draw picks a column and keeps it or takes its alias."""
+        table = sampling.AliasTable([1, 3])  # Column 0 keeps 0 with probability 0.5
+        rng = mock.Mock()
+
+        rng.random.return_value = 0.2  # Column 0, coin 0.4
+        assert table.sample(rng) == 0
+        rng.random.return_value = 0.3  # Column 0, coin 0.6
+        assert table.sample(rng) == 1
+        rng.random.return_value = 0.9  # Column 1, always kept
+        assert table.sample(rng) == 1
+        assert rng.random.call_count == 3
+
+    @pytest.mark.parametrize('weights', [[1, 0], [1, -1], [float('inf')], [float('nan')]])
+    def test_rejects_invalid_weights(self, weights):
+        """Test that weights that are not positive and finite are rejected."""
+        with pytest.raises(ValueError):
+            sampling.AliasTable(weights)
+
+
+class TestWeightedSampler:
+    """Test cases for weighted draws of unseen entries."""
+
+    @pytest.fixture
+    def sampler(self, bank):
+        """Sampler where ANSWER i has weight i + 1."""
+        return sampling.WeightedSampler(bank, [i + 1 for i in range(100)])
+
+    def test_weights_must_match_bank(self, bank):
+        """Test that a weight is required for every entry."""
+        with pytest.raises(ValueError, match='Expected 100 weights'):
+            sampling.WeightedSampler(bank, [1, 2])
+
+    def test_sample_unseen_follows_weights(self):
+        """Test that unseen entries are drawn in proportion to their weights."""
+        bank = sampling.WordBank({'A': 'a', 'B': 'b', 'C': 'c', 'D': 'd'})
+        sampler = sampling.WeightedSampler(bank, [1, 2, 7, 100])
+        rng = random.Random(1)
+
+        counts = Counter(sampler.sample_unseen({3}, rng) for _ in range(20000))
+
+        assert 3 not in counts
+        assert counts[0] / 20000 == pytest.approx(0.1, abs=0.02)
+        assert counts[1] / 20000 == pytest.approx(0.2, abs=0.02)
+        assert counts[2] / 20000 == pytest.approx(0.7, abs=0.02)
+
+    def test_sample_unseen_rejection_does_not_scan_bank(self, sampler):
+        """Test that a low seen weight is served by the alias table alone."""
+        rng = mock.Mock()
+        rng.random.side_effect = [0.0, 0.995]  # Column 0, then column 99 (kept)
+
+        assert sampler.sample_unseen({0}, rng) == 99
+        rng.choices.assert_not_called()
+
+    def test_sample_unseen_falls_back_to_weighted_choice(self, sampler):
+        """Test that the unseen entries are listed once every rejection attempt failed."""
+        rng = mock.Mock()
+        rng.random.return_value = 0.995  # Column 99, which always keeps the seen entry
+        rng.choices.side_effect = lambda options, weights: [options[-1]]
+
+        assert sampler.sample_unseen(set(range(2, 100)), rng) == 1
+        assert rng.random.call_count == sampling.MAX_REJECTION_ATTEMPTS
+        rng.choices.assert_called_once_with([0, 1], [1, 2])
+
+    def test_sample_unseen_exhausted(self, sampler):
+        """Test that nothing is drawn once every entry has been seen."""
+        assert sampler.sample_unseen(set(range(100))) is None
+
+    def test_sample_unseen_many_is_distinct_and_unseen(self, sampler):
+        """Test that a batch draw returns distinct unseen entries without mutating seen."""
+        seen = set(range(50, 100))
+
+        indices = sampler.sample_unseen_many(seen, 30, random.Random(4))
+
+        assert len(set(indices)) == 30
+        assert not seen & set(indices)
+        assert seen == set(range(50, 100))
+        assert sorted(sampler.sample_unseen_many(set(range(97)), 10)) == [97, 98, 99]
+
+
+class TestRecencyWeights:
+    """Test cases for favouring newly added entries."""
+
+    def test_newest_entries_are_boosted(self, bank):
+        """Test that the entries with the highest IDs get the boost."""
+        weights = sampling.recency_weights(bank, 0.1, 4)
+
+        assert [bank.ids[i] for i, weight in enumerate(weights) if weight == 4] == list(
+            range(1090, 1100)
+        )
+        assert weights.count(1.0) == 90
+
+    def test_entries_without_ids_are_not_new(self):
+        """Test that entries without an ID keep the base weight."""
+        bank = sampling.WordBank({'A': 'a', 'B': 'b', 'C': 'c'}, {'A': 1, 'B': 2})
+
+        assert sampling.recency_weights(bank, 0.5, 3) == [1.0, 3, 1.0]
+
+    def test_no_new_entries(self, bank):
+        """Test that a fraction too small for a single entry weighs everything equally."""
+        assert sampling.recency_weights(bank, 0.001, 3) == [1.0] * 100
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,77 @@
+"""
+Test Suite: Seen-Set Encoding (Hangman Trivia Backend)
+
+Test coverage for seen_encoding.py - Compact encodings of the clues a player has seen
+"""
+
+import pytest
+import json
+import random
+
+# The module to test
+from backend.lambda_function import seen_encoding
+
+
+class TestSeenEncoding:
+    """Test cases for the bitmap and delta encodings of seen IDs."""
+
+    @pytest.mark.parametrize('ids', [[], [0], [7, 8], [3, 1, 2, 900], list(range(64))])
+    def test_bitmap_round_trip(self, ids):
+        """Test that bitmaps decode to the sorted, de-duplicated IDs."""
+        encoded = seen_encoding.encode_bitmap(ids)
+
+        assert encoded.startswith('bitmap:')
+        assert seen_encoding.decode_seen(encoded) == ([], sorted(set(ids)))
+
+    @pytest.mark.parametrize('ids', [[], [0], [127, 128], [5, 5, 3, 100000], list(range(64))])
+    def test_delta_round_trip(self, ids):
+        """Test that delta lists decode to the sorted, de-duplicated IDs."""
+        encoded = seen_encoding.encode_deltas(ids)
+
+        assert encoded.startswith('delta:')
+        assert seen_encoding.decode_seen(encoded) == ([], sorted(set(ids)))
+
+    def test_delta_encodes_consecutive_ids_in_one_byte_each(self):
+        """Test that runs of consecutive IDs stay compact."""
+        encoded = seen_encoding.encode_deltas(range(300))
+
+        assert seen_encoding._b64decode(encoded[len('delta:'):]) == b'\x01' * 300
+
+    def test_delta_rejects_truncated_varint(self):
+        """Test that a payload ending inside a varint is rejected."""
+        with pytest.raises(ValueError):
+            seen_encoding.decode_seen('delta:' + seen_encoding._b64encode(b'\x01\x80'))
+
+    @pytest.mark.parametrize('seen', [
+        'bitmap:!!!', 'bitmap:A', 'bitmap:AA A', 'bitmap:AAé',
+        'delta:AQ=A', 'delta:AQ\n',
+    ])
+    def test_malformed_payload(self, seen):
+        """Test that payloads outside the base64url alphabet or badly padded are rejected."""
+        with pytest.raises(ValueError, match='not valid base64url'):
+            seen_encoding.decode_seen(seen)
+
+    def test_legacy_answer_list(self):
+        """Test that a list of answers is passed through unchanged."""
+        assert seen_encoding.decode_seen(['PARIS', 'ROME']) == (['PARIS', 'ROME'], [])
+
+    @pytest.mark.parametrize('seen', ['PARIS', 'rle:AAAA', 42, None])
+    def test_unknown_encoding(self, seen):
+        """Test that anything but a list or a prefixed encoding is rejected."""
+        with pytest.raises(ValueError):
+            seen_encoding.decode_seen(seen)
+
+    def test_compact_encodings_are_smaller_than_answer_list(self):
+        """Test that hundreds of seen clues encode far smaller than their answers."""
+        rng = random.Random(0)
+        ids = rng.sample(range(2000), 500)
+        answers = [f'SOME ANSWER {i}' for i in ids]
+
+        legacy_size = len(json.dumps(answers))
+
+        assert len(seen_encoding.encode_bitmap(ids)) * 20 < legacy_size
+        assert len(seen_encoding.encode_deltas(ids)) * 10 < legacy_size
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
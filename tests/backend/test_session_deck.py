@@ -0,0 +1,119 @@
+"""
+Test Suite: Session Decks (Hangman Trivia Backend)
+
+Test coverage for session_deck.py - Per-player shuffled decks dealt from session tokens
+"""
+
+import pytest
+import random
+
+# The module to test
+from backend.lambda_function import session_deck
+from backend.lambda_function.sampling import WordBank
+
+@pytest.fixture
+def bank():
+    """Word bank with 50 synthetic clues and IDs."""
+    return WordBank(
+        {f'ANSWER {i}': f'Clue {i}' for i in range(50)},
+        {f'ANSWER {i}': i for i in range(50)},
+    )
+
+
+class TestSessionDeck:
+    """Test cases for permutations, session tokens and dealing."""
+
+    @pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100, 1000])
+    def test_permute_is_a_bijection(self, size):
+        """Test that every deck position maps to a distinct bank position."""
+        positions = [session_deck.permute(i, size, 12345) for i in range(size)]
+
+        assert sorted(positions) == list(range(size))
+
+    def test_permute_depends_on_seed(self):
+        """Test that different seeds shuffle differently."""
+        first = [session_deck.permute(i, 100, 1) for i in range(100)]
+        second = [session_deck.permute(i, 100, 2) for i in range(100)]
+
+        assert first != second
+        assert first != list(range(100))
+
+    def test_token_round_trip(self):
+        """Test that a token decodes to the state it was encoded from."""
+        token = session_deck.encode_token(2**64 - 1, 123456, 42)
+
+        assert session_deck.decode_token(token) == (2**64 - 1, 123456, 42)
+
+    @pytest.mark.parametrize('token', ['', 'not a token!', 'AAAA', 'A' * 200])
+    def test_malformed_token(self, token):
+        """Test that malformed tokens decode to None."""
+        assert session_deck.decode_token(token) is None
+
+    def test_unknown_token_format(self):
+        """Test that tokens of another format version are rejected."""
+        token = session_deck.encode_token(1, 2, 3)
+        data = bytearray(session_deck.base64.urlsafe_b64decode(token + '=='))
+        data[0] = 99
+        other = session_deck.base64.urlsafe_b64encode(bytes(data)).decode('ascii')
+
+        assert session_deck.decode_token(other) is None
+
+    def test_deal_whole_deck_once(self, bank):
+        """Test that following the tokens deals every clue exactly once, then nothing."""
+        dealt = []
+        indices, token, reset = session_deck.deal(bank, None, rng=random.Random(0))
+        assert not reset
+        dealt.extend(indices)
+        while True:
+            indices, token, reset = session_deck.deal(bank, token, count=7)
+            assert not reset
+            if not indices:
+                break
+            dealt.extend(indices)
+
+        assert sorted(dealt) == list(range(50))
+
+    def test_deal_skips_seen(self, bank):
+        """Test that explicitly seen entries are skipped while dealing."""
+        seen = set(range(49))
+
+        indices, _, _ = session_deck.deal(bank, None, count=5, seen=seen)
+
+        assert indices == [49]
+
+    def test_deal_resets_after_bank_change(self, bank):
+        """Test that a token issued for another version of the bank starts a new deck."""
+        _, token, _ = session_deck.deal(bank, None, count=10)
+        changed_bank = WordBank({**bank.to_dict(), 'NEW ANSWER': 'New clue'},
+                                {**{a: i for i, a in enumerate(bank.answers)}, 'NEW ANSWER': 50})
+
+        indices, new_token, reset = session_deck.deal(changed_bank, token)
+
+        assert reset
+        assert len(indices) == 1
+        assert session_deck.decode_token(new_token)[1] == changed_bank.fingerprint
+        assert session_deck.decode_token(new_token)[2] == 1
+
+    def test_deal_resets_on_malformed_token(self, bank):
+        """Test that a malformed token starts a new deck."""
+        indices, _, reset = session_deck.deal(bank, 'garbage')
+
+        assert reset
+        assert len(indices) == 1
+
+    def test_deal_is_deterministic_across_scan_orders(self, bank):
+        """Test that the same token deals the same clue from differently ordered banks."""
+        reordered = WordBank(
+            dict(reversed(list(bank.to_dict().items()))),
+            {answer: entry_id for answer, entry_id in zip(bank.answers, bank.ids)},
+        )
+        _, token, _ = session_deck.deal(bank, None, count=3)
+
+        first, _, _ = session_deck.deal(bank, token)
+        second, _, _ = session_deck.deal(reordered, token)
+
+        assert bank.answers[first[0]] == reordered.answers[second[0]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,126 @@
+"""
+Test Suite: Compact Word Bank Columns (Hangman Trivia Backend)
+
+Test coverage for string_pool.py - Read-only columns stored in flat buffers
+"""
+
+import pytest
+
+# The module to test
+from backend.lambda_function.string_pool import IdColumn, NoneColumn, StringPool
+
+STRINGS = ['PARIS', 'ROME', 'SÃO PAULO', '', 'ZÜRICH', '東京']
+
+
+class TestStringPool:
+    """Test cases for the UTF-8 string pool and its hash index."""
+
+    def test_round_trips_strings(self):
+        """Test that every string, including non-ASCII and empty ones, reads back."""
+        pool = StringPool(STRINGS)
+
+        assert len(pool) == len(STRINGS)
+        assert list(pool) == STRINGS
+        assert pool[-1] == '東京'
+        assert pool[1:5:2] == ['ROME', '']
+
+    @pytest.mark.parametrize('position', [6, -7])
+    def test_out_of_range(self, position):
+        """Test that positions outside the pool raise IndexError."""
+        with pytest.raises(IndexError):
+            StringPool(STRINGS)[position]
+
+    def test_find_uses_index(self):
+        """Test that an indexed pool finds every string and nothing else."""
+        pool = StringPool(STRINGS, indexed=True)
+
+        assert [pool.find(string) for string in STRINGS] == list(range(len(STRINGS)))
+        assert pool.find('OSLO') is None
+        assert pool.find('PARI') is None
+
+    def test_find_without_index(self):
+        """Test that an unindexed pool finds strings by scanning it."""
+        pool = StringPool(STRINGS + ['ROME'])
+
+        assert [pool.find(string) for string in STRINGS] == list(range(len(STRINGS)))
+        assert pool.find('ROME') == 1
+        assert pool.find('OSLO') is None
+
+    def test_find_with_colliding_slots(self):
+        """Test that strings sharing an index slot are all found by probing."""
+        strings = [f'ANSWER {i}' for i in range(1000)]
+        pool = StringPool(strings, indexed=True)
+
+        assert all(pool.find(string) == i for i, string in enumerate(strings))
+        assert pool.find('ANSWER 1000') is None
+
+    @pytest.mark.parametrize('indexed', [True, False])
+    def test_index_and_contains(self, indexed):
+        """Test that index() and `in` behave like a list, with or without the index."""
+        pool = StringPool(STRINGS, indexed=indexed)
+
+        assert pool.index('ZÜRICH') == 4
+        assert pool.index('ROME', 1, 3) == 1
+        assert 'SÃO PAULO' in pool
+        assert 'OSLO' not in pool
+        assert 42 not in pool
+        with pytest.raises(ValueError):
+            pool.index('OSLO')
+        with pytest.raises(ValueError):
+            pool.index(42)
+        with pytest.raises(ValueError):
+            pool.index('PARIS', 1)
+
+    def test_empty_pool(self):
+        """Test that an empty pool has no strings and finds nothing."""
+        pool = StringPool([], indexed=True)
+
+        assert len(pool) == 0
+        assert list(pool) == []
+        assert pool.find('PARIS') is None
+
+
+class TestIdColumn:
+    """Test cases for the column of optional IDs."""
+
+    def test_round_trips_ids(self):
+        """Test that IDs and missing IDs read back, and max() ignores missing IDs."""
+        column = IdColumn([3, None, 0, 2**40])
+
+        assert list(column) == [3, None, 0, 2**40]
+        assert column[-3] is None
+        assert column[1:] == [None, 0, 2**40]
+        assert column.max() == 2**40
+
+    def test_max_without_ids(self):
+        """Test that a column without any ID has no maximum."""
+        assert IdColumn([None, None]).max() is None
+        assert IdColumn([]).max() is None
+
+    def test_rejects_negative_ids(self):
+        """Test that negative IDs, which would read back as None, are rejected."""
+        with pytest.raises(ValueError, match='non-negative'):
+            IdColumn([1, -1])
+
+
+class TestNoneColumn:
+    """Test cases for the column of missing clues."""
+
+    def test_reads_none(self):
+        """Test that every position, slice and iteration reads None."""
+        column = NoneColumn(3)
+
+        assert len(column) == 3
+        assert list(column) == [None, None, None]
+        assert column[-3] is None
+        assert column[1:] == [None, None]
+
+    @pytest.mark.parametrize('position', [3, -4])
+    def test_out_of_range(self, position):
+        """Test that positions outside the column raise IndexError."""
+        with pytest.raises(IndexError):
+            NoneColumn(3)[position]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,295 @@
+"""
+Test Suite: Validate Word Bank (Hangman Trivia Backend)
+
+Test coverage for validate_word_bank.py - Clue writing rules checked before a sync
+"""
+
+import pytest
+import random
+import string
+
+# The module to test
+from backend.db_management import validate_word_bank
+
+
+def write_bank_file(path, source):
+    """Write a word bank module with the given source and return its path."""
+    path.write_text(source, encoding='utf-8')
+    return str(path)
+
+def entries(bank, bank_name='normal'):
+    """Entries of a {answer: clue} bank in the format of validate_entries()."""
+    return [(bank_name, f'{bank_name}:{i}', answer, clue)
+            for i, (answer, clue) in enumerate(bank.items())]
+
+
+class TestReadBankFile:
+    """Test cases for reading word bank files without importing them."""
+
+    def test_reads_entries_with_line_numbers(self, tmp_path):
+        """Test that entries are read in order with the line they are defined on."""
+        path = write_bank_file(tmp_path / 'word_bank_test.py', (
+            '# Comment\n'
+            'bank = {\n'
+            "    'PARIS': 'Capital of France',\n"
+            "    'ROME': 'Capital of Italy',\n"
+            '}\n'
+        ))
+
+        assert validate_word_bank.read_bank_file(path) == [
+            (3, 'PARIS', 'Capital of France'), (4, 'ROME', 'Capital of Italy')
+        ]
+
+    def test_keeps_duplicate_keys(self, tmp_path):
+        """Test that a repeated key, which a dict literal silently drops, is kept."""
+        path = write_bank_file(tmp_path / 'word_bank_test.py',
+                               "bank = {'PARIS': 'First', 'PARIS': 'Second'}\n")
+
+        assert [entry[1] for entry in validate_word_bank.read_bank_file(path)] == [
+            'PARIS', 'PARIS'
+        ]
+
+    @pytest.mark.parametrize('source', [
+        'words = {}\n',
+        'bank = dict()\n',
+        "bank = {'PARIS': CLUE}\n",
+    ])
+    def test_rejects_unexpected_source(self, tmp_path, source):
+        """Test that files without a dict literal of strings are rejected."""
+        path = write_bank_file(tmp_path / 'word_bank_test.py', source)
+
+        with pytest.raises(ValueError):
+            validate_word_bank.read_bank_file(path)
+
+    def test_validate_word_bank_files(self, tmp_path):
+        """Test that problems in bank files are reported with file and line."""
+        normal = write_bank_file(tmp_path / 'word_bank_normal.py',
+                                 "bank = {\n    'ABC': 'Too short',\n}\n")
+        drunk = write_bank_file(tmp_path / 'word_bank_drunk.py',
+                                "bank = {\n    'ABC': 'Fine when drunk',\n}\n")
+
+        report = validate_word_bank.validate_word_bank_files({'normal': normal, 'drunk': drunk})
+
+        assert len(report['errors']) == 1
+        assert report['errors'][0].startswith("word_bank_normal.py:2: 'ABC':")
+        assert report['warnings'] == [
+            "word_bank_drunk.py:2: 'ABC' duplicates 'ABC' (word_bank_normal.py:2)"
+        ]
+
+    def test_shipped_banks_are_valid(self):
+        """Test that the word banks in the repository pass validation."""
+        report = validate_word_bank.validate_word_bank_files()
+
+        assert report['errors'] == []
+
+
+class TestReadEntryFiles:
+    """Test cases for streaming CSV and JSON Lines word bank files."""
+
+    def test_reads_csv_with_header(self, tmp_path):
+        """Test that CSV rows are read lazily, skipping the header and blank lines."""
+        path = write_bank_file(tmp_path / 'bank.csv', (
+            'answer,clue\n'
+            'PARIS,Capital of France\n'
+            '\n'
+            '"ROME, ITALY","Capital with a ""quoted"" clue"\n'
+        ))
+
+        rows = validate_word_bank.read_entries(path)
+
+        assert not isinstance(rows, list)
+        assert list(rows) == [
+            (2, 'PARIS', 'Capital of France'),
+            (4, 'ROME, ITALY', 'Capital with a "quoted" clue'),
+        ]
+
+    def test_reads_csv_without_header(self, tmp_path):
+        """Test that a first row that is not a header is read as an entry."""
+        path = write_bank_file(tmp_path / 'bank.csv', 'PARIS,Capital of France\n')
+
+        assert list(validate_word_bank.read_entries(path)) == [(1, 'PARIS', 'Capital of France')]
+
+    def test_reads_jsonl(self, tmp_path):
+        """Test that JSON Lines objects are read with their line number."""
+        path = write_bank_file(tmp_path / 'bank.jsonl', (
+            '{"answer": "PARIS", "clue": "Capital of France"}\n'
+            '\n'
+            '{"clue": "Capital of Italy", "answer": "ROME", "source": "atlas"}\n'
+        ))
+
+        assert list(validate_word_bank.read_entries(path)) == [
+            (1, 'PARIS', 'Capital of France'), (3, 'ROME', 'Capital of Italy')
+        ]
+
+    @pytest.mark.parametrize('name, source, message', [
+        ('bank.csv', 'PARIS,Capital,France\n', r'bank\.csv:1: expected 2 fields'),
+        ('bank.jsonl', '{"answer": "PARIS"\n', r'bank\.jsonl:1: invalid JSON'),
+        ('bank.jsonl', '["PARIS", "Capital"]\n', r'bank\.jsonl:1: expected an object'),
+        ('bank.jsonl', '{"answer": "PARIS", "clue": 1}\n', r'bank\.jsonl:1: expected an object'),
+        ('bank.txt', 'PARIS\n', 'unsupported word bank format'),
+    ])
+    def test_rejects_malformed_files(self, tmp_path, name, source, message):
+        """Test that malformed rows and unknown formats are rejected with their location."""
+        path = write_bank_file(tmp_path / name, source)
+
+        with pytest.raises(ValueError, match=message):
+            list(validate_word_bank.read_entries(path))
+
+    def test_validate_mixed_formats(self, tmp_path):
+        """Test that banks in different formats are validated together."""
+        normal = write_bank_file(tmp_path / 'word_bank_normal.py',
+                                 "bank = {\n    'PARIS': 'Capital of France',\n}\n")
+        hard = write_bank_file(tmp_path / 'hard.csv', 'ABC,Too short\nPARIS,Again\n')
+
+        report = validate_word_bank.validate_word_bank_files({'normal': normal, 'hard': hard})
+
+        assert len(report['errors']) == 1
+        assert report['errors'][0].startswith("hard.csv:1: 'ABC':")
+        assert report['warnings'] == [
+            "hard.csv:2: 'PARIS' duplicates 'PARIS' (word_bank_normal.py:2)"
+        ]
+
+
+class TestCheckEntry:
+    """Test cases for the rules applied to single entries."""
+
+    def test_valid_entry(self):
+        """Test that an entry following every rule has no problems."""
+        assert validate_word_bank.check_entry('EIFFEL TOWER', 'Landmark in Paris') == []
+
+    @pytest.mark.parametrize('answer, problem', [
+        ('ABC', 'answer has 3 letters'),
+        ('ABCDEFGHIJ KLMNOPQRST U', 'answer has 21 letters'),
+        ('AAAA BBBB', 'fewer than 3 unique letters'),
+        ('EXTRAORDINARILY', 'words longer than 12 characters: EXTRAORDINARILY'),
+        ('#VERSION', "reserved prefix '#'"),
+    ])
+    def test_broken_rules(self, answer, problem):
+        """Test that each broken rule is reported."""
+        problems = validate_word_bank.check_entry(answer, 'Clue')
+
+        assert any(problem in reported for reported in problems)
+
+    def test_only_letters_count_towards_length(self):
+        """Test that digits, spaces and symbols are not counted as letters."""
+        assert validate_word_bank.check_entry('R2-D2', 'Droid') != []
+        assert validate_word_bank.check_entry('BLINK-182', 'Band') == []
+
+    def test_empty_clue(self):
+        """Test that an empty clue is reported."""
+        assert validate_word_bank.check_entry('PARIS', '  ') == ['clue is empty']
+
+    def test_length_rules_can_be_skipped(self):
+        """Test that exempt banks may use answers of any length."""
+        assert validate_word_bank.check_entry('OK', 'Clue', length_rules=False) == []
+
+
+class TestValidateEntries:
+    """Test cases for the checks across entries and banks."""
+
+    def test_rule_breaks_are_errors_with_location(self):
+        """Test that rule breaks are reported as errors with their location."""
+        report = validate_word_bank.validate_entries(entries({'ABC': 'Clue'}))
+
+        assert len(report['errors']) == 1
+        assert report['errors'][0].startswith("normal:0: 'ABC':")
+
+    def test_drunk_bank_is_exempt_from_length_rules(self):
+        """Test that the Drunk bank may break the length rules."""
+        report = validate_word_bank.validate_entries(entries({'ABC': 'Clue'}, 'drunk'))
+
+        assert report == {'errors': [], 'warnings': []}
+
+    def test_duplicate_in_same_bank_is_error(self):
+        """Test that answers with the same letters in one bank are errors."""
+        report = validate_word_bank.validate_entries(
+            entries({'SPIDER-MAN': 'Hero', 'SPIDERMAN': 'Hero again'})
+        )
+
+        assert report['errors'] == ["normal:1: 'SPIDERMAN' duplicates 'SPIDER-MAN' (normal:0)"]
+
+    def test_duplicate_across_banks_is_warning(self):
+        """Test that an answer repeated in another bank is only a warning."""
+        report = validate_word_bank.validate_entries(
+            entries({'PARIS': 'Capital of France'})
+            + entries({'PARIS': 'City of Light'}, 'hard')
+        )
+
+        assert report['errors'] == []
+        assert report['warnings'] == ["hard:0: 'PARIS' duplicates 'PARIS' (normal:0)"]
+
+    @pytest.mark.parametrize('first, second', [
+        ('MISSISSIPPI', 'MISSISIPPI'),    # deleted letter
+        ('MISSISIPPI', 'MISSISSIPPI'),    # inserted letter
+        ('CHARLEMAGNE', 'CHARLEMAGNA'),   # substituted letter
+        ('CHARLEMAGNE', 'CHARLEMANGE'),   # swapped letters
+    ])
+    def test_near_duplicates_are_warnings(self, first, second):
+        """Test that answers one typo apart are reported once."""
+        report = validate_word_bank.validate_entries(
+            entries({first: 'Clue'}) + entries({second: 'Clue'}, 'hard')
+        )
+
+        assert report['errors'] == []
+        assert report['warnings'] == [f"hard:0: {second!r} is close to {first!r} (normal:0)"]
+
+    def test_short_answers_are_not_near_duplicates(self):
+        """Test that short answers differing by one letter are not reported."""
+        report = validate_word_bank.validate_entries(entries({'PARIS': 'A', 'PARTS': 'B'}))
+
+        assert report == {'errors': [], 'warnings': []}
+
+    def test_distinct_answers_are_not_near_duplicates(self):
+        """Test that answers two edits apart are not reported."""
+        report = validate_word_bank.validate_entries(
+            entries({'CHARLEMAGNE': 'A', 'CHARLESTONE': 'B'})
+        )
+
+        assert report['warnings'] == []
+
+    def test_every_match_of_a_shared_key_is_reported(self):
+        """Test that an answer close to several earlier answers is reported for each."""
+        report = validate_word_bank.validate_entries(
+            entries({'MISSISSIPPI': 'A', 'MISSISSIPPX': 'B', 'MISSISSIPPY': 'C'})
+        )
+
+        assert len(report['warnings']) == 3
+
+    def test_near_duplicates_can_be_skipped(self):
+        """Test that the near-duplicate search can be switched off, but not duplicates."""
+        report = validate_word_bank.validate_entries(
+            entries({'MISSISSIPPI': 'A', 'MISSISSIPPX': 'B', 'MISSIS-SIPPI': 'C'}),
+            near_duplicates=False,
+        )
+
+        assert report['errors'] == ["normal:2: 'MISSIS-SIPPI' duplicates 'MISSISSIPPI' (normal:0)"]
+        assert report['warnings'] == []
+
+    def test_large_bank(self):
+        """Test that a large bank is validated in one pass."""
+        rng = random.Random(0)
+        bank = {}
+        while len(bank) < 20000:
+            answer = ''.join(rng.choice(string.ascii_uppercase) for _ in range(10))
+            bank[answer] = 'Clue'
+
+        report = validate_word_bank.validate_entries(entries(bank))
+
+        assert report['errors'] == []
+
+
+class TestPrintReport:
+    """Test cases for printing validation reports."""
+
+    def test_print_report(self, capsys):
+        """Test that every message and a summary are printed."""
+        validate_word_bank.print_report({'errors': ['bad'], 'warnings': ['odd', 'odd']})
+
+        output = capsys.readouterr().out
+        assert 'ERROR   bad' in output
+        assert 'WARNING odd' in output
+        assert 'Word bank validation: 1 errors, 2 warnings' in output
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
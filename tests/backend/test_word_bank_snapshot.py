@@ -0,0 +1,51 @@
+"""
+Test Suite: Word Bank Snapshot (Hangman Trivia Backend)
+
+Test coverage for word_bank_snapshot.py - Versioned snapshot files of the word banks
+"""
+
+import pytest
+import json
+
+# The module to test
+from backend.common import word_bank_snapshot
+
+TABLE_NAME_NORMAL = 'hangmantrivia-wordbank-normal'
+
+
+class TestWordBankSnapshot:
+    """Test cases for writing and reading snapshot files."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a dumped snapshot loads back column-wise, sorted by ID."""
+        path = tmp_path / 'snapshot.json'
+        banks = {
+            TABLE_NAME_NORMAL: {
+                'version': 4,
+                'entries': [(2, 'ROME', 'Capital of Italy'), (0, 'PARIS', 'Capital of France')],
+            },
+        }
+
+        word_bank_snapshot.dump_snapshot(banks, str(path))
+
+        assert word_bank_snapshot.load_snapshot(str(path)) == {
+            TABLE_NAME_NORMAL: {
+                'version': 4,
+                'ids': [0, 2],
+                'answers': ['PARIS', 'ROME'],
+                'clues': ['Capital of France', 'Capital of Italy'],
+            },
+        }
+        assert not (tmp_path / 'snapshot.json.tmp').exists()
+
+    def test_unsupported_format(self, tmp_path):
+        """Test that snapshots of another format version are rejected."""
+        path = tmp_path / 'snapshot.json'
+        path.write_text(json.dumps({'format': 99, 'banks': {}}))
+
+        with pytest.raises(ValueError, match='Unsupported'):
+            word_bank_snapshot.load_snapshot(str(path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
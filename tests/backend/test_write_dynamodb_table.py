@@ -7,15 +7,16 @@ Test coverage for write_dynamodb_table.py - Database management script
 import pytest
 import json
 import os
-import subprocess
 from unittest import mock
 from moto import mock_aws
 import boto3
+from botocore.exceptions import ClientError
 
 TEST_AWS_ACCOUNT_ID = '123456789012'
 # Patch the environment variable before importing the module
 with mock.patch.dict(os.environ, {'AWS_ACCOUNT_ID': TEST_AWS_ACCOUNT_ID}):
     from backend.db_management import write_dynamodb_table
+from backend.common import word_bank_snapshot
 
 TABLE_NAME_NORMAL = 'hangmantrivia-wordbank-normal'
 TABLE_NAME_HARD = 'hangmantrivia-wordbank-hard'
@@ -24,72 +25,30 @@ TABLE_NAME_DRUNK = 'hangmantrivia-wordbank-drunk'
 PARTITION_KEY = 'answer'
 SECONDARY_KEY = 'clue'
 
+VERSION_KEY = '#VERSION'
+
 AWS_REGION = 'us-east-1'
 
-TEST_KEY_ID = 'test-key-id'
-TEST_SECRET_KEY = 'test-secret-key'
-TEST_SESSION_TOKEN = 'test-session-token'
+
+def lettered_answer(i):
+    """Answer whose letters are unique to `i`, as validation compares answers by letters."""
+    return 'ANSWER ' + ''.join(chr(ord('A') + int(digit)) for digit in f'{i:02d}')
+
 
 class TestWriteDynamoDBTable:
     """Test cases for the database management script."""
 
-    @mock.patch('subprocess.run')
-    def test_get_temporary_credentials_success(self, mock_subprocess):
-        """Test successful credential assumption."""
-        # Mock subprocess response
-        mock_result = mock.Mock()
-        mock_result.stdout = json.dumps({
-            'Credentials': {
-                'AccessKeyId': TEST_KEY_ID,
-                'SecretAccessKey': TEST_SECRET_KEY,
-                'SessionToken': TEST_SESSION_TOKEN
-            }
-        })
-        mock_subprocess.return_value = mock_result
-
-        # Mock environment variable
-        with mock.patch.dict(os.environ, {'AWS_ACCOUNT_ID': TEST_AWS_ACCOUNT_ID}):
-            write_dynamodb_table.get_temporary_credentials()
-
-            # Verify subprocess was called once with correct parameters
-            mock_subprocess.assert_called_once()
-
-            # Verify environment variables were set correctly
-            assert os.environ['AWS_ACCESS_KEY_ID'] == TEST_KEY_ID
-            assert os.environ['AWS_SECRET_ACCESS_KEY'] == TEST_SECRET_KEY
-            assert os.environ['AWS_SESSION_TOKEN'] == TEST_SESSION_TOKEN
-
-    @mock.patch('subprocess.run')
-    def test_get_temporary_credentials_failure(self, mock_subprocess):
-        """Test handling of credential assumption failure."""
-        mock_subprocess.side_effect = subprocess.CalledProcessError(1, 'aws sts assume-role')
-
-        with mock.patch.dict(os.environ, {'AWS_ACCOUNT_ID': TEST_AWS_ACCOUNT_ID}):
-            with pytest.raises(subprocess.CalledProcessError):
-                write_dynamodb_table.get_temporary_credentials()
-
-    def test_remove_temporary_credentials(self):
-        """Test removal of temporary credentials from environment."""
-        # Set up environment variables
-        os.environ['AWS_ACCESS_KEY_ID'] = 'test-key'
-        os.environ['AWS_SECRET_ACCESS_KEY'] = 'test-secret'
-        os.environ['AWS_SESSION_TOKEN'] = 'test-token'
-
-        write_dynamodb_table.remove_temporary_credentials()
-
-        # Verify environment variables were removed
-        assert 'AWS_ACCESS_KEY_ID' not in os.environ
-        assert 'AWS_SECRET_ACCESS_KEY' not in os.environ
-        assert 'AWS_SESSION_TOKEN' not in os.environ
-
-    def test_remove_temporary_credentials_missing_vars(self):
-        """Test that removing non-existent credentials doesn't cause errors."""
-        # Ensure variables don't exist
-        for var in ['AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN']:
-            os.environ.pop(var, None)
-
-        # Should not raise an exception
-        write_dynamodb_table.remove_temporary_credentials()
+    @mock.patch('backend.db_management.write_dynamodb_table.create_role_session')
+    def test_get_role_session(self, mock_create_session):
+        """Test that the role of the configured account is assumed without touching the
+        environment."""
+        environ = dict(os.environ)
+
+        session = write_dynamodb_table.get_role_session()
+
+        mock_create_session.assert_called_once_with(TEST_AWS_ACCOUNT_ID)
+        assert session is mock_create_session.return_value
+        assert dict(os.environ) == environ
 
     @mock_aws
     def test_update_table_add_new_items(self):
@@ -110,7 +69,7 @@ class TestWriteDynamoDBTable:
 
         # Verify items were added
         response = table.scan()
-        items = response['Items']
+        items = [item for item in response['Items'] if not item[PARTITION_KEY].startswith('#')]
         assert len(items) == 2
 
         answers = {item[PARTITION_KEY] for item in items}
@@ -139,7 +98,7 @@ class TestWriteDynamoDBTable:
 
         # Verify ANSWER 2 was removed, ANSWER 1 remains
         response = table.scan()
-        items = response['Items']
+        items = [item for item in response['Items'] if not item[PARTITION_KEY].startswith('#')]
         assert len(items) == 1
         assert items[0][PARTITION_KEY] == 'ANSWER 1'
 
@@ -167,16 +126,531 @@ class TestWriteDynamoDBTable:
         response = table.get_item(Key={PARTITION_KEY: 'ANSWER 1'})
         assert response['Item'][SECONDARY_KEY] == 'New clue'
 
-    @mock.patch('backend.db_management.write_dynamodb_table.get_temporary_credentials')
-    @mock.patch('backend.db_management.write_dynamodb_table.remove_temporary_credentials')
+    @mock_aws
+    def test_update_table_bumps_version(self):
+        """Test that every sync with changes increments the table version item."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+        write_dynamodb_table.update_table({'ANSWER 1': 'Clue 1'}, table)
+        write_dynamodb_table.update_table({'ANSWER 1': 'New clue'}, table)
+
+        response = table.get_item(Key={PARTITION_KEY: VERSION_KEY})
+        assert response['Item']['version'] == 2
+
+    @mock_aws
+    def test_update_table_unchanged_bank_writes_nothing(self):
+        """Test that syncing an unchanged bank neither writes items nor bumps the version."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        bank = {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'}
+        write_dynamodb_table.update_table(bank, table)
+
+        with mock.patch.object(table.meta.client, 'batch_write_item') as mock_batch_write:
+            diff = write_dynamodb_table.update_table(bank, table)
+
+        mock_batch_write.assert_not_called()
+        assert diff == {'added': {}, 'changed': {}, 'removed': []}
+        response = table.get_item(Key={PARTITION_KEY: VERSION_KEY})
+        assert response['Item']['version'] == 1
+
+    @mock_aws
+    def test_update_table_writes_only_diff_in_batches(self):
+        """Test that only added, changed and removed items are written, 25 per batch."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        bank = {f'ANSWER {i}': f'Clue {i}' for i in range(100)}
+        write_dynamodb_table.update_table(bank, table)
+
+        new_bank = dict(bank)
+        new_bank.update({f'NEW ANSWER {i}': f'New clue {i}' for i in range(20)})
+        new_bank.update({f'ANSWER {i}': f'Changed clue {i}' for i in range(10)})
+        for i in range(90, 100):
+            del new_bank[f'ANSWER {i}']
+
+        client = table.meta.client
+        with mock.patch.object(client, 'batch_write_item',
+                               wraps=client.batch_write_item) as mock_batch_write:
+            diff = write_dynamodb_table.update_table(new_bank, table)
+
+        assert len(diff['added']) == 20
+        assert len(diff['changed']) == 10
+        assert len(diff['removed']) == 10
+        assert mock_batch_write.call_count == 2  # 40 requests in batches of 25
+
+        items = {
+            item[PARTITION_KEY]: item[SECONDARY_KEY]
+            for item in table.scan()['Items'] if not item[PARTITION_KEY].startswith('#')
+        }
+        assert items == new_bank
+
+    @mock_aws
+    def test_update_table_dry_run(self, capsys):
+        """Test that a dry run prints the diff without touching the table."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 1', SECONDARY_KEY: 'Old clue'})
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 2', SECONDARY_KEY: 'Clue 2'})
+
+        bank = {'ANSWER 1': 'New clue', 'ANSWER 3': 'Clue 3'}
+        write_dynamodb_table.update_table(bank, table, dry_run=True)
+
+        output = capsys.readouterr().out
+        assert '[dry run] test-table: 1 added, 1 changed, 1 removed' in output
+        assert '+ ANSWER 3' in output
+        assert '~ ANSWER 1' in output
+        assert '- ANSWER 2' in output
+
+        items = {item[PARTITION_KEY]: item[SECONDARY_KEY] for item in table.scan()['Items']}
+        assert items == {'ANSWER 1': 'Old clue', 'ANSWER 2': 'Clue 2'}
+
+    @mock_aws
+    def test_update_table_assigns_stable_ids(self):
+        """Test that entries keep their IDs and removed IDs are never reused."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        # Written before IDs existed, so it should be given one
+        table.put_item(Item={PARTITION_KEY: 'LEGACY', SECONDARY_KEY: 'Legacy clue'})
+
+        write_dynamodb_table.update_table(
+            {'LEGACY': 'Legacy clue', 'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'}, table
+        )
+        first_ids = {item[PARTITION_KEY]: item['id'] for item in table.scan()['Items']
+                     if not item[PARTITION_KEY].startswith('#')}
+        assert sorted(first_ids.values()) == [0, 1, 2]
+
+        write_dynamodb_table.update_table(
+            {'LEGACY': 'Legacy clue', 'ANSWER 1': 'Edited clue', 'ANSWER 3': 'Clue 3'}, table
+        )
+        second_ids = {item[PARTITION_KEY]: item['id'] for item in table.scan()['Items']
+                      if not item[PARTITION_KEY].startswith('#')}
+        assert second_ids['LEGACY'] == first_ids['LEGACY']
+        assert second_ids['ANSWER 1'] == first_ids['ANSWER 1']
+        assert second_ids['ANSWER 3'] == 3
+
+    @mock_aws
+    def test_update_table_writes_answer_index(self):
+        """Test that a sync stores the answer index for the new table version."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        write_dynamodb_table.update_table({'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'}, table)
+        write_dynamodb_table.update_table({'ANSWER 2': 'Clue 2', 'ANSWER 3': 'Clue 3'}, table)
+
+        version_item = table.get_item(Key={PARTITION_KEY: VERSION_KEY})['Item']
+        assert version_item['version'] == 2
+        assert version_item['index_pages'] == 1
+        page = table.get_item(Key={PARTITION_KEY: '#INDEX#0'})['Item']
+        assert page['version'] == 2
+        assert page['answers'] == ['ANSWER 2', 'ANSWER 3']
+        assert page['ids'] == [1, 2]
+
+    @mock_aws
+    def test_update_table_unchanged_bank_without_index_writes_index(self):
+        """Test that a table synced before the index existed receives one."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 1', SECONDARY_KEY: 'Clue 1', 'id': 0})
+        table.put_item(Item={PARTITION_KEY: VERSION_KEY, 'version': 5, 'next_id': 1})
+
+        diff = write_dynamodb_table.update_table({'ANSWER 1': 'Clue 1'}, table)
+
+        assert diff == {'added': {}, 'changed': {}, 'removed': []}
+        version_item = table.get_item(Key={PARTITION_KEY: VERSION_KEY})['Item']
+        assert version_item['version'] == 6
+        assert version_item['index_pages'] == 1
+        assert table.get_item(Key={PARTITION_KEY: '#INDEX#0'})['Item']['answers'] == ['ANSWER 1']
+
+    @mock_aws
+    def test_update_table_deletes_leftover_index_pages(self):
+        """Test that pages of a larger previous index are removed."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        build_index_pages = write_dynamodb_table.build_index_pages
+        with mock.patch.object(
+            write_dynamodb_table, 'build_index_pages',
+            side_effect=lambda ids, hashes: build_index_pages(ids, hashes, page_bytes=50),
+        ):
+            write_dynamodb_table.update_table(
+                {f'ANSWER {i}': f'Clue {i}' for i in range(10)}, table
+            )
+            pages = table.get_item(Key={PARTITION_KEY: VERSION_KEY})['Item']['index_pages']
+            assert pages > 2
+
+            write_dynamodb_table.update_table({'ANSWER 0': 'Clue 0'}, table)
+
+        assert table.get_item(Key={PARTITION_KEY: VERSION_KEY})['Item']['index_pages'] == 1
+        index_keys = [item[PARTITION_KEY] for item in table.scan()['Items']
+                      if item[PARTITION_KEY].startswith('#INDEX#')]
+        assert index_keys == ['#INDEX#0']
+
+    @mock_aws
+    def test_update_table_unchanged_bank_costs_one_read(self):
+        """Test that a sync of an unchanged bank only reads the version item."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        bank = {f'ANSWER {i}': f'Clue {i}' for i in range(30)}
+        write_dynamodb_table.update_table(bank, table)
+        operations = []
+        table.meta.client.meta.events.register(
+            'before-call.dynamodb', lambda model, **kwargs: operations.append(model.name)
+        )
+
+        diff = write_dynamodb_table.update_table(dict(reversed(bank.items())), table)
+
+        assert diff == {'added': {}, 'changed': {}, 'removed': []}
+        assert operations == ['GetItem']
+
+    @mock_aws
+    def test_update_table_diffs_against_manifest(self):
+        """Test that a changed bank is diffed against the recorded hashes without a scan."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        write_dynamodb_table.update_table(
+            {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2', 'ANSWER 3': 'Clue 3'}, table
+        )
+        operations = []
+        table.meta.client.meta.events.register(
+            'before-call.dynamodb', lambda model, **kwargs: operations.append(model.name)
+        )
+
+        diff = write_dynamodb_table.update_table(
+            {'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Edited clue', 'ANSWER 4': 'Clue 4'}, table
+        )
+
+        assert diff == {
+            'added': {'ANSWER 4': 'Clue 4'},
+            'changed': {'ANSWER 2': 'Edited clue'},
+            'removed': ['ANSWER 3'],
+        }
+        assert 'Scan' not in operations
+        items = {item[PARTITION_KEY]: (item[SECONDARY_KEY], item['id'])
+                 for item in table.scan()['Items'] if not item[PARTITION_KEY].startswith('#')}
+        assert items == {
+            'ANSWER 1': ('Clue 1', 0), 'ANSWER 2': ('Edited clue', 1), 'ANSWER 4': ('Clue 4', 3)
+        }
+
+    @mock_aws
+    def test_update_table_full_sync_finds_manual_edits(self):
+        """Test that a full sync rescans the table instead of trusting the hashes."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        bank = {'ANSWER 1': 'Clue 1'}
+        write_dynamodb_table.update_table(bank, table)
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 1', SECONDARY_KEY: 'Edited', 'id': 0})
+
+        assert not any(write_dynamodb_table.update_table(bank, table).values())
+        diff = write_dynamodb_table.update_table(bank, table, full=True)
+
+        assert diff['changed'] == {'ANSWER 1': 'Clue 1'}
+        assert table.get_item(Key={PARTITION_KEY: 'ANSWER 1'})['Item'][SECONDARY_KEY] == 'Clue 1'
+
+    @mock_aws
+    def test_update_table_index_without_hashes_falls_back_to_scan(self):
+        """Test that an index written before entry hashes existed is not used as manifest."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table.put_item(Item={PARTITION_KEY: 'ANSWER 1', SECONDARY_KEY: 'Clue 1', 'id': 0})
+        table.put_item(Item={PARTITION_KEY: '#INDEX#0', 'version': 1,
+                             'answers': ['ANSWER 1'], 'ids': [0]})
+        table.put_item(Item={PARTITION_KEY: VERSION_KEY, 'version': 1, 'next_id': 1,
+                             'index_pages': 1})
+
+        diff = write_dynamodb_table.update_table({'ANSWER 1': 'Clue 2'}, table)
+
+        assert diff['changed'] == {'ANSWER 1': 'Clue 2'}
+        page = table.get_item(Key={PARTITION_KEY: '#INDEX#0'})['Item']
+        assert page['version'] == 2
+        assert len(page['hashes']) == 1
+
+    @mock_aws
+    def test_update_table_resumes_interrupted_sync(self, tmp_path, capsys):
+        """Test that a failed sync resumes after the last batch it completed."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        write_dynamodb_table.update_table({'ANSWER 0': 'Clue 0'}, table)
+        bank = {f'ANSWER {i}': f'Clue {i}' for i in range(81)}  # 80 writes
+        client = table.meta.client
+        batch_write_item = client.batch_write_item
+        calls = []
+
+        def fail_third_batch(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 3:
+                raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'BatchWriteItem')
+            return batch_write_item(**kwargs)
+
+        with mock.patch.object(client, 'batch_write_item', side_effect=fail_third_batch):
+            with pytest.raises(ClientError):
+                write_dynamodb_table.update_table(bank, table, checkpoint_dir=str(tmp_path))
+        checkpoint = json.loads((tmp_path / 'test-table.json').read_text())
+        assert checkpoint['completed'] == 50
+
+        with mock.patch.object(client, 'batch_write_item',
+                               wraps=batch_write_item) as mock_batch_write:
+            write_dynamodb_table.update_table(bank, table, checkpoint_dir=str(tmp_path))
+
+        assert mock_batch_write.call_count == 2  # the remaining 30 writes
+        assert 'test-table: resuming after 50 completed writes' in capsys.readouterr().out
+        items = {item[PARTITION_KEY]: item['id'] for item in table.scan()['Items']
+                 if not item[PARTITION_KEY].startswith('#')}
+        assert items == {f'ANSWER {i}': i for i in range(81)}
+        assert not (tmp_path / 'test-table.json').exists()
+
+    @mock_aws
+    def test_update_table_retries_throttled_metadata_writes(self):
+        """Test that throttled index and version writes are retried."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        client = table.meta.client
+        update_item = client.update_item
+        calls = []
+
+        def throttle_twice(**kwargs):
+            calls.append(kwargs)
+            if len(calls) <= 2:
+                raise ClientError(
+                    {'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'UpdateItem'
+                )
+            return update_item(**kwargs)
+
+        with mock.patch.object(client, 'update_item', side_effect=throttle_twice):
+            write_dynamodb_table.update_table({'ANSWER 1': 'Clue 1'}, table)
+
+        assert len(calls) == 3
+        assert table.get_item(Key={PARTITION_KEY: VERSION_KEY})['Item']['version'] == 1
+
+    @mock_aws
+    def test_import_table_from_csv(self, tmp_path):
+        """Test that a CSV bank is imported with IDs, and a re-import reads one item."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        path = tmp_path / 'bank.csv'
+        path.write_text('answer,clue\n' + ''.join(
+            f'{lettered_answer(i)},"Clue {i}, with a comma"\n' for i in range(60)
+        ))
+
+        diff = write_dynamodb_table.import_table(str(path), table)
+
+        assert diff == {'added': [lettered_answer(i) for i in range(60)], 'changed': [],
+                        'removed': []}
+        items = {item[PARTITION_KEY]: (item[SECONDARY_KEY], item['id'])
+                 for item in table.scan()['Items'] if not item[PARTITION_KEY].startswith('#')}
+        assert items == {lettered_answer(i): (f'Clue {i}, with a comma', i) for i in range(60)}
+
+        operations = []
+        table.meta.client.meta.events.register(
+            'before-call.dynamodb', lambda model, **kwargs: operations.append(model.name)
+        )
+        diff = write_dynamodb_table.import_table(str(path), table)
+
+        assert diff == {'added': [], 'changed': [], 'removed': []}
+        assert operations == ['GetItem']
+
+    @mock_aws
+    def test_import_table_writes_only_diff(self, tmp_path):
+        """Test that a re-import of an edited JSON Lines file writes only the changes."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        path = tmp_path / 'bank.jsonl'
+        bank = {lettered_answer(i): f'Clue {i}' for i in range(40)}
+        path.write_text(''.join(json.dumps({'answer': answer, 'clue': clue}) + '\n'
+                                for answer, clue in bank.items()))
+        write_dynamodb_table.import_table(str(path), table)
+
+        bank[lettered_answer(3)] = 'Edited clue'
+        del bank[lettered_answer(7)]
+        bank['NEW ANSWER'] = 'New clue'
+        path.write_text(''.join(json.dumps({'answer': answer, 'clue': clue}) + '\n'
+                                for answer, clue in bank.items()))
+        client = table.meta.client
+        with mock.patch.object(client, 'batch_write_item',
+                               wraps=client.batch_write_item) as mock_batch_write:
+            diff = write_dynamodb_table.import_table(str(path), table)
+
+        assert diff == {'added': ['NEW ANSWER'], 'changed': [lettered_answer(3)],
+                        'removed': [lettered_answer(7)]}
+        assert mock_batch_write.call_count == 1
+        assert len(mock_batch_write.call_args.kwargs['RequestItems']['test-table']) == 3
+        items = {item[PARTITION_KEY]: item[SECONDARY_KEY]
+                 for item in table.scan()['Items'] if not item[PARTITION_KEY].startswith('#')}
+        assert items == bank
+        assert table.get_item(Key={PARTITION_KEY: 'NEW ANSWER'})['Item']['id'] == 40
+
+    @mock_aws
+    def test_import_table_validation_failure(self, tmp_path, capsys):
+        """Test that nothing is written when an entry of the file breaks the clue rules."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        path = tmp_path / 'bank.csv'
+        path.write_text('PARIS,Capital of France\nABC,Too short\n')
+
+        with pytest.raises(ValueError, match='1 word bank entries break the clue rules'):
+            write_dynamodb_table.import_table(str(path), table, bank_name='normal')
+
+        assert "ERROR   bank.csv:2: 'ABC'" in capsys.readouterr().out
+        assert table.scan()['Items'] == []
+
+        diff = write_dynamodb_table.import_table(str(path), table, dry_run=True,
+                                                 bank_name='normal', validate=False)
+        assert diff['added'] == ['PARIS', 'ABC']
+        diff = write_dynamodb_table.import_table(str(path), table, bank_name='drunk')
+        assert diff['added'] == ['PARIS', 'ABC']
+
+    @mock_aws
+    def test_import_table_file_changed_during_sync(self, tmp_path):
+        """Test that entries differing between the two passes fail the sync."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        passes = [
+            [(None, 'bank.csv:1', 'PARIS', 'Capital of France')],
+            [(None, 'bank.csv:1', 'PARIS', 'Edited in between')],
+        ]
+
+        with mock.patch.object(write_dynamodb_table, 'iter_bank_files',
+                               side_effect=lambda files: iter(passes.pop(0))):
+            with pytest.raises(RuntimeError, match='1 entries changed during the sync'):
+                write_dynamodb_table.import_table('bank.csv', table)
+
+        assert table.get_item(Key={PARTITION_KEY: VERSION_KEY}).get('Item') is None
+
+    def test_bank_hash(self):
+        """Test that the bank hash ignores entry order but not content."""
+        hashes = {answer: write_dynamodb_table.entry_hash(answer, 'Clue')
+                  for answer in ('ANSWER 1', 'ANSWER 2')}
+
+        assert write_dynamodb_table.bank_hash(hashes) == \
+            write_dynamodb_table.bank_hash(dict(reversed(hashes.items())))
+        assert write_dynamodb_table.entry_hash('ANSWER 1', 'Clue') != \
+            write_dynamodb_table.entry_hash('ANSWER 1', 'Other clue')
+
+    @mock_aws
+    def test_build_snapshot(self, tmp_path):
+        """Test that the snapshot holds the synced entries, their IDs and the version."""
+        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        table = dynamodb.create_table(
+            TableName='test-table',
+            KeySchema=[{'AttributeName': PARTITION_KEY, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': PARTITION_KEY, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        write_dynamodb_table.update_table({'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'}, table)
+        path = str(tmp_path / 'snapshot.json')
+
+        write_dynamodb_table.build_snapshot([table], path)
+
+        banks = word_bank_snapshot.load_snapshot(path)
+        assert banks['test-table']['version'] == 1
+        assert banks['test-table']['ids'] == [0, 1]
+        assert dict(zip(banks['test-table']['answers'], banks['test-table']['clues'])) == {
+            'ANSWER 1': 'Clue 1', 'ANSWER 2': 'Clue 2'
+        }
+
+    def test_diff_bank(self):
+        """Test classification of entries into added, changed and removed."""
+        existing = {'KEEP': 'Same', 'EDIT': 'Old', 'DROP': 'Gone'}
+        bank = {'KEEP': 'Same', 'EDIT': 'New', 'ADD': 'Fresh'}
+
+        diff = write_dynamodb_table.diff_bank(bank, existing)
+
+        assert diff == {'added': {'ADD': 'Fresh'}, 'changed': {'EDIT': 'New'}, 'removed': ['DROP']}
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
     @mock.patch('backend.db_management.write_dynamodb_table.update_table')
-    @mock.patch('boto3.resource')
-    def test_main_function_success(self, mock_boto3, mock_update_table,
-                                   mock_remove_creds, mock_get_creds):
+    def test_main_function_success(self, mock_update_table, mock_get_session):
         """Test successful execution of main function."""
         # Set up mocks
         mock_ddb = mock.Mock()
-        mock_boto3.return_value = mock_ddb
+        mock_get_session.return_value.resource.return_value = mock_ddb
 
         mock_table_normal = mock.Mock()
         mock_table_hard = mock.Mock()
@@ -186,12 +660,13 @@ class TestWriteDynamoDBTable:
 
         write_dynamodb_table.main()
 
-        # Verify credentials were handled
-        mock_get_creds.assert_called_once()
-        mock_remove_creds.assert_called_once()
+        # Verify the role session was created once
+        mock_get_session.assert_called_once()
 
-        # Verify DynamoDB resource was created
-        mock_boto3.assert_called_once_with('dynamodb', region_name=AWS_REGION)
+        # Verify DynamoDB resource was created from the role session
+        mock_get_session.return_value.resource.assert_called_once_with(
+            'dynamodb', region_name=AWS_REGION
+        )
 
         # Verify tables were accessed
         expected_calls = [
@@ -204,20 +679,115 @@ class TestWriteDynamoDBTable:
         # Verify update_table was called for each difficulty
         assert mock_update_table.call_count == 3
 
-    @mock.patch('backend.db_management.write_dynamodb_table.get_temporary_credentials')
-    @mock.patch('backend.db_management.write_dynamodb_table.remove_temporary_credentials')
-    @mock.patch('boto3.resource')
-    def test_main_function_exception_handling(self, mock_boto3, mock_remove_creds, mock_get_creds):
-        """Test that credentials are always cleaned up even if an exception occurs."""
-        # Make boto3.resource raise an exception
-        mock_boto3.side_effect = Exception("AWS connection failed")
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_dry_run(self, mock_update_table, mock_get_session):
+        """Test that a dry run is passed on to every table sync."""
+        write_dynamodb_table.main(dry_run=True)
+
+        assert mock_update_table.call_count == 3
+        assert all(call.args[2] is True for call in mock_update_table.call_args_list)
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_full(self, mock_update_table, mock_get_session):
+        """Test that a full sync is passed on to every table sync."""
+        write_dynamodb_table.main(full=True)
+
+        assert all(call.args[3] is True for call in mock_update_table.call_args_list)
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_write_options(self, mock_update_table, mock_get_session):
+        """Test that the WCU budget and checkpoint directory reach every table sync."""
+        write_dynamodb_table.main(units_per_second=50, checkpoint_dir='checkpoints')
+
+        assert all(call.args[4:] == (50, 'checkpoints')
+                   for call in mock_update_table.call_args_list)
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.import_table')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_import_files(self, mock_update_table, mock_import_table,
+                                        mock_get_session, tmp_path):
+        """Test that an imported file replaces its bank after being validated with the rest."""
+        path = tmp_path / 'hard.csv'
+        path.write_text('answer,clue\nEXTREMELY OBSCURE,A very hard clue\n')
+
+        write_dynamodb_table.main(import_files={'hard': str(path)})
+
+        assert mock_update_table.call_count == 2
+        mock_import_table.assert_called_once()
+        assert mock_import_table.call_args.args[0] == str(path)
+        assert mock_import_table.call_args.args[-2:] == ('hard', False)
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    def test_main_function_unknown_import(self, mock_get_session):
+        """Test that files can only be imported into the three known banks."""
+        with pytest.raises(ValueError, match='Unknown word banks to import: easy'):
+            write_dynamodb_table.main(import_files={'easy': 'easy.csv'})
+
+        mock_get_session.assert_not_called()
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    @mock.patch('backend.db_management.write_dynamodb_table.validate_word_bank_files')
+    def test_main_function_validation_failure(self, mock_validate, mock_update_table,
+                                              mock_get_session, capsys):
+        """Test that word banks breaking the clue rules are never synced."""
+        mock_validate.return_value = {'errors': ["word_bank_normal.py:2: 'ABC': ..."],
+                                      'warnings': []}
+
+        with pytest.raises(ValueError, match='1 word bank entries break the clue rules'):
+            write_dynamodb_table.main()
+
+        mock_get_session.assert_not_called()
+        mock_update_table.assert_not_called()
+        assert 'ERROR   word_bank_normal.py:2' in capsys.readouterr().out
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    @mock.patch('backend.db_management.write_dynamodb_table.validate_word_bank_files')
+    def test_main_function_skip_validation(self, mock_validate, mock_update_table,
+                                           mock_get_session):
+        """Test that validation can be skipped."""
+        write_dynamodb_table.main(validate=False)
+
+        mock_validate.assert_not_called()
+        assert mock_update_table.call_count == 3
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.build_snapshot')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_snapshot(self, mock_update_table, mock_build_snapshot,
+                                    mock_get_session):
+        """Test that a snapshot is only built after a real sync."""
+        write_dynamodb_table.main(dry_run=True, snapshot_path='snapshot.json')
+        mock_build_snapshot.assert_not_called()
+
+        write_dynamodb_table.main(snapshot_path='snapshot.json')
+        mock_build_snapshot.assert_called_once()
+        assert mock_build_snapshot.call_args.args[1] == 'snapshot.json'
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    @mock.patch('backend.db_management.write_dynamodb_table.update_table')
+    def test_main_function_sync_failure(self, mock_update_table, mock_get_session):
+        """Test that a failure in one concurrent table sync is raised from main."""
+        mock_update_table.side_effect = [None, Exception('Sync failed'), None]
+
+        with pytest.raises(Exception, match='Sync failed'):
+            write_dynamodb_table.main()
+
+    @mock.patch('backend.db_management.write_dynamodb_table.get_role_session')
+    def test_main_function_exception_handling(self, mock_get_session, capsys):
+        """Test that a failure to reach AWS is raised after the run is wrapped up."""
+        mock_get_session.return_value.resource.side_effect = Exception("AWS connection failed")
 
         with pytest.raises(Exception, match="AWS connection failed"):
             write_dynamodb_table.main()
 
-        # Verify credentials were still cleaned up
-        mock_get_creds.assert_called_once()
-        mock_remove_creds.assert_called_once()
+        mock_get_session.assert_called_once()
+        assert capsys.readouterr().out.endswith('Done.\n')
 
 
 if __name__ == "__main__":